@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from user_agents_updater.parsers import parse_semver_like
+from user_agents_updater.providers.chrome import extract_chrome_latest_major_versions
+
+
+def synthetic_payload(count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    versions = [
+        f"{rng.randrange(1, 150)}.0.{rng.randrange(10_000)}.{rng.randrange(300)}"
+        for _ in range(count)
+    ]
+    return {"versions": [{"version": version} for version in versions]}
+
+
+def sort_based_extraction(data: dict, major_count: int) -> list[str]:
+    # The previous implementation: sort every candidate, parse each one again in the loop.
+    major_versions: list[str] = []
+    seen: set[int] = set()
+    candidates = [item["version"] for item in data["versions"]]
+    for version in sorted(candidates, key=parse_semver_like, reverse=True):
+        parsed = parse_semver_like(version)
+        if not parsed or parsed[0] in seen:
+            continue
+        seen.add(parsed[0])
+        major_versions.append(version)
+        if len(major_versions) == major_count:
+            break
+    return major_versions
+
+
+def time_runs(extract, payload: dict, major_count: int, runs: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        extract(payload, major_count)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare sort-based and single-pass Chrome major selection.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000], help="payload sizes (default: 10^5 10^6)")
+    parser.add_argument("--major-count", type=int, default=3, help="majors to select (default: 3)")
+    parser.add_argument("--runs", type=int, default=3, help="number of timed runs (default: 3)")
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        payload = synthetic_payload(size)
+        if sort_based_extraction(payload, args.major_count) != extract_chrome_latest_major_versions(payload, args.major_count):
+            raise SystemExit("single-pass selection differs from the sort-based one")
+
+        results = {
+            "sort": time_runs(sort_based_extraction, payload, args.major_count, args.runs),
+            "single-pass": time_runs(extract_chrome_latest_major_versions, payload, args.major_count, args.runs),
+        }
+        print(f"{size:,} versions, top {args.major_count} majors, {args.runs} runs", flush=True)
+        for name, timings in results.items():
+            print(f"- {name}: median={statistics.median(timings) * 1000:.1f}ms", flush=True)
+        speedup = statistics.median(results["sort"]) / statistics.median(results["single-pass"])
+        print(f"- speedup: {speedup:.2f}x", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
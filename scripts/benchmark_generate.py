@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from user_agents_updater.cassette import Cassette, ReplayFetcher
+from user_agents_updater.service import UserAgentService
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = ROOT_DIR / "tests" / "fixtures"
+
+
+def cassette_from_fixtures(fixtures_dir: Path) -> Cassette:
+    cassette = Cassette()
+    fixtures_meta = json.loads((fixtures_dir / "_meta.json").read_text(encoding="utf-8"))
+    for filename, meta in fixtures_meta.items():
+        payload = json.loads((fixtures_dir / filename).read_text(encoding="utf-8"))
+        cassette.add(meta["url"], meta["url"], payload)
+    return cassette
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Time UserAgentService.generate against a replayed cassette.")
+    parser.add_argument("--cassette", type=Path, help="cassette to replay (default: built from tests/fixtures)")
+    parser.add_argument("--runs", type=int, default=50, help="number of timed runs (default: 50)")
+    args = parser.parse_args(argv)
+
+    cassette = Cassette.load(args.cassette) if args.cassette else cassette_from_fixtures(FIXTURES_DIR)
+    fetcher = ReplayFetcher(cassette)
+    service = UserAgentService()
+    service.generate(fetcher)  # warm-up
+
+    timings: list[float] = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        _, _, user_agents = service.generate(fetcher)
+        timings.append(time.perf_counter() - started)
+
+    print(f"generate: {args.runs} runs, {len(user_agents)} user-agents per run", flush=True)
+    print(
+        f"- min={min(timings) * 1000:.3f}ms median={statistics.median(timings) * 1000:.3f}ms "
+        f"mean={statistics.fmean(timings) * 1000:.3f}ms",
+        flush=True,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from user_agents_updater.providers.chrome import CHROME_VARIANTS
+from user_agents_updater.rendering import render_many, render_variants
+
+
+def synthetic_versions(count: int) -> list[str]:
+    return [f"{100 + index // 1000}.0.{index % 1000}.{index % 97}" for index in range(count)]
+
+
+def time_runs(render, versions_by_os, runs: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        render("chrome", CHROME_VARIANTS, versions_by_os)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare render_many with render_variants on a large version grid.")
+    parser.add_argument("--versions", type=int, default=100_000, help="versions per OS (default: 100000)")
+    parser.add_argument("--runs", type=int, default=5, help="number of timed runs (default: 5)")
+    args = parser.parse_args(argv)
+
+    versions = synthetic_versions(args.versions)
+    versions_by_os = {variant.os: versions for variant in CHROME_VARIANTS}
+    if render_many("chrome", CHROME_VARIANTS, versions_by_os) != render_variants("chrome", CHROME_VARIANTS, versions_by_os):
+        raise SystemExit("render_many output differs from render_variants")
+
+    count = args.versions * len(CHROME_VARIANTS)
+    results = {
+        "render_variants": time_runs(render_variants, versions_by_os, args.runs),
+        "render_many": time_runs(render_many, versions_by_os, args.runs),
+    }
+    print(f"rendering {count:,} user-agents, {args.runs} runs", flush=True)
+    for name, timings in results.items():
+        median = statistics.median(timings)
+        print(f"- {name}: median={median * 1000:.1f}ms ({count / median:,.0f} UA/s)", flush=True)
+    speedup = statistics.median(results["render_variants"]) / statistics.median(results["render_many"])
+    print(f"- speedup: {speedup:.2f}x", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from user_agents_updater.corpus import BloomFilter, DEFAULT_SHARD_LINES, iter_corpus, write_shards
+from user_agents_updater.models import ResolvedVersionsDTO
+from user_agents_updater.providers_registry import ProviderRegistry
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+METADATA_FILE = ROOT_DIR / "data" / "user-agents-metadata.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a large deduplicated user-agent corpus into shard files.")
+    parser.add_argument("output_dir", type=Path, help="directory receiving the shard files")
+    parser.add_argument("--metadata", type=Path, default=METADATA_FILE, help="metadata providing resolved versions")
+    parser.add_argument("--full-build", action="store_true", help="use full build numbers instead of MAJOR.0.0.0")
+    parser.add_argument("--shard-lines", type=int, default=DEFAULT_SHARD_LINES, help="lines per shard file")
+    parser.add_argument("--gzip", action="store_true", help="gzip-compress shard files")
+    parser.add_argument("--bloom", type=int, metavar="CAPACITY", help="constant-memory Bloom filter dedup")
+    parser.add_argument("--worker", type=int, default=0, help="index of this worker (default: 0)")
+    parser.add_argument("--workers", type=int, default=1, help="number of workers splitting the corpus")
+    args = parser.parse_args(argv)
+
+    metadata = json.loads(args.metadata.read_text(encoding="utf-8"))
+    resolved_versions = ResolvedVersionsDTO.from_mapping(metadata["resolved_versions"])
+    corpus = iter_corpus(
+        ProviderRegistry.default().all(),
+        resolved_versions,
+        full_build=args.full_build,
+        dedup=BloomFilter(args.bloom) if args.bloom else None,
+        shard_index=args.worker,
+        shard_count=args.workers,
+    )
+    paths = write_shards(
+        (rendered.user_agent for rendered in corpus),
+        args.output_dir,
+        prefix=f"corpus-{args.worker:03d}",
+        shard_lines=args.shard_lines,
+        compress=args.gzip,
+    )
+    print(f"Done: {len(paths)} shard file(s) in {args.output_dir}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from pathlib import Path
+
+from user_agents_updater.server import load_metadata, UserAgentServer
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+METADATA_FILE = ROOT_DIR / "data" / "user-agents-metadata.json"
+
+
+def run_server(metadata_path: Path, port_queue: multiprocessing.Queue) -> None:
+    async def serve() -> None:
+        listener = await UserAgentServer(load_metadata(metadata_path)).start("127.0.0.1", 0)
+        port_queue.put(listener.sockets[0].getsockname()[1])
+        async with listener:
+            await listener.serve_forever()
+
+    asyncio.run(serve())
+
+
+async def _read_response(reader: asyncio.StreamReader) -> None:
+    head = await reader.readuntil(b"\r\n\r\n")
+    start = head.index(b"Content-Length: ") + 16
+    await reader.readexactly(int(head[start : head.index(b"\r\n", start)]))
+
+
+async def _client(host: str, port: int, request: bytes, deadline: float, latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+def run_clients(host: str, port: int, path: str, connections: int, duration: float, results: multiprocessing.Queue) -> None:
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("ascii")
+    latencies: list[float] = []
+
+    async def run() -> None:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(_client(host, port, request, deadline, latencies) for _ in range(connections)))
+
+    asyncio.run(run())
+    results.put(latencies)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the local user-agent server.")
+    parser.add_argument("--metadata", type=Path, default=METADATA_FILE, help="metadata file to serve")
+    parser.add_argument("--port", type=int, help="test an already running server instead of starting one")
+    parser.add_argument("--path", default="/ua?browser=chrome", help="request target (default: /ua?browser=chrome)")
+    parser.add_argument("--processes", type=int, default=2, help="client processes (default: 2)")
+    parser.add_argument("--connections", type=int, default=16, help="keep-alive connections per process")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to run (default: 5)")
+    args = parser.parse_args(argv)
+
+    server_process = None
+    port = args.port
+    if port is None:
+        port_queue: multiprocessing.Queue = multiprocessing.Queue()
+        server_process = multiprocessing.Process(target=run_server, args=(args.metadata, port_queue), daemon=True)
+        server_process.start()
+        port = port_queue.get(timeout=10)
+
+    try:
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(
+                target=run_clients,
+                args=("127.0.0.1", port, args.path, args.connections, args.duration, results),
+            )
+            for _ in range(args.processes)
+        ]
+        for client in clients:
+            client.start()
+        latencies = sorted(latency for _ in clients for latency in results.get())
+        for client in clients:
+            client.join()
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+
+    if not latencies:
+        raise SystemExit("No requests completed")
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{args.path}: {len(latencies)} requests, {len(latencies) / args.duration:,.0f} req/s", flush=True)
+    print(
+        f"- p50={quantiles[49] * 1000:.3f}ms p99={quantiles[98] * 1000:.3f}ms max={latencies[-1] * 1000:.3f}ms",
+        flush=True,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from user_agents_updater.server import DEFAULT_HOST, DEFAULT_PORT, serve_metadata_file
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+METADATA_FILE = ROOT_DIR / "data" / "user-agents-metadata.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve user-agents over HTTP on localhost.")
+    parser.add_argument("--metadata", type=Path, default=METADATA_FILE, help="metadata file to serve")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--reload-interval", type=float, default=5.0, help="seconds between metadata change checks")
+    args = parser.parse_args(argv)
+
+    print(f"Serving {args.metadata} on http://{args.host}:{args.port} (/ua, /ua.json, /metadata)", flush=True)
+    try:
+        asyncio.run(serve_metadata_file(args.metadata, args.host, args.port, args.reload_interval))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
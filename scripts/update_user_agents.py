@@ -1,46 +1,207 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import json
+import signal
 import sys
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 
-from user_agents_updater import fetch_json
-from user_agents_updater.json_io import write_pretty_json
+from user_agents_updater.cassette import RecordingFetcher, ReplayFetcher
+from user_agents_updater.daemon import DatasetSnapshot, RefreshDaemon
+from user_agents_updater.fallback import is_stale_source
+from user_agents_updater.history import VersionHistory
+from user_agents_updater.http_cache import CachingJsonFetcher, HttpCache
+from user_agents_updater.http_pool import PooledHttpClient
+from user_agents_updater.incremental import IncrementalPlan, plan_incremental_update
+from user_agents_updater.json_io import available_formats, formats_for, write_json_outputs, write_pretty_json
+from user_agents_updater.manifest import dataset_fingerprint, publish_manifest
+from user_agents_updater.models import ResolvedVersionsDTO
+from user_agents_updater.providers_registry import SourceByProviderMap
+from user_agents_updater.resilience import ResilientFetcher
+from user_agents_updater.scheduler import FetchScheduler
 from user_agents_updater.service import UserAgentService
 
 OUT_DIR = ROOT_DIR / "data"
 OUT_LIST_FILE = OUT_DIR / "user-agents.json"
 OUT_METADATA_FILE = OUT_DIR / "user-agents-metadata.json"
+HISTORY_FILE = OUT_DIR / "versions-history.jsonl"
+MANIFEST_FILE = OUT_DIR / "manifest.json"
+HTTP_CACHE_DIR = ROOT_DIR / ".cache" / "http"
+FETCH_LATENCY_FILE = ROOT_DIR / ".cache" / "fetch-latency.json"
 
 
-def main() -> int:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Regenerate the user-agents dataset.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", type=Path, metavar="CASSETTE", help="record every fetched payload into CASSETTE")
+    mode.add_argument("--replay", type=Path, metavar="CASSETTE", help="serve every fetch from CASSETTE, offline")
+    mode.add_argument("--daemon", action="store_true", help="keep running and poll each provider on its own schedule")
+    parser.add_argument("--force", action="store_true", help="rewrite outputs even when no version changed")
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="overall time budget; providers that fail or miss it reuse their last-known-good versions",
+    )
+    parser.add_argument("--msgpack", action="store_true", help="also write MessagePack encodings (needs 'msgpack')")
+    args = parser.parse_args(argv)
+    if args.daemon and (args.force or args.deadline is not None):
+        # The daemon rewrites outputs only on version changes and polls without an overall budget.
+        parser.error("--daemon cannot be combined with --force or --deadline")
+    return args
+
+
+def load_json_object(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def resolve_with(
+    service: UserAgentService, scheduler: FetchScheduler, deadline: float | None
+) -> tuple[ResolvedVersionsDTO, SourceByProviderMap]:
+    if deadline is None:
+        return service.resolve_scheduled(scheduler)
+    result = service.resolve_with_fallback(scheduler, deadline, load_json_object(OUT_METADATA_FILE))
+    scheduler.close(wait=False)
+    return result
+
+
+def resolve_versions(
+    service: UserAgentService, args: argparse.Namespace
+) -> tuple[ResolvedVersionsDTO, SourceByProviderMap, dict[str, dict[str, float | int]]]:
+    if args.replay:
+        with FetchScheduler(ReplayFetcher.from_path(args.replay)) as scheduler:
+            resolved_versions, sources = resolve_with(service, scheduler, args.deadline)
+        return resolved_versions, sources, {}
+
+    with PooledHttpClient() as client, ResilientFetcher(
+        CachingJsonFetcher(HttpCache(HTTP_CACHE_DIR), client=client)
+    ) as resilient_fetcher:
+        fetcher = RecordingFetcher(resilient_fetcher) if args.record else resilient_fetcher
+        latency_history = {
+            url: value
+            for url, value in (load_json_object(FETCH_LATENCY_FILE) or {}).items()
+            if isinstance(value, (int, float))
+        }
+        with FetchScheduler(fetcher, latency_history=latency_history) as scheduler:
+            resolved_versions, sources = resolve_with(service, scheduler, args.deadline)
+        fetch_stats = resilient_fetcher.stats()
+
+    FETCH_LATENCY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    write_pretty_json(FETCH_LATENCY_FILE, scheduler.latency_history())
+    if args.record:
+        fetcher.cassette.save(args.record)
+        print(f"- recorded {args.record}", flush=True)
+    return resolved_versions, sources, fetch_stats
+
+
+def outputs_current(plan: IncrementalPlan) -> bool:
+    # Nothing to write: same versions and sources as the published metadata, and its files exist.
+    return plan.unchanged and OUT_LIST_FILE.is_file() and MANIFEST_FILE.is_file()
+
+
+def write_outputs(
+    metadata: dict[str, object], resolved_versions: ResolvedVersionsDTO, formats: tuple[str, ...]
+) -> list[Path]:
+    records = len(metadata["user_agents"])
+    outputs = {
+        **dict.fromkeys(
+            write_json_outputs(OUT_LIST_FILE, [entry["user_agent"] for entry in metadata["user_agents"]], formats).values(),
+            records,
+        ),
+        **dict.fromkeys(write_json_outputs(OUT_METADATA_FILE, metadata, formats).values(), records),
+    }
+    # Last: the manifest only ever points at files that are already in place.
+    publish_manifest(MANIFEST_FILE, outputs, dataset_fingerprint(metadata["fingerprints"]), metadata["updated_at"])
+    VersionHistory(HISTORY_FILE).append(metadata["updated_at"], resolved_versions, metadata["sources"])
+    return [*outputs, MANIFEST_FILE]
+
+
+def run_daemon(service: UserAgentService, formats: tuple[str, ...]) -> int:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    def on_swap(snapshot: DatasetSnapshot) -> None:
+        metadata = snapshot.to_metadata()
+        plan = plan_incremental_update(
+            service.registry.all(), snapshot.resolved_versions, load_json_object(OUT_METADATA_FILE), metadata["sources"]
+        )
+        if outputs_current(plan):
+            print(f"- generation {snapshot.generation}: no version changes, outputs left untouched", flush=True)
+            return
+        write_outputs(metadata, snapshot.resolved_versions, formats)
+        print(f"- generation {snapshot.generation}: {len(snapshot.user_agents)} user-agents", flush=True)
+
+    def on_error(provider_name: str, err: Exception) -> None:
+        print(f"- {provider_name}: refresh failed, keeping current data: {err}", file=sys.stderr, flush=True)
+
+    with PooledHttpClient() as client, ResilientFetcher(
+        CachingJsonFetcher(HttpCache(HTTP_CACHE_DIR), client=client)
+    ) as fetcher:
+        daemon = RefreshDaemon(service, fetcher, on_swap=on_swap, on_error=on_error)
+        try:
+            daemon.run(stop)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     print("Updating user-agents...", flush=True)
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     service = UserAgentService()
-    resolved_versions, sources, user_agents = service.generate(fetch_json)
+    formats = available_formats(include_msgpack=args.msgpack)
+    # Fail before fetching anything when a published variant could not be kept up to date.
+    for path in (OUT_LIST_FILE, OUT_METADATA_FILE):
+        formats_for(path, formats)
+    if args.daemon:
+        return run_daemon(service, formats)
+    resolved_versions, sources, fetch_stats = resolve_versions(service, args)
+    for host, stats in fetch_stats.items():
+        print(
+            f"- {host}: {stats['attempts']} attempts, {stats['retries']} retries, "
+            f"{stats['hedges']} hedges, p50={stats['p50']:.3f}s p95={stats['p95']:.3f}s",
+            flush=True,
+        )
 
-    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    for name, source in sources.items():
+        if is_stale_source(source):
+            print(f"- {name}: stale, {source['reason']}", flush=True)
 
-    user_agents_payload = {
-        "updated_at": now,
-        "sources": sources,
-        "resolved_versions": resolved_versions.to_dict(),
-        "user_agents": user_agents,
-    }
-    user_agents_list_payload = [
-        entry["user_agent"]
-        for entry in user_agents_payload["user_agents"]
-    ]
+    previous_metadata = None if args.force else load_json_object(OUT_METADATA_FILE)
+    plan = plan_incremental_update(service.registry.all(), resolved_versions, previous_metadata, sources)
+    if outputs_current(plan):
+        print("No version changes: outputs left untouched", flush=True)
+        return 0
+
+    user_agents = service.render(resolved_versions, reuse=plan.reusable_user_agents)
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
-    write_pretty_json(OUT_LIST_FILE, user_agents_list_payload)
-    write_pretty_json(OUT_METADATA_FILE, user_agents_payload)
+    written = write_outputs(
+        {
+            "updated_at": now,
+            "sources": sources,
+            "resolved_versions": resolved_versions.to_dict(),
+            "fingerprints": plan.fingerprints,
+            "user_agents": user_agents,
+        },
+        resolved_versions,
+        formats,
+    )
 
-    print(f"Done: {len(user_agents)} user-agents", flush=True)
-    print(f"- {OUT_LIST_FILE}", flush=True)
-    print(f"- {OUT_METADATA_FILE}", flush=True)
+    re_rendered = ", ".join(plan.changed) or "none, sources changed"
+    print(f"Done: {len(user_agents)} user-agents (re-rendered: {re_rendered})", flush=True)
+    for path in (*written, HISTORY_FILE):
+        print(f"- {path} ({path.stat().st_size:,} bytes)", flush=True)
     return 0
 
 
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from user_agents_updater.history import VersionHistory
+from user_agents_updater.service import UserAgentService
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+HISTORY_FILE = ROOT_DIR / "data" / "versions-history.jsonl"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Print the user-agent set in effect at a point in time.")
+    parser.add_argument("timestamp", help="ISO-8601 timestamp with timezone, e.g. 2026-03-01T00:00:00Z")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE, help="versions history file")
+    parser.add_argument("--metadata", action="store_true", help="print full records instead of UA strings")
+    args = parser.parse_args(argv)
+
+    entry = VersionHistory(args.history).as_of(args.timestamp)
+    if entry is None:
+        print(f"No history at or before {args.timestamp}", file=sys.stderr)
+        return 1
+
+    # Rendered with the current templates from the versions recorded at that time.
+    user_agents = UserAgentService().render(entry.resolved_versions)
+    payload = {
+        "updated_at": entry.updated_at,
+        "sources": entry.sources,
+        "resolved_versions": entry.resolved_versions.to_dict(),
+        "user_agents": user_agents,
+    }
+    print(json.dumps(payload if args.metadata else [record["user_agent"] for record in user_agents], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
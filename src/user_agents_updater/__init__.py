@@ -10,8 +10,19 @@ from .providers_registry import ProviderRegistry
 from .providers.safari import extract_safari_stable_version, SafariProvider
 from .service import UserAgentService
 
+
+def __getattr__(name: str) -> object:
+    # asyncio and ssl are only imported by callers that actually use the async fetcher.
+    if name == "fetch_json_async":
+        from .async_http import fetch_json_async
+
+        return fetch_json_async
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "fetch_json",
+    "fetch_json_async",
     "FirefoxProvider",
     "ChromeProvider",
     "EdgeProvider",
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import ssl
+import zlib
+from email.message import Message
+from email.parser import BytesHeaderParser
+from functools import lru_cache
+from urllib.parse import urljoin
+
+from .http import FETCH_TIMEOUT_SECONDS, HttpStatusError, _pick_user_agent
+from .http_pool import (
+    DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    MAX_REDIRECTS,
+    REDIRECT_STATUSES,
+    HostKey,
+    decode_body,
+    host_key,
+)
+from .models import AsyncJsonFetcher, JsonFetcher
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks: list[bytes] = []
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            # Drain optional trailers up to the terminating blank line.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[bytes, int, Message]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise EOFError("connection closed before a response was received")
+    version, status = status_line.split(b" ", 2)[:2]
+    header_lines: list[bytes] = []
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        header_lines.append(line)
+    return version, int(status), BytesHeaderParser().parsebytes(b"".join(header_lines))
+
+
+@lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    # Loading the CA store dominates context creation: do it once per process.
+    return ssl.create_default_context()
+
+
+Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+async def _close(connection: Connection) -> None:
+    writer = connection[1]
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+async def _exchange(
+    connection: Connection, key: HostKey, path: str, headers: dict[str, str]
+) -> tuple[int, Message, bytes, bool]:
+    """
+    Send one GET over `connection`; returns status, headers, decoded body and whether the
+    connection can carry another request.
+    """
+    reader, writer = connection
+    scheme, host, port = key
+    default_port = 443 if scheme == "https" else 80
+    request_headers = {
+        "Host": host if port == default_port else f"{host}:{port}",
+        "User-Agent": _pick_user_agent(),
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        **headers,
+    }
+    head = "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+    writer.write(f"GET {path} HTTP/1.1\r\n{head}\r\n".encode("latin-1"))
+    await writer.drain()
+
+    version, status, response_headers = await _read_head(reader)
+    while status < 200:
+        version, status, response_headers = await _read_head(reader)
+
+    reusable = version == b"HTTP/1.1" and response_headers.get("Connection", "").lower() != "close"
+    if response_headers.get("Transfer-Encoding", "").lower() == "chunked":
+        body = await _read_chunked(reader)
+    elif response_headers.get("Content-Length") is not None:
+        body = await reader.readexactly(int(response_headers["Content-Length"]))
+    else:
+        body = await reader.read()
+        reusable = False
+    return status, response_headers, decode_body(body, response_headers.get("Content-Encoding")), reusable
+
+
+class AsyncPooledHttpClient:
+    """
+    Async counterpart of `PooledHttpClient`: keep-alive connections per (scheme, host, port)
+    over plain asyncio streams, at most `max_connections_per_host` requests in flight per host.
+
+    Instances are `AsyncJsonFetcher`s. Connections belong to the event loop that opened them,
+    so use one client per loop and close it (`aclose()` or `async with`) before the loop ends.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        timeout: float = FETCH_TIMEOUT_SECONDS,
+    ) -> None:
+        if max_connections_per_host < 1:
+            raise RuntimeError("max_connections_per_host must be >= 1")
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self._idle: dict[HostKey, list[Connection]] = {}
+        self._slots: dict[HostKey, asyncio.Semaphore] = {}
+        self.connections_opened = 0
+
+    async def __aenter__(self) -> AsyncPooledHttpClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                await _close(connection)
+
+    def _slot(self, key: HostKey) -> asyncio.Semaphore:
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = asyncio.Semaphore(self.max_connections_per_host)
+        return slot
+
+    async def _connect(self, key: HostKey) -> Connection:
+        self.connections_opened += 1
+        scheme, host, port = key
+        ssl_context = _ssl_context() if scheme == "https" else None
+        return await asyncio.open_connection(
+            host,
+            port,
+            ssl=ssl_context,
+            server_hostname=host if ssl_context else None,
+        )
+
+    async def _request_once(self, url: str, headers: dict[str, str]) -> tuple[int, Message, bytes]:
+        key, path = host_key(url)
+        async with self._slot(key):
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+            reused = connection is not None
+            if connection is None:
+                connection = await self._connect(key)
+            try:
+                status, response_headers, body, reusable = await _exchange(connection, key, path, headers)
+            except (OSError, EOFError):
+                await _close(connection)
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                connection = await self._connect(key)
+                try:
+                    status, response_headers, body, reusable = await _exchange(connection, key, path, headers)
+                except BaseException:
+                    await _close(connection)
+                    raise
+            except BaseException:
+                await _close(connection)
+                raise
+
+            if reusable:
+                self._idle.setdefault(key, []).append(connection)
+            else:
+                await _close(connection)
+        return status, response_headers, body
+
+    async def aget(self, url: str, headers: dict[str, str] | None = None) -> tuple[int, Message, bytes]:
+        current_url = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                status, response_headers, body = await asyncio.wait_for(
+                    self._request_once(current_url, headers or {}), self.timeout
+                )
+                location = response_headers.get("Location")
+                if status not in REDIRECT_STATUSES or not location:
+                    return status, response_headers, body
+                current_url = urljoin(current_url, location)
+        except (OSError, EOFError, ValueError, IndexError, asyncio.TimeoutError, zlib.error) as err:
+            raise RuntimeError(f"Unable to fetch endpoint '{url}': {err}") from err
+        raise RuntimeError(f"Too many redirects while fetching endpoint '{url}'")
+
+    async def __call__(self, url: str) -> tuple[str, object]:
+        status, _, body = await self.aget(url)
+        if status != 200:
+            raise HttpStatusError(url, status)
+        try:
+            return url, json.loads(body.decode("utf-8", errors="replace"))
+        except json.JSONDecodeError as err:
+            raise RuntimeError(f"Unable to fetch JSON from endpoint '{url}': {err}") from err
+
+
+async def aget(
+    url: str,
+    headers: dict[str, str] | None = None,
+    timeout: float = FETCH_TIMEOUT_SECONDS,
+) -> tuple[int, Message, bytes]:
+    async with AsyncPooledHttpClient(timeout=timeout) as client:
+        return await client.aget(url, headers)
+
+
+async def fetch_json_async(url: str) -> tuple[str, object]:
+    """
+    Async `fetch_json`: plain asyncio streams, no threads. Usable as an `AsyncJsonFetcher`.
+    Each call opens its own connection; share an `AsyncPooledHttpClient` to reuse them.
+    """
+    async with AsyncPooledHttpClient() as client:
+        return await client(url)
+
+
+def to_async_fetcher(fetcher: JsonFetcher) -> AsyncJsonFetcher:
+    """
+    Adapt a sync `JsonFetcher` (e.g. `fetch_json`, a `CachingJsonFetcher`) for `agenerate`.
+    Each call runs in the default executor, so prefer `fetch_json_async` when threads matter.
+    """
+
+    async def fetch(url: str) -> tuple[str, object]:
+        return await asyncio.to_thread(fetcher, url)
+
+    memoize = getattr(fetcher, "memoize", None)
+    if memoize is not None:
+        fetch.memoize = memoize  # type: ignore[attr-defined]
+    return fetch
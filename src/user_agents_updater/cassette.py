@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from .models import JsonFetcher
+
+CASSETTE_FORMAT_VERSION = 1
+
+
+def _canonical_json(payload: object) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def payload_digest(payload: object) -> str:
+    return hashlib.sha256(_canonical_json(payload)).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded URL -> (source, payload) pairs, stored as gzip-compressed JSON.
+
+    Payloads are content-addressed by the SHA-256 of their canonical JSON, so identical
+    responses served under several URLs are stored once.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests: dict[str, dict[str, str]] = {}
+        self.blobs: dict[str, object] = {}
+
+    def add(self, url: str, source: str, payload: object) -> None:
+        digest = payload_digest(payload)
+        with self._lock:
+            self.blobs.setdefault(digest, payload)
+            self.requests[url] = {"source": source, "digest": digest}
+
+    def get(self, url: str) -> tuple[str, object]:
+        entry = self.requests.get(url)
+        if entry is None:
+            raise RuntimeError(f"URL '{url}' is not recorded in cassette")
+        return entry["source"], self.blobs[entry["digest"]]
+
+    def to_dict(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "version": CASSETTE_FORMAT_VERSION,
+                "requests": dict(sorted(self.requests.items())),
+                "blobs": dict(sorted(self.blobs.items())),
+            }
+
+    def save(self, path: Path) -> None:
+        # mtime=0 keeps the gzip header (and therefore the file) byte-for-byte reproducible.
+        data = gzip.compress(_canonical_json(self.to_dict()), mtime=0)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Cassette:
+        try:
+            data = json.loads(gzip.decompress(path.read_bytes()).decode("utf-8"))
+        except (OSError, EOFError, json.JSONDecodeError) as err:
+            raise RuntimeError(f"Unable to read cassette '{path}': {err}") from err
+        if not isinstance(data, dict) or data.get("version") != CASSETTE_FORMAT_VERSION:
+            raise RuntimeError(f"Unsupported cassette format in '{path}'")
+
+        cassette = cls()
+        cassette.requests = data["requests"]
+        cassette.blobs = data["blobs"]
+        for url, entry in cassette.requests.items():
+            if entry.get("digest") not in cassette.blobs:
+                raise RuntimeError(f"Cassette '{path}' has no payload for URL '{url}'")
+        return cassette
+
+
+class RecordingFetcher:
+    """
+    `JsonFetcher` that forwards to `fetcher` and records every response into `cassette`.
+    """
+
+    def __init__(self, fetcher: JsonFetcher, cassette: Cassette | None = None) -> None:
+        self.fetcher = fetcher
+        self.cassette = cassette or Cassette()
+        memoize = getattr(fetcher, "memoize", None)
+        if memoize is not None:
+            self.memoize = memoize
+        set_deadline = getattr(fetcher, "set_deadline", None)
+        if set_deadline is not None:
+            self.set_deadline = set_deadline
+
+    def __call__(self, url: str) -> tuple[str, object]:
+        source, payload = self.fetcher(url)
+        self.cassette.add(url, source, payload)
+        return source, payload
+
+
+class ReplayFetcher:
+    """
+    `JsonFetcher` serving responses from a cassette, with no network access.
+    """
+
+    def __init__(self, cassette: Cassette) -> None:
+        self.cassette = cassette
+
+    @classmethod
+    def from_path(cls, path: Path) -> ReplayFetcher:
+        return cls(Cassette.load(path))
+
+    def __call__(self, url: str) -> tuple[str, object]:
+        return self.cassette.get(url)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from .config import CLIENT_HINT_PLATFORMS
+
+HeaderBundle = tuple[tuple[str, str], ...]
+
+CHROMIUM_BRANDS = {
+    "chrome": "Google Chrome",
+    "edge": "Microsoft Edge",
+}
+CHROMIUM_ACCEPT = (
+    "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,"
+    "application/signed-exchange;v=b3;q=0.7"
+)
+CHROMIUM_ACCEPT_ENCODING = "gzip, deflate, br, zstd"
+GECKO_WEBKIT_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+GECKO_WEBKIT_ACCEPT_ENCODING = "gzip, deflate, br"
+
+# Chromium's GREASE brand (components/embedder_support/user_agent_utils.cc): the brand's
+# characters, version and position are all derived from the major version used as seed.
+_GREASE_CHARS = (" ", "(", ":", "-", ".", "/", ")", ";", "=", "?", "_")
+_GREASE_VERSIONS = ("8", "99", "24")
+_BRAND_ORDERS = ((0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0))
+
+
+def sec_ch_ua(brand: str, major: str) -> str:
+    seed = int(major) if major.isdigit() else 0
+    grease = (
+        f"Not{_GREASE_CHARS[seed % len(_GREASE_CHARS)]}A{_GREASE_CHARS[(seed + 1) % len(_GREASE_CHARS)]}Brand",
+        _GREASE_VERSIONS[seed % len(_GREASE_VERSIONS)],
+    )
+    brands: list[tuple[str, str]] = [("", "")] * 3
+    order = _BRAND_ORDERS[seed % len(_BRAND_ORDERS)]
+    brands[order[0]] = grease
+    brands[order[1]] = ("Chromium", major)
+    brands[order[2]] = (brand, major)
+    return ", ".join(f'"{name}";v="{version}"' for name, version in brands)
+
+
+@lru_cache(maxsize=1024)
+def header_bundle_parts(browser: str, os_name: str, platform: str, major: str) -> tuple[HeaderBundle, HeaderBundle]:
+    """
+    Headers sent before and after `User-Agent`; they only depend on browser, OS and major,
+    so they are computed once and shared by every user-agent of that combination.
+    """
+    chromium = browser in CHROMIUM_BRANDS
+    after = (
+        ("Accept", CHROMIUM_ACCEPT if chromium else GECKO_WEBKIT_ACCEPT),
+        ("Accept-Encoding", CHROMIUM_ACCEPT_ENCODING if chromium else GECKO_WEBKIT_ACCEPT_ENCODING),
+    )
+    hint_platform = CLIENT_HINT_PLATFORMS.get(os_name)
+    if not chromium or hint_platform is None:
+        return (), after
+    before = (
+        ("Sec-CH-UA", sec_ch_ua(CHROMIUM_BRANDS[browser], major)),
+        ("Sec-CH-UA-Mobile", "?1" if platform == "mobile" else "?0"),
+        ("Sec-CH-UA-Platform", f'"{hint_platform}"'),
+    )
+    return before, after
+
+
+def build_header_bundle(browser: str, os_name: str, platform: str, major: str, user_agent: str) -> HeaderBundle:
+    """
+    Request headers consistent with `user_agent`, in the order the browser sends them.
+    Client Hints are only emitted for Chromium browsers on platforms that send them.
+    """
+    before, after = header_bundle_parts(browser, os_name, platform, major)
+    return (*before, ("User-Agent", user_agent), *after)
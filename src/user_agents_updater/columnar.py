@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+
+from .client_hints import build_header_bundle
+from .models import RenderedUserAgentDTO
+
+CATEGORICAL_COLUMNS = ("browser", "platform", "os")
+
+
+class _Dictionary:
+    """
+    Dictionary-encoded column: each distinct value is stored (interned) once, rows hold a code.
+    """
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self.codes_by_value: dict[str, int] = {}
+        self.codes = array("B")
+
+    def append(self, value: str) -> None:
+        code = self.codes_by_value.get(value)
+        if code is None:
+            code = len(self.values)
+            if code > 0xFF:
+                # Widen codes past 256 distinct values; categorical columns rarely get there.
+                self.codes = array("H", self.codes) if self.codes.typecode == "B" else self.codes
+            self.values.append(sys.intern(value))
+            self.codes_by_value[value] = code
+        self.codes.append(code)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[self.codes[index]]
+
+
+class UserAgentRow:
+    """
+    Read-only view of one row of a `UserAgentColumns`; nothing is copied until accessed.
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: UserAgentColumns, index: int) -> None:
+        self._columns = columns
+        self._index = index
+
+    @property
+    def browser(self) -> str:
+        return self._columns.categories["browser"][self._index]
+
+    @property
+    def platform(self) -> str:
+        return self._columns.categories["platform"][self._index]
+
+    @property
+    def os(self) -> str:
+        return self._columns.categories["os"][self._index]
+
+    @property
+    def browser_major_version(self) -> str:
+        return str(self._columns.majors[self._index])
+
+    @property
+    def user_agent(self) -> str:
+        return self._columns.user_agent_at(self._index)
+
+    @property
+    def headers(self) -> tuple[tuple[str, str], ...]:
+        # Derived, not stored: the bundle is a pure function of the other columns.
+        return build_header_bundle(self.browser, self.os, self.platform, self.browser_major_version, self.user_agent)
+
+    def to_dto(self) -> RenderedUserAgentDTO:
+        return RenderedUserAgentDTO(
+            browser=self.browser,
+            platform=self.platform,
+            os=self.os,
+            browser_major_version=self.browser_major_version,
+            user_agent=self.user_agent,
+            headers=self.headers,
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        return self.to_dto().to_dict()
+
+    def __repr__(self) -> str:
+        return f"UserAgentRow({self._index}, {self.user_agent!r})"
+
+
+class UserAgentColumns:
+    """
+    Columnar store of rendered user-agent records.
+
+    `browser`, `platform` and `os` are dictionary-encoded into one-byte codes, majors live in
+    an unsigned int array, and user-agent strings are UTF-8 encoded back to back in one buffer
+    with an offsets array. Rows are exposed as `UserAgentRow` views.
+    """
+
+    def __init__(self) -> None:
+        self.categories = {column: _Dictionary() for column in CATEGORICAL_COLUMNS}
+        self.majors = array("I")
+        self.user_agent_bytes = bytearray()
+        self.offsets = array("Q", [0])
+
+    @classmethod
+    def from_records(cls, records: Iterable[RenderedUserAgentDTO | Mapping[str, object]]) -> UserAgentColumns:
+        columns = cls()
+        columns.extend(records)
+        return columns
+
+    def append(self, browser: str, platform: str, os: str, browser_major_version: str, user_agent: str) -> None:
+        if not browser_major_version.isdigit():
+            raise RuntimeError(f"Invalid major version '{browser_major_version}' for user-agent '{user_agent}'")
+        self.categories["browser"].append(browser)
+        self.categories["platform"].append(platform)
+        self.categories["os"].append(os)
+        self.majors.append(int(browser_major_version))
+        self.user_agent_bytes += user_agent.encode("utf-8")
+        self.offsets.append(len(self.user_agent_bytes))
+
+    def extend(self, records: Iterable[RenderedUserAgentDTO | Mapping[str, object]]) -> None:
+        for record in records:
+            if isinstance(record, RenderedUserAgentDTO):
+                self.append(record.browser, record.platform, record.os, record.browser_major_version, record.user_agent)
+            else:
+                self.append(
+                    record["browser"],
+                    record["platform"],
+                    record["os"],
+                    record["browser_major_version"],
+                    record["user_agent"],
+                )
+
+    def __len__(self) -> int:
+        return len(self.majors)
+
+    def __getitem__(self, index: int) -> UserAgentRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return UserAgentRow(self, index)
+
+    def __iter__(self) -> Iterator[UserAgentRow]:
+        return (UserAgentRow(self, index) for index in range(len(self)))
+
+    def user_agent_at(self, index: int) -> str:
+        return self.user_agent_bytes[self.offsets[index] : self.offsets[index + 1]].decode("utf-8")
+
+    def user_agents(self) -> Iterator[str]:
+        return (self.user_agent_at(index) for index in range(len(self)))
+
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the columns (buffers plus dictionary values).
+        """
+        total = sys.getsizeof(self.majors) + sys.getsizeof(self.user_agent_bytes) + sys.getsizeof(self.offsets)
+        for dictionary in self.categories.values():
+            total += sys.getsizeof(dictionary.codes)
+            total += sum(sys.getsizeof(value) for value in dictionary.values)
+        return total
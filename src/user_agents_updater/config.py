@@ -7,3 +7,48 @@ CHROMIUM_TOKENS = {
     "android": "Linux; Android 10; K",
     "ios": "iPhone; CPU iPhone OS 26_2_1 like Mac OS X",
 }
+
+# Extra OS tokens for corpus generation (see `corpus.py`); the first entry of each tuple
+# is the token used by the published dataset.
+CHROMIUM_OS_TOKENS = {
+    "windows": (
+        CHROMIUM_TOKENS["windows"],
+        "Windows NT 10.0; WOW64",
+        "Windows NT 10.0",
+        "Windows NT 6.3; Win64; x64",
+        "Windows NT 6.1; Win64; x64",
+    ),
+    "macos": (
+        CHROMIUM_TOKENS["macos"],
+        "Macintosh; Intel Mac OS X 10_15_6",
+        "Macintosh; Intel Mac OS X 10_14_6",
+        "Macintosh; Intel Mac OS X 11_7_10",
+        "Macintosh; Intel Mac OS X 12_7_6",
+        "Macintosh; Intel Mac OS X 13_6_9",
+        "Macintosh; Intel Mac OS X 14_7_1",
+    ),
+    "linux": (
+        CHROMIUM_TOKENS["linux"],
+        "X11; Ubuntu; Linux x86_64",
+        "X11; Fedora; Linux x86_64",
+        "X11; Linux aarch64",
+    ),
+}
+GECKO_OS_TOKENS = {
+    "windows": ("Windows NT 10.0; Win64; x64", "Windows NT 10.0; WOW64", "Windows NT 6.1; Win64; x64"),
+    "macos": (
+        "Macintosh; Intel Mac OS X 10.15",
+        "Macintosh; Intel Mac OS X 10.14",
+        "Macintosh; Intel Mac OS X 14.7",
+    ),
+    "linux": ("X11; Linux x86_64", "X11; Fedora; Linux x86_64", "X11; Linux aarch64"),
+    "ubuntu": ("X11; Ubuntu; Linux x86_64", "X11; Ubuntu; Linux i686"),
+}
+
+# `Sec-CH-UA-Platform` values for the OS keys of `CHROMIUM_TOKENS`.
+CLIENT_HINT_PLATFORMS = {
+    "windows": "Windows",
+    "macos": "macOS",
+    "linux": "Linux",
+    "android": "Android",
+}
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import math
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import replace
+from pathlib import Path
+from typing import Protocol
+
+from .client_hints import header_bundle_parts
+from .config import CHROMIUM_OS_TOKENS, GECKO_OS_TOKENS
+from .models import RenderedUserAgentDTO, ResolvedVersionsDTO, UARenderVariantDTO
+from .parsers import major_version
+from .providers_registry import BrowserProvider
+from .rendering import compile_variant
+
+TokenCatalog = Mapping[str, tuple[str, ...]]
+
+DEFAULT_TOKEN_CATALOGS: dict[str, TokenCatalog] = {
+    "chrome": CHROMIUM_OS_TOKENS,
+    "edge": CHROMIUM_OS_TOKENS,
+    "firefox": GECKO_OS_TOKENS,
+}
+REDUCED_BUILD_SUFFIX = "{major_version}.0.0.0"
+DEFAULT_SHARD_LINES = 1_000_000
+
+
+def _digest(value: str) -> bytes:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+
+
+class Deduplicator(Protocol):
+    def add(self, digest: bytes) -> bool:
+        ...
+
+
+class ExactDeduplicator:
+    """
+    Exact dedup over 16-byte digests: memory grows with the number of distinct lines.
+    """
+
+    def __init__(self) -> None:
+        self.seen: set[bytes] = set()
+
+    def add(self, digest: bytes) -> bool:
+        if digest in self.seen:
+            return False
+        self.seen.add(digest)
+        return True
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter sized for `capacity` items at `error_rate` false positives.
+    Memory is constant; a false positive drops a line that was actually new.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise RuntimeError("Bloom filter needs capacity >= 1 and 0 < error_rate < 1")
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, digest: bytes) -> bool:
+        # Double hashing (Kirsch-Mitzenmacher): k positions from the two halves of the digest.
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:16], "big") | 1
+        new = False
+        for index in range(self.hash_count):
+            position = (first + index * second) % self.size
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                new = True
+        return new
+
+
+def expand_variants(
+    browser: str,
+    variants: Iterable[UARenderVariantDTO],
+    token_catalogs: Mapping[str, TokenCatalog] = DEFAULT_TOKEN_CATALOGS,
+    full_build: bool = False,
+) -> Iterator[UARenderVariantDTO]:
+    """
+    Each variant once per OS token known for its browser and OS (the variant's own token first).
+    `full_build` swaps reduced "{major}.0.0.0" versions in templates for the full version.
+    """
+    catalog = token_catalogs.get(browser, {})
+    for variant in variants:
+        template = variant.template.replace(REDUCED_BUILD_SUFFIX, "{version}") if full_build else variant.template
+        for token in dict.fromkeys((variant.token, *catalog.get(variant.os, ()))):
+            yield replace(variant, token=token, template=template)
+
+
+def iter_corpus(
+    providers: Iterable[BrowserProvider],
+    resolved_versions: ResolvedVersionsDTO,
+    token_catalogs: Mapping[str, TokenCatalog] = DEFAULT_TOKEN_CATALOGS,
+    full_build: bool = False,
+    dedup: Deduplicator | None = None,
+    shard_index: int = 0,
+    shard_count: int = 1,
+) -> Iterator[RenderedUserAgentDTO]:
+    """
+    Lazily stream the product of OS tokens x versions x variants for every provider.
+
+    Duplicates are dropped through `dedup` (exact by default). With `shard_count > 1` only
+    lines whose digest falls in `shard_index` are produced, so N workers can each generate a
+    disjoint part of the corpus and dedup stays exact per part.
+    """
+    if not 0 <= shard_index < shard_count:
+        raise RuntimeError("shard_index must be in [0, shard_count)")
+    dedup = ExactDeduplicator() if dedup is None else dedup
+
+    for provider in providers:
+        versions_by_os = resolved_versions.versions_for(provider.name)
+        for variant in expand_variants(provider.name, provider.variants, token_catalogs, full_build):
+            versions = versions_by_os.get(variant.os)
+            if versions is None:
+                continue
+            compiled = compile_variant(variant)
+            for version in (versions,) if isinstance(versions, str) else versions:
+                major = major_version(version)
+                user_agent = compiled.render({"version": version, "major_version": major})
+                digest = _digest(user_agent)
+                if shard_count > 1 and int.from_bytes(digest[:4], "big") % shard_count != shard_index:
+                    continue
+                if not dedup.add(digest):
+                    continue
+                before, after = header_bundle_parts(provider.name, variant.os, variant.platform, major)
+                yield RenderedUserAgentDTO(
+                    browser=provider.name,
+                    platform=variant.platform,
+                    os=variant.os,
+                    browser_major_version=major,
+                    user_agent=user_agent,
+                    headers=before + (("User-Agent", user_agent),) + after,
+                )
+
+
+def write_shards(
+    lines: Iterable[str],
+    directory: Path,
+    prefix: str = "corpus",
+    shard_lines: int = DEFAULT_SHARD_LINES,
+    compress: bool = False,
+) -> list[Path]:
+    """
+    Write `lines` into numbered files of at most `shard_lines` lines each, one open file at a time.
+    """
+    if shard_lines < 1:
+        raise RuntimeError("shard_lines must be >= 1")
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = ".txt.gz" if compress else ".txt"
+    paths: list[Path] = []
+    handle = None
+    written = 0
+    try:
+        for line in lines:
+            if handle is None or written == shard_lines:
+                if handle is not None:
+                    handle.close()
+                path = directory / f"{prefix}-{len(paths):05d}{suffix}"
+                handle = gzip.open(path, "wt", encoding="utf-8") if compress else path.open("w", encoding="utf-8")
+                paths.append(path)
+                written = 0
+            handle.write(line + "\n")
+            written += 1
+    finally:
+        if handle is not None:
+            handle.close()
+    return paths
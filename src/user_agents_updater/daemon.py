@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from .incremental import provider_fingerprint
+from .models import BrowserVersionsMap, JsonFetcher, ResolvedVersionsDTO, UserAgentRecord
+from .providers_registry import BrowserProvider, ProviderSourceInfo, SourceByProviderMap
+from .service import UserAgentService
+
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+
+
+@dataclass(frozen=True)
+class ReleaseWindow:
+    """
+    Weekly UTC window during which a browser usually ships: `weekday` (Monday is 0)
+    from `start_hour` (inclusive) to `end_hour` (exclusive).
+    """
+
+    weekday: int
+    start_hour: int
+    end_hour: int
+
+    def contains(self, moment: datetime) -> bool:
+        return moment.weekday() == self.weekday and self.start_hour <= moment.hour < self.end_hour
+
+    def next_start(self, moment: datetime) -> datetime:
+        start = moment.replace(hour=self.start_hour, minute=0, second=0, microsecond=0)
+        start += timedelta(days=(self.weekday - moment.weekday()) % 7)
+        return start if start > moment else start + timedelta(days=7)
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    interval: float
+    release_interval: float
+    release_windows: tuple[ReleaseWindow, ...] = ()
+
+    def next_delay(self, moment: datetime) -> float:
+        """
+        Seconds until the next poll: `release_interval` inside a release window, otherwise
+        `interval`, shortened so the first poll of the next window is not skipped.
+        """
+        if any(window.contains(moment) for window in self.release_windows):
+            return self.release_interval
+        delay = self.interval
+        for window in self.release_windows:
+            delay = min(delay, (window.next_start(moment) - moment).total_seconds())
+        return max(delay, 0.0)
+
+
+# Release windows are approximate and deliberately wide: Chrome and Firefox ship stable
+# updates on Tuesdays, Edge follows Chrome later in the week, Safari lands with Apple's
+# OS updates early in the week.
+DEFAULT_POLL_POLICIES: dict[str, PollPolicy] = {
+    "chrome": PollPolicy(interval=6 * HOUR, release_interval=15 * MINUTE, release_windows=(ReleaseWindow(1, 15, 23),)),
+    "firefox": PollPolicy(interval=6 * HOUR, release_interval=15 * MINUTE, release_windows=(ReleaseWindow(1, 12, 20),)),
+    "edge": PollPolicy(
+        interval=6 * HOUR,
+        release_interval=30 * MINUTE,
+        release_windows=(ReleaseWindow(3, 15, 24), ReleaseWindow(4, 15, 24)),
+    ),
+    "safari": PollPolicy(
+        interval=12 * HOUR,
+        release_interval=30 * MINUTE,
+        release_windows=(ReleaseWindow(0, 17, 21), ReleaseWindow(1, 17, 21), ReleaseWindow(2, 17, 21)),
+    ),
+}
+FALLBACK_POLL_POLICY = PollPolicy(interval=6 * HOUR, release_interval=6 * HOUR)
+
+
+def _utc_timestamp(moment: datetime) -> str:
+    return moment.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """
+    Immutable, fully rendered dataset. The daemon replaces its current snapshot in one
+    reference assignment, so readers see either the previous or the next one, never a mix.
+    """
+
+    generation: int
+    updated_at: str
+    resolved_versions: ResolvedVersionsDTO
+    sources: Mapping[str, ProviderSourceInfo]
+    fingerprints: Mapping[str, str]
+    user_agents_by_provider: Mapping[str, tuple[UserAgentRecord, ...]]
+    user_agents: tuple[UserAgentRecord, ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        user_agents = tuple(entry for entries in self.user_agents_by_provider.values() for entry in entries)
+        object.__setattr__(self, "user_agents", user_agents)
+
+    def to_metadata(self) -> dict[str, object]:
+        """
+        Same layout as `data/user-agents-metadata.json`.
+        """
+        return {
+            "updated_at": self.updated_at,
+            "sources": dict(self.sources),
+            "resolved_versions": self.resolved_versions.to_dict(),
+            "fingerprints": dict(self.fingerprints),
+            "user_agents": list(self.user_agents),
+        }
+
+
+class RefreshDaemon:
+    """
+    Keeps the dataset in memory and refreshes each provider on its own `PollPolicy`.
+
+    Only the provider that changed is re-rendered; the others are carried over from the
+    previous snapshot. `snapshot()` is lock-free for readers.
+    """
+
+    def __init__(
+        self,
+        service: UserAgentService,
+        fetcher: JsonFetcher,
+        policies: Mapping[str, PollPolicy] | None = None,
+        on_swap: Callable[[DatasetSnapshot], None] | None = None,
+        on_error: Callable[[str, Exception], None] | None = None,
+        now: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.service = service
+        self.fetcher = fetcher
+        self.policies = dict(DEFAULT_POLL_POLICIES if policies is None else policies)
+        self.on_swap = on_swap
+        self.on_error = on_error
+        self.now = now
+        self._refresh_lock = threading.Lock()
+        self._snapshot: DatasetSnapshot | None = None
+
+    def snapshot(self) -> DatasetSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError("No dataset loaded yet: call refresh_all() first")
+        return snapshot
+
+    def policy_for(self, provider_name: str) -> PollPolicy:
+        return self.policies.get(provider_name, FALLBACK_POLL_POLICY)
+
+    def refresh_all(self) -> DatasetSnapshot:
+        """
+        Resolve every provider and publish the first snapshot. Errors propagate.
+        """
+        providers = self.service.registry.all()
+        results = {provider.name: provider.fetch_versions(self.fetcher) for provider in providers}
+        with self._refresh_lock:
+            self._publish(results)
+        return self.snapshot()
+
+    def refresh_provider(self, provider_name: str) -> bool:
+        """
+        Re-resolve one provider. Returns True when a new snapshot was published.
+        """
+        provider = self.service.registry.providers[provider_name]
+        versions, source = provider.fetch_versions(self.fetcher)
+        with self._refresh_lock:
+            current = self.snapshot()
+            if versions == current.resolved_versions.versions_for(provider_name):
+                return False
+            self._publish({provider_name: (versions, source)})
+        return True
+
+    def _publish(self, results: Mapping[str, tuple[BrowserVersionsMap, ProviderSourceInfo]]) -> None:
+        previous = self._snapshot
+        versions: dict[str, BrowserVersionsMap] = {}
+        sources: SourceByProviderMap = {}
+        fingerprints: dict[str, str] = {}
+        user_agents_by_provider: dict[str, tuple[UserAgentRecord, ...]] = {}
+
+        for provider in self.service.registry.all():
+            result = results.get(provider.name)
+            if result is None:
+                if previous is None:
+                    raise RuntimeError(f"Missing versions for browser '{provider.name}'")
+                versions[provider.name] = previous.resolved_versions.versions_for(provider.name)
+                sources[provider.name] = previous.sources[provider.name]
+                fingerprints[provider.name] = previous.fingerprints[provider.name]
+                user_agents_by_provider[provider.name] = previous.user_agents_by_provider[provider.name]
+                continue
+            versions[provider.name], sources[provider.name] = result
+            fingerprints[provider.name] = provider_fingerprint(provider, versions[provider.name])
+            user_agents_by_provider[provider.name] = _render(provider, versions[provider.name])
+
+        snapshot = DatasetSnapshot(
+            generation=0 if previous is None else previous.generation + 1,
+            updated_at=_utc_timestamp(self.now()),
+            resolved_versions=ResolvedVersionsDTO.from_mapping(versions),
+            sources=sources,
+            fingerprints=fingerprints,
+            user_agents_by_provider=user_agents_by_provider,
+        )
+        self._snapshot = snapshot
+        if self.on_swap is not None:
+            self.on_swap(snapshot)
+
+    def run(self, stop: threading.Event) -> None:
+        """
+        Poll providers until `stop` is set. Calls `refresh_all()` first if nothing is loaded.
+        A failing provider keeps its current data and is retried after its normal delay.
+        """
+        if self._snapshot is None:
+            self.refresh_all()
+
+        due: list[tuple[float, str]] = []
+        started = time.monotonic()
+        for provider in self.service.registry.all():
+            delay = self.policy_for(provider.name).next_delay(self.now())
+            heapq.heappush(due, (started + delay, provider.name))
+
+        while due:
+            due_at, provider_name = heapq.heappop(due)
+            if stop.wait(max(due_at - time.monotonic(), 0.0)):
+                return
+            try:
+                self.refresh_provider(provider_name)
+            except Exception as err:  # noqa: BLE001 - one provider must not stop the daemon
+                if self.on_error is not None:
+                    self.on_error(provider_name, err)
+            delay = self.policy_for(provider_name).next_delay(self.now())
+            heapq.heappush(due, (time.monotonic() + delay, provider_name))
+
+
+def _render(provider: BrowserProvider, versions: BrowserVersionsMap) -> tuple[UserAgentRecord, ...]:
+    return tuple(rendered.to_dict() for rendered in provider.render_user_agents(versions))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from .models import BrowserVersionsMap
+from .providers_registry import ProviderSourceInfo
+
+STALE_MARKER_KEYS = frozenset({"status", "reason", "last_good_at"})
+
+
+@dataclass(frozen=True)
+class LastKnownGood:
+    versions: BrowserVersionsMap
+    source: ProviderSourceInfo
+    updated_at: str
+
+    def stale_source(self, reason: str) -> dict[str, str]:
+        """
+        Source entry for a provider served from this snapshot: the previous source URLs plus
+        `status`, `reason` and `last_good_at` markers.
+        """
+        previous = self.source
+        if isinstance(previous, dict):
+            # Re-serving a stale entry keeps its original URLs, not its previous markers.
+            urls = {key: value for key, value in previous.items() if key not in STALE_MARKER_KEYS}
+        else:
+            urls = {"default": previous}
+        return {**urls, "status": "stale", "reason": reason, "last_good_at": self.updated_at}
+
+
+def is_stale_source(source: object) -> bool:
+    return isinstance(source, dict) and source.get("status") == "stale"
+
+
+def last_known_good(previous_metadata: Mapping[str, object] | None, provider_name: str) -> LastKnownGood | None:
+    if not previous_metadata:
+        return None
+    resolved = previous_metadata.get("resolved_versions")
+    sources = previous_metadata.get("sources")
+    if not isinstance(resolved, dict) or not isinstance(sources, dict):
+        return None
+    versions = resolved.get(provider_name)
+    source = sources.get(provider_name)
+    if not isinstance(versions, dict) or not versions or not isinstance(source, (str, dict)):
+        return None
+
+    # A stale entry keeps the timestamp of the run that actually fetched it.
+    updated_at = source.get("last_good_at") if is_stale_source(source) else previous_metadata.get("updated_at")
+    return LastKnownGood(
+        versions=versions,
+        source=source,
+        updated_at=updated_at if isinstance(updated_at, str) else "",
+    )
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from .models import BrowserVersionsMap, ResolvedVersionsDTO
+from .providers_registry import ProviderSourceInfo, SourceByProviderMap
+
+KEYFRAME_INTERVAL = 32
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def parse_timestamp(value: str) -> datetime:
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        raise RuntimeError(f"Timestamp '{value}' has no timezone")
+    return moment
+
+
+def _as_moment(value: datetime | str) -> datetime:
+    if isinstance(value, str):
+        return parse_timestamp(value)
+    if value.tzinfo is None or value.utcoffset() is None:
+        raise ValueError(f"History queries need a timezone-aware datetime, got naive {value.isoformat()}")
+    return value
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    updated_at: str
+    resolved_versions: ResolvedVersionsDTO
+    sources: SourceByProviderMap
+
+
+def _delta(previous: Mapping[str, object], current: Mapping[str, object]) -> dict[str, object]:
+    changes: dict[str, object] = {key: value for key, value in current.items() if previous.get(key) != value}
+    changes.update({key: None for key in previous if key not in current})
+    return changes
+
+
+def _apply(state: dict[str, object], changes: Mapping[str, object]) -> None:
+    for key, value in changes.items():
+        if value is None:
+            state.pop(key, None)
+        else:
+            state[key] = value
+
+
+class VersionHistory:
+    """
+    Append-only JSON Lines log of resolved versions and sources, one line per run.
+
+    Every `KEYFRAME_INTERVAL`-th line is a full snapshot; the others only hold the providers
+    that changed (`null` for a removed provider). A point-in-time query bisects the timestamps,
+    then replays at most `KEYFRAME_INTERVAL - 1` deltas from the closest keyframe.
+
+    The file is read lazily: queries index every line on first use, while `append` alone only
+    reads back from the end of the file to the last full snapshot.
+    """
+
+    def __init__(self, path: Path, keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+        if keyframe_interval < 1:
+            raise RuntimeError("keyframe_interval must be >= 1")
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self._records: list[dict[str, object]] = []
+        self._times: list[datetime] = []
+        self._keyframes: list[int] = []
+        self._loaded = False
+        # What `append` needs: state after the last record, records since (and including) the
+        # last keyframe, and the last timestamp. Filled by `_load` or `_load_tail`.
+        self._tail_loaded = False
+        self._latest: tuple[dict[str, object], dict[str, object]] | None = None
+        self._since_keyframe = 0
+        self._last_time: datetime | None = None
+
+    @property
+    def records(self) -> list[dict[str, object]]:
+        self._load()
+        return self._records
+
+    @property
+    def times(self) -> list[datetime]:
+        self._load()
+        return self._times
+
+    @property
+    def keyframes(self) -> list[int]:
+        self._load()
+        return self._keyframes
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = self._tail_loaded = True
+        self._latest, self._since_keyframe, self._last_time = None, 0, None
+        if self.path.is_file():
+            with self.path.open("r", encoding="utf-8") as handle:
+                for line_number, line in enumerate(handle, start=1):
+                    if line.strip():
+                        record = self._parse_line(line, f"line {line_number}")
+                        if not self._records and record["kind"] != "full":
+                            raise RuntimeError(f"History '{self.path}' does not start with a full snapshot")
+                        self._index(record)
+
+    def _load_tail(self) -> None:
+        if self._tail_loaded:
+            return
+        self._tail_loaded = True
+        tail: list[dict[str, object]] = []
+        if self.path.is_file():
+            with self.path.open("rb") as handle:
+                position = handle.seek(0, os.SEEK_END)
+                pending = b""
+                while position > 0 and (not tail or tail[-1]["kind"] != "full"):
+                    start = max(0, position - TAIL_BLOCK_SIZE)
+                    handle.seek(start)
+                    lines = (handle.read(position - start) + pending).split(b"\n")
+                    position = start
+                    # Unless the file start was reached, the first piece may be a partial line.
+                    pending = lines.pop(0) if position > 0 else b""
+                    for line in reversed(lines):
+                        if line.strip():
+                            tail.append(self._parse_line(line.decode("utf-8"), "near the end"))
+                            if tail[-1]["kind"] == "full":
+                                break
+        if not tail:
+            return
+        if tail[-1]["kind"] != "full":
+            raise RuntimeError(f"History '{self.path}' does not start with a full snapshot")
+        for record in reversed(tail):
+            self._advance(record)
+
+    def _parse_line(self, line: str, location: str) -> dict[str, object]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as err:
+            raise RuntimeError(f"Invalid history record at '{self.path}' {location}: {err}") from err
+        if not isinstance(record, dict) or record.get("kind") not in ("full", "delta"):
+            raise RuntimeError(f"Invalid history record at '{self.path}' {location}")
+        return record
+
+    def _advance(self, record: dict[str, object]) -> datetime:
+        moment = parse_timestamp(record["updated_at"])
+        if self._last_time is not None and moment < self._last_time:
+            raise RuntimeError(f"History records must be in time order, got {record['updated_at']} after {self._last_time}")
+        if record["kind"] == "full":
+            versions, sources = dict(record["versions"]), dict(record["sources"])
+            self._since_keyframe = 0
+        else:
+            assert self._latest is not None
+            versions, sources = dict(self._latest[0]), dict(self._latest[1])
+            _apply(versions, record["versions"])
+            _apply(sources, record["sources"])
+        self._latest = (versions, sources)
+        self._since_keyframe += 1
+        self._last_time = moment
+        return moment
+
+    def _index(self, record: dict[str, object]) -> None:
+        moment = self._advance(record)
+        if record["kind"] == "full":
+            self._keyframes.append(len(self._records))
+        self._records.append(record)
+        self._times.append(moment)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def append(self, updated_at: str, resolved_versions: ResolvedVersionsDTO, sources: SourceByProviderMap) -> bool:
+        """
+        Record one run. Returns False (and writes nothing) when nothing changed since the last record.
+        """
+        self._load_tail()
+        if self._last_time is not None and parse_timestamp(updated_at) < self._last_time:
+            raise RuntimeError(f"Cannot append {updated_at}: history already has a later record")
+        versions = resolved_versions.to_dict()
+        if self._latest is not None and self._latest == (versions, dict(sources)):
+            return False
+        if self._latest is None or self._since_keyframe >= self.keyframe_interval:
+            record = {"updated_at": updated_at, "kind": "full", "versions": versions, "sources": dict(sources)}
+        else:
+            record = {
+                "updated_at": updated_at,
+                "kind": "delta",
+                "versions": _delta(self._latest[0], versions),
+                "sources": _delta(self._latest[1], sources),
+            }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+        if self._loaded:
+            self._index(record)
+        else:
+            self._advance(record)
+        return True
+
+    def _state(self, position: int) -> tuple[dict[str, BrowserVersionsMap], dict[str, ProviderSourceInfo]]:
+        keyframe = self.keyframes[bisect_right(self.keyframes, position) - 1]
+        versions = dict(self.records[keyframe]["versions"])
+        sources = dict(self.records[keyframe]["sources"])
+        for record in self.records[keyframe + 1 : position + 1]:
+            _apply(versions, record["versions"])
+            _apply(sources, record["sources"])
+        return versions, sources
+
+    def _entry(self, position: int, versions: Mapping[str, object], sources: Mapping[str, object]) -> HistoryEntry:
+        return HistoryEntry(
+            updated_at=self.records[position]["updated_at"],
+            resolved_versions=ResolvedVersionsDTO.from_mapping(dict(versions)),
+            sources=dict(sources),
+        )
+
+    def as_of(self, moment: datetime | str) -> HistoryEntry | None:
+        """
+        State in effect at `moment`: the latest record at or before it, None before the first one.
+        A naive `datetime` is rejected with ValueError.
+        """
+        moment = _as_moment(moment)
+        position = bisect_right(self.times, moment) - 1
+        if position < 0:
+            return None
+        return self._entry(position, *self._state(position))
+
+    def between(self, start: datetime | str, end: datetime | str) -> list[HistoryEntry]:
+        """
+        Every record with `start <= updated_at <= end`, in time order.
+        """
+        start, end = _as_moment(start), _as_moment(end)
+        first, last = bisect_left(self.times, start), bisect_right(self.times, end)
+        if first >= last:
+            return []
+        versions, sources = self._state(first)
+        entries = [self._entry(first, versions, sources)]
+        for position in range(first + 1, last):
+            record = self.records[position]
+            if record["kind"] == "full":
+                versions, sources = dict(record["versions"]), dict(record["sources"])
+            else:
+                _apply(versions, record["versions"])
+                _apply(sources, record["sources"])
+            entries.append(self._entry(position, versions, sources))
+        return entries
@@ -1,13 +1,42 @@
 from __future__ import annotations
 
 import json
+import marshal
+import os
 import random
+import threading
+import time
 from pathlib import Path
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+from .rng import current_random
+
 DEFAULT_USER_AGENT_HEADER = "user-agents-updater/1.0"
+FETCH_TIMEOUT_SECONDS = 30
 USER_AGENTS_LIST_PATH = Path(__file__).resolve().parents[2] / "data" / "user-agents.json"
+USER_AGENT_POOL_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "user-agent-pool.marshal"
+USER_AGENT_POOL_CACHE_VERSION = 1
+
+
+class HttpStatusError(RuntimeError):
+    def __init__(self, url: str, status: int) -> None:
+        super().__init__(f"Unable to fetch JSON from endpoint '{url}': HTTP {status}")
+        self.url = url
+        self.status = status
+
+
+def remaining_timeout(deadline: float | None, timeout: float, url: str) -> float:
+    """
+    `timeout`, shortened to what is left before `deadline` (a `time.monotonic()` value).
+    Raises TimeoutError once the deadline has passed.
+    """
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError(f"deadline exceeded before fetching '{url}'")
+    return min(timeout, remaining)
 
 
 def _load_user_agent_pool(path: Path) -> tuple[str, ...]:
@@ -25,20 +54,80 @@ def _load_user_agent_pool(path: Path) -> tuple[str, ...]:
         if isinstance(item, str) and item.strip()
     )
 
-USER_AGENT_POOL: tuple[str, ...] = _load_user_agent_pool(USER_AGENTS_LIST_PATH)
 
-def _pick_user_agent(pool: tuple[str, ...] = USER_AGENT_POOL) -> str:
+def _load_cached_user_agent_pool(path: Path, cache_path: Path) -> tuple[str, ...]:
+    """
+    `_load_user_agent_pool` behind a marshal cache keyed by the source's mtime and size.
+    Cache failures are never fatal: the JSON is parsed instead.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return ()
+    key = (USER_AGENT_POOL_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    try:
+        cached = marshal.loads(cache_path.read_bytes())
+        if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == key and isinstance(cached[1], tuple):
+            return cached[1]
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    pool = _load_user_agent_pool(path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(marshal.dumps((key, pool)))
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+    return pool
+
+
+_user_agent_pool: tuple[str, ...] | None = None
+_user_agent_pool_lock = threading.Lock()
+
+
+def get_user_agent_pool() -> tuple[str, ...]:
+    """
+    UA pool from `data/user-agents.json`, loaded on first use rather than at import.
+    """
+    global _user_agent_pool
+    if _user_agent_pool is None:
+        with _user_agent_pool_lock:
+            if _user_agent_pool is None:
+                _user_agent_pool = _load_cached_user_agent_pool(USER_AGENTS_LIST_PATH, USER_AGENT_POOL_CACHE_PATH)
+    return _user_agent_pool
+
+
+def __getattr__(name: str) -> object:
+    # `USER_AGENT_POOL` stays importable, but is only loaded when first accessed.
+    if name == "USER_AGENT_POOL":
+        return get_user_agent_pool()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _pick_user_agent(pool: tuple[str, ...] | None = None, rng: random.Random | None = None) -> str:
     """
     Selects a random UA if available, otherwise returns the fallback.
-    `pool` is injectable (practical for tests).
+    `pool` and `rng` are injectable (practical for tests); they default to `get_user_agent_pool()`
+    and the current thread's or task's stream from `rng.current_random()`.
     """
-    return random.choice(pool) if pool else DEFAULT_USER_AGENT_HEADER
+    if pool is None:
+        pool = get_user_agent_pool()
+    if not pool:
+        return DEFAULT_USER_AGENT_HEADER
+    return (rng or current_random()).choice(pool)
+
+
+def build_request(url: str, headers: dict[str, str] | None = None) -> Request:
+    return Request(url, headers={"User-Agent": _pick_user_agent(), **(headers or {})})
 
 
-def fetch_json(url: str) -> tuple[str, object]:
+def fetch_json(url: str, timeout: float = FETCH_TIMEOUT_SECONDS) -> tuple[str, object]:
     try:
-        req = Request(url, headers={"User-Agent": _pick_user_agent()})
-        with urlopen(req, timeout=30) as response:
+        req = build_request(url)
+        with urlopen(req, timeout=timeout) as response:
             payload = response.read().decode("utf-8", errors="replace")
         return url, json.loads(payload)
     except (HTTPError, URLError, TimeoutError, json.JSONDecodeError) as err:
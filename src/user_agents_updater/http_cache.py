@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable
+from functools import lru_cache
+from dataclasses import dataclass
+from email.message import Message
+from pathlib import Path
+from typing import TypeVar
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+from .http import FETCH_TIMEOUT_SECONDS, HttpStatusError, build_request, remaining_timeout
+from .http_pool import PooledHttpClient
+from .models import AsyncJsonFetcher, JsonFetcher
+
+T = TypeVar("T")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """
+    Hash of this package's source files. Salts memoized parse results, so a changed or fixed
+    extractor (or anything it calls) never serves a result computed by the previous code.
+    """
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).resolve().parent
+    for path in sorted(package_dir.rglob("*.py")):
+        digest.update(path.relative_to(package_dir).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _encode_parsed(value: object) -> object:
+    # JSON has no tuples: tag containers so a stored result decodes to the types `extract` returned.
+    if isinstance(value, tuple):
+        return {"tuple": [_encode_parsed(item) for item in value]}
+    if isinstance(value, list):
+        return {"list": [_encode_parsed(item) for item in value]}
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("memoized dict keys must be strings")
+        return {"dict": {key: _encode_parsed(item) for key, item in value.items()}}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"cannot memoize {type(value).__name__} results")
+
+
+def _decode_parsed(data: object) -> object:
+    if isinstance(data, dict):
+        ((kind, items),) = data.items()
+        if kind == "tuple":
+            return tuple(_decode_parsed(item) for item in items)
+        if kind == "list":
+            return [_decode_parsed(item) for item in items]
+        return {key: _decode_parsed(item) for key, item in items.items()}
+    return data
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    url: str
+    digest: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def validator_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    On-disk store for HTTP validators, response bodies and memoized parse results.
+
+    Layout under `directory`:
+        entries/<sha256(url)>.json  -> validators + body digest for a URL
+        bodies/<digest>             -> raw response bytes (content-addressed)
+        parsed/<key>-<code>-<digest>.json -> memoized extractor result for a body, where
+                                     <code> is `code_fingerprint()` of the extracting code
+
+    Bodies and parsed results no entry points to any more are removed by `prune()`.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _entry_path(self, url: str) -> Path:
+        return self.directory / "entries" / f"{_sha256(url.encode('utf-8'))}.json"
+
+    def _body_path(self, digest: str) -> Path:
+        return self.directory / "bodies" / digest
+
+    def _parsed_path(self, key: str, digest: str) -> Path:
+        return self.directory / "parsed" / f"{key}-{code_fingerprint()}-{digest}.json"
+
+    def entry_for(self, url: str) -> CacheEntry | None:
+        try:
+            data = json.loads(self._entry_path(url).read_text(encoding="utf-8"))
+            entry = CacheEntry(
+                url=data["url"],
+                digest=data["digest"],
+                etag=data.get("etag"),
+                last_modified=data.get("last_modified"),
+            )
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+        if entry.url != url or not self._body_path(entry.digest).is_file():
+            return None
+        return entry
+
+    def body_for(self, entry: CacheEntry) -> bytes:
+        return self._body_path(entry.digest).read_bytes()
+
+    def store(self, url: str, body: bytes, etag: str | None, last_modified: str | None) -> CacheEntry:
+        entry = CacheEntry(url=url, digest=_sha256(body), etag=etag, last_modified=last_modified)
+        with self._lock:
+            _write_bytes(self._body_path(entry.digest), body)
+            _write_bytes(
+                self._entry_path(url),
+                json.dumps(
+                    {
+                        "url": entry.url,
+                        "digest": entry.digest,
+                        "etag": entry.etag,
+                        "last_modified": entry.last_modified,
+                    }
+                ).encode("utf-8"),
+            )
+        return entry
+
+    def _referenced_digests(self) -> set[str]:
+        digests: set[str] = set()
+        for path in (self.directory / "entries").glob("*.json"):
+            try:
+                digests.add(json.loads(path.read_text(encoding="utf-8"))["digest"])
+            except (OSError, json.JSONDecodeError, KeyError, TypeError):
+                continue
+        return digests
+
+    def prune(self) -> int:
+        """
+        Delete bodies and parsed results whose digest no URL entry references. Returns the count.
+        """
+        removed = 0
+        with self._lock:
+            referenced = self._referenced_digests()
+            for path in (self.directory / "bodies").glob("*"):
+                if path.name not in referenced:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            for path in (self.directory / "parsed").glob("*.json"):
+                # `<key>-<code>-<digest>.json`: the digest is the last 64 hex characters of the stem.
+                if path.stem[-64:] not in referenced:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+    def load_parsed(self, key: str, digest: str) -> tuple[bool, object]:
+        try:
+            data = json.loads(self._parsed_path(key, digest).read_text(encoding="utf-8"))
+            return True, _decode_parsed(data)
+        except (OSError, json.JSONDecodeError, AttributeError, TypeError, ValueError):
+            return False, None
+
+    def store_parsed(self, key: str, digest: str, value: object) -> None:
+        try:
+            encoded = json.dumps(_encode_parsed(value)).encode("utf-8")
+        except TypeError:
+            return  # Not representable in JSON: the result is simply recomputed next time.
+        _write_bytes(self._parsed_path(key, digest), encoded)
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+class CachingJsonFetcher:
+    """
+    `JsonFetcher` that revalidates cached bodies with If-None-Match / If-Modified-Since.
+
+    Requests go through `client` when given (keep-alive pool), otherwise through `urlopen`.
+    A 304 response is served from disk. Decoded payloads are kept in memory per body
+    digest, so an unchanged feed is neither re-downloaded nor re-decoded. When a URL's body
+    changes, the previous digest is dropped from memory and from disk unless another URL
+    still uses it, so a long-lived fetcher holds one payload per URL.
+    """
+
+    def __init__(self, cache: HttpCache, client: PooledHttpClient | None = None) -> None:
+        self.cache = cache
+        self.client = client
+        self.deadline: float | None = None
+        self._lock = threading.Lock()
+        self._payload_by_digest: dict[str, object] = {}
+        self._digest_by_payload_id: dict[int, str] = {}
+        self._digest_by_url: dict[str, str] = {}
+
+    def set_deadline(self, deadline: float | None) -> None:
+        self.deadline = deadline
+        if self.client is not None:
+            self.client.set_deadline(deadline)
+
+    def __call__(self, url: str) -> tuple[str, object]:
+        entry = self.cache.entry_for(url)
+        validators = entry.validator_headers() if entry else {}
+        if self.client is not None:
+            status, headers, body = self._get_pooled(url, validators)
+        else:
+            status, headers, body = self._get_urllib(url, validators)
+
+        if status == 304 and entry is not None:
+            return url, self._decode(url, entry, None)
+        if status != 200 or body is None:
+            raise HttpStatusError(url, status)
+        previous_digest = entry.digest if entry is not None else None
+        entry = self.cache.store(
+            url,
+            body,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+        if previous_digest is not None and previous_digest != entry.digest:
+            self.cache.prune()
+        return url, self._decode(url, entry, body)
+
+    def _get_pooled(self, url: str, validators: dict[str, str]) -> tuple[int, Message, bytes | None]:
+        response = self.client.get(url, validators)
+        return response.status, response.headers, response.body
+
+    def _get_urllib(self, url: str, validators: dict[str, str]) -> tuple[int, Message, bytes | None]:
+        try:
+            timeout = remaining_timeout(self.deadline, FETCH_TIMEOUT_SECONDS, url)
+            with urlopen(build_request(url, validators), timeout=timeout) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as err:
+            if err.code == 304:
+                return err.code, err.headers, None
+            raise HttpStatusError(url, err.code) from err
+        except (URLError, TimeoutError) as err:
+            raise RuntimeError(f"Unable to fetch JSON from endpoint '{url}': {err}") from err
+
+    def _track(self, url: str, digest: str) -> None:
+        # Called with the lock held: forget the URL's previous payload once nothing uses it.
+        previous = self._digest_by_url.get(url)
+        self._digest_by_url[url] = digest
+        if previous is None or previous == digest or previous in self._digest_by_url.values():
+            return
+        payload = self._payload_by_digest.pop(previous, None)
+        if payload is not None:
+            self._digest_by_payload_id.pop(id(payload), None)
+
+    def _decode(self, url: str, entry: CacheEntry, body: bytes | None) -> object:
+        with self._lock:
+            payload = self._payload_by_digest.get(entry.digest)
+            if payload is not None:
+                self._track(url, entry.digest)
+                return payload
+
+        try:
+            raw = body if body is not None else self.cache.body_for(entry)
+            payload = json.loads(raw.decode("utf-8", errors="replace"))
+        except (OSError, json.JSONDecodeError) as err:
+            raise RuntimeError(f"Unable to fetch JSON from endpoint '{url}': {err}") from err
+
+        with self._lock:
+            payload = self._payload_by_digest.setdefault(entry.digest, payload)
+            self._digest_by_payload_id[id(payload)] = entry.digest
+            self._track(url, entry.digest)
+        return payload
+
+    def payload_digest(self, payload: object) -> str | None:
+        with self._lock:
+            return self._digest_by_payload_id.get(id(payload))
+
+    def memoize(self, key: str, payload: object, extract: Callable[[object], T]) -> T:
+        digest = self.payload_digest(payload)
+        if digest is None:
+            return extract(payload)
+        found, value = self.cache.load_parsed(key, digest)
+        if found:
+            return value  # type: ignore[return-value]
+        value = extract(payload)
+        self.cache.store_parsed(key, digest, value)
+        return value
+
+
+def memoized_extract(
+    fetcher: JsonFetcher | AsyncJsonFetcher,
+    key: str,
+    payload: object,
+    extract: Callable[[object], T],
+) -> T:
+    """
+    Run `extract(payload)`, reusing a stored result when `fetcher` can identify the payload by digest.
+
+    Plain fetchers (e.g. `fetch_json`, test fakes) fall through to a direct call.
+    """
+    memoize = getattr(fetcher, "memoize", None)
+    if memoize is None:
+        return extract(payload)
+    return memoize(key, payload, extract)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.message import Message
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection
+from urllib.parse import urljoin, urlsplit
+
+from .http import FETCH_TIMEOUT_SECONDS, HttpStatusError, _pick_user_agent, remaining_timeout
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+HostKey = tuple[str, str, int]
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    url: str
+    status: int
+    headers: Message
+    body: bytes
+
+
+def decode_body(body: bytes, content_encoding: str | None) -> bytes:
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding in ("", "identity"):
+        return body
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        # Servers disagree on whether "deflate" means zlib-wrapped or raw DEFLATE.
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    raise RuntimeError(f"Unsupported Content-Encoding '{content_encoding}'")
+
+
+def host_key(url: str) -> tuple[HostKey, str]:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise RuntimeError(f"Unsupported URL '{url}'")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return (parts.scheme, parts.hostname, port), path
+
+
+class PooledHttpClient:
+    """
+    Keep-alive HTTP client with a small connection pool per (scheme, host, port).
+
+    Instances are `JsonFetcher`s: `client(url)` returns `(url, payload)` like `fetch_json`.
+    Responses are negotiated with `Accept-Encoding: gzip, deflate` and decoded transparently.
+    After `set_deadline()`, socket timeouts shrink to the time left, so no request outlives it.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        timeout: float = FETCH_TIMEOUT_SECONDS,
+    ) -> None:
+        if max_connections_per_host < 1:
+            raise RuntimeError("max_connections_per_host must be >= 1")
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.deadline: float | None = None
+        self._lock = threading.Lock()
+        self._idle: dict[HostKey, list[HTTPConnection]] = {}
+        self._slots: dict[HostKey, threading.BoundedSemaphore] = {}
+        self.connections_opened = 0
+
+    def __enter__(self) -> PooledHttpClient:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def set_deadline(self, deadline: float | None) -> None:
+        """
+        Bound every later request by `deadline`, a `time.monotonic()` value (None to clear).
+        """
+        self.deadline = deadline
+
+    def _slot(self, key: HostKey) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return slot
+
+    def _connect(self, key: HostKey, timeout: float) -> HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        scheme, host, port = key
+        connection_cls = HTTPSConnection if scheme == "https" else HTTPConnection
+        return connection_cls(host, port, timeout=timeout)
+
+    def _acquire(self, key: HostKey, timeout: float) -> tuple[HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            return self._connect(key, timeout), False
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def _release(self, key: HostKey, connection: HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    @staticmethod
+    def _send(connection: HTTPConnection, path: str, headers: dict[str, str]) -> tuple[HTTPResponse, bytes]:
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        return response, response.read()
+
+    def _request_once(self, url: str, headers: dict[str, str]) -> HttpResponse:
+        key, path = host_key(url)
+        request_headers = {
+            "User-Agent": _pick_user_agent(),
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+            **headers,
+        }
+        with self._slot(key):
+            timeout = remaining_timeout(self.deadline, self.timeout, url)
+            connection, reused = self._acquire(key, timeout)
+            try:
+                response, body = self._send(connection, path, request_headers)
+            except (HTTPException, ConnectionError):
+                connection.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                connection = self._connect(key, remaining_timeout(self.deadline, self.timeout, url))
+                try:
+                    response, body = self._send(connection, path, request_headers)
+                except BaseException:
+                    connection.close()
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+
+        return HttpResponse(
+            url=url,
+            status=response.status,
+            headers=response.headers,
+            body=decode_body(body, response.headers.get("Content-Encoding")),
+        )
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> HttpResponse:
+        current_url = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                response = self._request_once(current_url, headers or {})
+                location = response.headers.get("Location")
+                if response.status not in REDIRECT_STATUSES or not location:
+                    return response
+                current_url = urljoin(current_url, location)
+        except (HTTPException, OSError, EOFError, zlib.error) as err:
+            raise RuntimeError(f"Unable to fetch endpoint '{url}': {err}") from err
+        raise RuntimeError(f"Too many redirects while fetching endpoint '{url}'")
+
+    def __call__(self, url: str) -> tuple[str, object]:
+        response = self.get(url)
+        if response.status != 200:
+            raise HttpStatusError(url, response.status)
+        try:
+            return url, json.loads(response.body.decode("utf-8", errors="replace"))
+        except json.JSONDecodeError as err:
+            raise RuntimeError(f"Unable to fetch JSON from endpoint '{url}': {err}") from err
+
+    def fetch_many(self, urls: list[str]) -> list[tuple[str, object]]:
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(urls), self.max_connections_per_host)) as executor:
+            return list(executor.map(self, urls))
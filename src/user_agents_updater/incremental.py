@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+
+from .models import BrowserVersionsMap, ResolvedVersionsDTO, UserAgentRecord
+from .providers_registry import BrowserProvider, SourceByProviderMap
+
+# Bump when the rendered record layout changes, so previously rendered records are not reused.
+RENDER_FORMAT_VERSION = 2
+
+
+def provider_fingerprint(provider: BrowserProvider, versions: BrowserVersionsMap) -> str:
+    """
+    Stable hash of what a provider's rendered output depends on: its resolved versions,
+    its render variants (so template changes also count as a change) and the record format.
+    """
+    material = {
+        "format": RENDER_FORMAT_VERSION,
+        "versions": versions,
+        "variants": [asdict(variant) for variant in provider.variants],
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class IncrementalPlan:
+    fingerprints: dict[str, str]
+    changed: tuple[str, ...]
+    reusable_user_agents: dict[str, list[UserAgentRecord]]
+    # Source URLs or stale markers differ from the previous metadata's `sources`.
+    sources_changed: bool = False
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.changed and not self.sources_changed
+
+
+def plan_incremental_update(
+    providers: list[BrowserProvider],
+    resolved_versions: ResolvedVersionsDTO,
+    previous_metadata: Mapping[str, object] | None,
+    sources: SourceByProviderMap | None = None,
+) -> IncrementalPlan:
+    """
+    Compare fresh fingerprints with the ones stored in the previous metadata output.
+    Providers whose fingerprint matches can reuse their previously rendered records.
+    When `sources` is given, the plan is not `unchanged` unless they match the stored ones too.
+    """
+    previous_fingerprints = (previous_metadata or {}).get("fingerprints")
+    if not isinstance(previous_fingerprints, dict):
+        previous_fingerprints = {}
+    previous_user_agents = (previous_metadata or {}).get("user_agents")
+    if not isinstance(previous_user_agents, list):
+        previous_user_agents = []
+
+    fingerprints: dict[str, str] = {}
+    changed: list[str] = []
+    reusable: dict[str, list[UserAgentRecord]] = {}
+    for provider in providers:
+        fingerprint = provider_fingerprint(provider, resolved_versions.versions_for(provider.name))
+        fingerprints[provider.name] = fingerprint
+        if previous_fingerprints.get(provider.name) != fingerprint:
+            changed.append(provider.name)
+            continue
+        reusable[provider.name] = [
+            entry
+            for entry in previous_user_agents
+            if isinstance(entry, dict) and entry.get("browser") == provider.name
+        ]
+
+    return IncrementalPlan(
+        fingerprints=fingerprints,
+        changed=tuple(changed),
+        reusable_user_agents=reusable,
+        sources_changed=sources is not None and (previous_metadata or {}).get("sources") != sources,
+    )
@@ -1,8 +1,143 @@
 from __future__ import annotations
 
+import gzip
 import json
+import os
+import tempfile
+from collections.abc import Callable, Iterable
 from pathlib import Path
 
+try:
+    import brotli
+except ImportError:  # Optional: the ".br" variant is skipped.
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # Optional: the ".msgpack" variant is unavailable.
+    msgpack = None
+
+Encoder = Callable[[object], bytes]
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write `data` to a temporary file next to `path`, then rename it into place.
+    Readers see either the previous file or the complete new one, never a partial write.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(temp_name, 0o644)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def pretty_json_bytes(data: object) -> bytes:
+    return (json.dumps(data, indent=2) + "\n").encode("utf-8")
+
+
+def minified_json_bytes(data: object) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _gzip_bytes(data: object) -> bytes:
+    # mtime=0 keeps the archive byte-identical for identical content.
+    return gzip.compress(minified_json_bytes(data), compresslevel=9, mtime=0)
+
+
+def _brotli_bytes(data: object) -> bytes:
+    return brotli.compress(minified_json_bytes(data), quality=11)
+
+
+def _msgpack_bytes(data: object) -> bytes:
+    return msgpack.packb(data, use_bin_type=True)
+
+
+# Suffix that replaces ".json" in the base file name -> encoder.
+OUTPUT_FORMATS: dict[str, Encoder] = {
+    ".json": pretty_json_bytes,
+    ".min.json": minified_json_bytes,
+    ".min.json.gz": _gzip_bytes,
+    ".min.json.br": _brotli_bytes,
+    ".msgpack": _msgpack_bytes,
+}
+
+
+def _missing_encoder(suffix: str) -> str | None:
+    # Package an optional format needs, when it is not installed.
+    if suffix == ".min.json.br" and brotli is None:
+        return "brotli"
+    if suffix == ".msgpack" and msgpack is None:
+        return "msgpack"
+    return None
+
+
+def available_formats(include_msgpack: bool = False) -> tuple[str, ...]:
+    """
+    Formats written by default: pretty, minified and gzip JSON, plus brotli when installed.
+    MessagePack is opt-in and requires the `msgpack` package.
+    """
+    if include_msgpack and msgpack is None:
+        raise RuntimeError("MessagePack output requires the 'msgpack' package")
+    formats = [".json", ".min.json", ".min.json.gz"]
+    if brotli is not None:
+        formats.append(".min.json.br")
+    if include_msgpack:
+        formats.append(".msgpack")
+    return tuple(formats)
+
+
+def output_path(path: Path, suffix: str) -> Path:
+    """
+    `data/user-agents.json` with suffix ".min.json.gz" -> `data/user-agents.min.json.gz`.
+    """
+    stem = path.name[: -len(".json")] if path.name.endswith(".json") else path.name
+    return path.with_name(stem + suffix)
+
+
+def formats_for(path: Path, formats: Iterable[str] | None = None) -> tuple[str, ...]:
+    """
+    `formats` plus every variant already published next to `path`, so none outlives the data
+    it was encoded from. Raises when one of them needs an encoder that is not installed.
+    """
+    formats = available_formats() if formats is None else tuple(formats)
+    unknown = [suffix for suffix in formats if suffix not in OUTPUT_FORMATS]
+    if unknown:
+        raise RuntimeError(f"Unknown output formats: {', '.join(unknown)}")
+    published = [suffix for suffix in OUTPUT_FORMATS if suffix not in formats and output_path(path, suffix).is_file()]
+    formats = (*formats, *published)
+    for suffix in formats:
+        package = _missing_encoder(suffix)
+        if package is not None:
+            raise RuntimeError(
+                f"Cannot update '{output_path(path, suffix)}': the '{package}' package is not installed"
+            )
+    return formats
+
+
+def write_json_outputs(path: Path, data: object, formats: Iterable[str] | None = None) -> dict[str, Path]:
+    """
+    Atomically write `data` to `path` and its sibling encodings (see `formats_for`), one file
+    per format. Nothing is written when a format cannot be encoded; variants are never deleted.
+    """
+    formats = formats_for(path, formats)
+    written: dict[str, Path] = {}
+    for suffix in formats:
+        target = output_path(path, suffix)
+        atomic_write_bytes(target, OUTPUT_FORMATS[suffix](data))
+        written[suffix] = target
+    return written
+
 
 def write_pretty_json(path: Path, data: object) -> None:
-    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    atomic_write_bytes(path, pretty_json_bytes(data))
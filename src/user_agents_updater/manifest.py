@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .json_io import atomic_write_bytes, minified_json_bytes
+
+MANIFEST_FORMAT_VERSION = 1
+OBJECTS_DIR_NAME = "objects"
+HASH_NAME_LENGTH = 16
+
+
+def dataset_fingerprint(fingerprints: Mapping[str, str]) -> str:
+    """
+    One hash over every provider fingerprint: changes whenever any provider's resolved
+    versions, variants or record format change.
+    """
+    encoded = json.dumps(dict(fingerprints), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def content_addressed_name(name: str, digest: str) -> str:
+    """
+    "user-agents.min.json.gz" with digest "ab12..." -> "user-agents.ab12....min.json.gz".
+    """
+    stem, dot, suffixes = name.partition(".")
+    return f"{stem}.{digest[:HASH_NAME_LENGTH]}{dot}{suffixes}"
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    path: str
+    sha256: str
+    size: int
+    records: int
+    fingerprint: str
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+def publish_object(source: Path, objects_dir: Path, records: int, fingerprint: str) -> ManifestEntry:
+    """
+    Copy `source` under its content-addressed name in `objects_dir`. An existing object with
+    that name already holds the same bytes and is left untouched (objects are immutable).
+    """
+    data = source.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    target = objects_dir / content_addressed_name(source.name, digest)
+    if not target.is_file():
+        atomic_write_bytes(target, data)
+    return ManifestEntry(
+        path=target.relative_to(objects_dir.parent).as_posix(),
+        sha256=digest,
+        size=len(data),
+        records=records,
+        fingerprint=fingerprint,
+    )
+
+
+def load_manifest(path: Path) -> dict[str, object] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _referenced_objects(manifest: Mapping[str, object] | None) -> set[str]:
+    files = (manifest or {}).get("files")
+    if not isinstance(files, dict):
+        return set()
+    return {entry["path"] for entry in files.values() if isinstance(entry, dict) and isinstance(entry.get("path"), str)}
+
+
+def publish_manifest(
+    manifest_path: Path,
+    outputs: Mapping[Path, int],
+    fingerprint: str,
+    updated_at: str,
+) -> dict[str, object]:
+    """
+    Publish every output (path -> record count) as a content-addressed object next to the
+    manifest, then atomically replace the manifest.
+
+    Objects referenced by the new or the previous manifest are kept, so a mirror that read
+    the previous manifest can still fetch its files; older objects are removed.
+    """
+    objects_dir = manifest_path.parent / OBJECTS_DIR_NAME
+    previous = load_manifest(manifest_path)
+    entries = {
+        path.name: publish_object(path, objects_dir, records, fingerprint)
+        for path, records in outputs.items()
+    }
+    manifest = {
+        "version": MANIFEST_FORMAT_VERSION,
+        "updated_at": updated_at,
+        "fingerprint": fingerprint,
+        "files": {name: entry.to_dict() for name, entry in sorted(entries.items())},
+    }
+    atomic_write_bytes(manifest_path, minified_json_bytes(manifest))
+
+    keep = _referenced_objects(manifest) | _referenced_objects(previous)
+    for path in objects_dir.iterdir() if objects_dir.is_dir() else ():
+        if path.is_file() and path.relative_to(manifest_path.parent).as_posix() not in keep:
+            path.unlink()
+    return manifest
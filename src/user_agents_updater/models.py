@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from types import MappingProxyType
-from typing import Callable
+from typing import Awaitable, Callable
 from typing import Literal
 
 JsonFetcher = Callable[[str], tuple[str, object]]
+AsyncJsonFetcher = Callable[[str], Awaitable[tuple[str, object]]]
 PlatformName = Literal["desktop", "mobile"]
 BrowserName = Literal["firefox", "chrome", "edge", "safari"]
 VersionValue = str | list[str]
@@ -14,6 +15,8 @@ ScalarVersionsMap = dict[str, str]
 MultiVersionsMap = dict[str, list[str]]
 FrozenVersionValue = str | tuple[str, ...]
 FrozenVersionsMap = MappingProxyType[str, FrozenVersionValue]
+# `RenderedUserAgentDTO.to_dict()`: string fields plus the `headers` mapping.
+UserAgentRecord = dict[str, object]
 
 
 @dataclass(frozen=True)
@@ -23,14 +26,17 @@ class RenderedUserAgentDTO:
     os: str
     browser_major_version: str
     user_agent: str
+    # Request headers matching `user_agent` (name, value), in sending order.
+    headers: tuple[tuple[str, str], ...] = ()
 
-    def to_dict(self) -> dict[str, str]:
+    def to_dict(self) -> UserAgentRecord:
         return {
             "browser": self.browser,
             "platform": self.platform,
             "os": self.os,
             "browser_major_version": self.browser_major_version,
             "user_agent": self.user_agent,
+            "headers": dict(self.headers),
         }
 
 
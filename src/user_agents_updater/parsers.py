@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass
+
 
 def parse_semver_like(value: str) -> tuple[int, ...]:
     parts = value.split(".")
 
-    if not all(part.isdigit() for part in parts):
+    if not all(map(str.isdigit, parts)):
         return ()
 
     return tuple(map(int, parts))
@@ -12,3 +16,59 @@ def parse_semver_like(value: str) -> tuple[int, ...]:
 
 def major_version(value: str) -> str:
     return value.split(".", 1)[0]
+
+
+@dataclass(frozen=True, order=True, slots=True)
+class Version:
+    """
+    A version string parsed once. Ordering compares `key` (then `text`, for equal keys).
+    """
+
+    key: tuple[int, ...]
+    text: str
+
+    @classmethod
+    def parse(cls, value: str) -> Version | None:
+        key = parse_semver_like(value)
+        return cls(key, value) if key else None
+
+    @property
+    def major(self) -> int:
+        return self.key[0]
+
+
+def select_latest_majors(candidates: Iterable[str], major_count: int) -> list[Version]:
+    """
+    Latest version of each of the `major_count` newest majors, newest first.
+
+    Single pass keeping the best `Version` per major and a size-k min-heap of the newest
+    majors: O(n + m log k) for n candidates over m majors, instead of sorting every candidate.
+    Candidates whose major is below the k-th newest major seen are rejected from their first
+    segment alone. Unparseable candidates are skipped; on equal keys the first candidate wins.
+    """
+    if major_count < 1:
+        return []
+    latest: dict[int, Version] = {}
+    majors: list[int] = []
+    floor = -1
+    for value in candidates:
+        head = value.partition(".")[0]
+        if not head.isdigit() or int(head) < floor:
+            continue
+        key = parse_semver_like(value)
+        if not key:
+            continue
+        major = key[0]
+        current = latest.get(major)
+        if current is not None:
+            if key > current.key:
+                latest[major] = Version(key, value)
+            continue
+        if len(majors) < major_count:
+            heapq.heappush(majors, major)
+        else:
+            del latest[heapq.heapreplace(majors, major)]
+        latest[major] = Version(key, value)
+        if len(majors) == major_count:
+            floor = majors[0]
+    return [latest[major] for major in sorted(majors, reverse=True)]
@@ -2,14 +2,20 @@ from __future__ import annotations
 
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from urllib.parse import quote
 
 from ..config import CHROMIUM_TOKENS
-from ..models import BrowserVersionsMap, JsonFetcher, MultiVersionsMap, RenderedUserAgentDTO, UARenderVariantDTO
-from ..parsers import parse_semver_like
+from ..http_cache import memoized_extract
+from ..models import AsyncJsonFetcher, BrowserVersionsMap, JsonFetcher, MultiVersionsMap, RenderedUserAgentDTO, UARenderVariantDTO
+from ..parsers import parse_semver_like, select_latest_majors
 from ..providers_registry import ProviderBase, ProviderSourceInfo
 from ..rendering import render_variants
 
 CHROME_DEFAULT_MAJOR_COUNT = 3
+CHROME_ALL_PLATFORMS_PAGE_SIZE = 100
+CHROME_ALL_PLATFORMS_MAX_PAGES = 20
+CHROME_BACKFILL_PAGE_SIZE = 1000
+CHROME_BACKFILL_MAX_PAGES = 200
 CHROME_VARIANTS = [
     UARenderVariantDTO(
         platform="desktop",
@@ -46,17 +52,38 @@ CHROME_VARIANTS = [
 ]
 
 
-def _extract_chrome_versionhistory_candidates(data: object) -> list[str]:
+def _versionhistory_items(data: object) -> list[object]:
     if not isinstance(data, dict):
         raise RuntimeError("Invalid VersionHistory payload")
     versions = data.get("versions")
     if not isinstance(versions, list):
         raise RuntimeError("Missing versions list in VersionHistory payload")
+    return versions
 
+
+def _versionhistory_platform(item: dict) -> str | None:
+    # Resource names look like "chrome/platforms/{platform}/channels/{channel}/versions/{version}".
+    name = item.get("name")
+    if not isinstance(name, str):
+        return None
+    parts = name.split("/")
+    if len(parts) < 3 or parts[1] != "platforms":
+        return None
+    return parts[2]
+
+
+def _versionhistory_next_page_token(data: object) -> str | None:
+    token = data.get("nextPageToken") if isinstance(data, dict) else None
+    return token if isinstance(token, str) and token else None
+
+
+def _extract_chrome_versionhistory_candidates(data: object, platform: str | None = None) -> list[str]:
     candidates: list[str] = []
-    for item in versions:
+    for item in _versionhistory_items(data):
         if not isinstance(item, dict):
             continue
+        if platform is not None and _versionhistory_platform(item) != platform:
+            continue
         value = item.get("version")
         if isinstance(value, str):
             candidates.append(value)
@@ -70,48 +97,89 @@ def _extract_chrome_versionhistory_candidates(data: object) -> list[str]:
 def extract_chrome_latest_major_versions(
     data: object,
     major_count: int = CHROME_DEFAULT_MAJOR_COUNT,
+    platform: str | None = None,
 ) -> list[str]:
+    """
+    Latest version of each of the `major_count` newest majors.
+    `platform` (e.g. "win64") restricts a multi-platform payload to one platform's entries.
+    """
     if major_count < 1:
         raise RuntimeError("major_count must be >= 1")
 
-    major_versions: list[str] = []
-    seen: set[int] = set()
-    for version in sorted(_extract_chrome_versionhistory_candidates(data), key=parse_semver_like, reverse=True):
-        parsed = parse_semver_like(version)
-        if not parsed:
-            continue
-        major = parsed[0]
-        if major in seen:
-            continue
-        seen.add(major)
-        major_versions.append(version)
-        if len(major_versions) == major_count:
-            return major_versions
-
+    candidates = _extract_chrome_versionhistory_candidates(data, platform)
+    major_versions = select_latest_majors(candidates, major_count)
     if not major_versions:
         raise RuntimeError("No parseable Chrome semantic versions found in VersionHistory payload")
 
-    return major_versions
+    return [version.text for version in major_versions]
+
+
+class _AllPlatformsCollector:
+    """
+    Accumulates pages of an all-platforms VersionHistory listing (ordered by version desc)
+    until every wanted platform has `major_count` distinct majors.
+    """
+
+    def __init__(self, platform_segments: dict[str, str], major_count: int) -> None:
+        self.platform_segments = platform_segments
+        self.major_count = major_count
+        self.items: list[dict] = []
+        self._majors: dict[str, set[int]] = {segment: set() for segment in platform_segments.values()}
 
+    def add_page(self, data: object) -> str | None:
+        for item in _versionhistory_items(data):
+            if not isinstance(item, dict):
+                continue
+            majors = self._majors.get(_versionhistory_platform(item) or "")
+            version = item.get("version")
+            if majors is None or not isinstance(version, str):
+                continue
+            parsed = parse_semver_like(version)
+            if not parsed:
+                continue
+            if parsed[0] not in majors:
+                if len(majors) >= self.major_count:
+                    continue
+                majors.add(parsed[0])
+            self.items.append(item)
 
-def _resolve_chrome_source(
-    source_key: str,
-    url: str,
-    fetcher: JsonFetcher,
-    major_count: int,
-) -> tuple[str, list[str], str]:
-    source, payload = fetcher(url)
-    return source_key, extract_chrome_latest_major_versions(payload, major_count), source
+        return _versionhistory_next_page_token(data)
+
+    def complete(self) -> bool:
+        return all(len(majors) >= self.major_count for majors in self._majors.values())
+
+    def versions(self) -> MultiVersionsMap:
+        payload = {"versions": self.items}
+        return {
+            os_name: extract_chrome_latest_major_versions(payload, self.major_count, platform=segment)
+            for os_name, segment in self.platform_segments.items()
+        }
 
 
 @dataclass(frozen=True)
 class ChromeProvider(ProviderBase):
     major_count: int = CHROME_DEFAULT_MAJOR_COUNT
+    # One paginated `platforms/all` listing instead of one request per platform.
+    all_platforms: bool = False
+    page_size: int = CHROME_ALL_PLATFORMS_PAGE_SIZE
+    # Walk every page of each platform's history before selecting majors (see `fetch_history`).
+    backfill: bool = False
+    backfill_page_size: int = CHROME_BACKFILL_PAGE_SIZE
+    backfill_max_pages: int = CHROME_BACKFILL_MAX_PAGES
     name = "chrome"
+    variants = CHROME_VARIANTS
     versionhistory_url_template = (
         "https://versionhistory.googleapis.com/v1/chrome/platforms/{platform}/"
         "channels/stable/versions?order_by=version%20desc&pageSize=30"
     )
+    versionhistory_paged_url_template = (
+        "https://versionhistory.googleapis.com/v1/chrome/platforms/{platform}/"
+        "channels/stable/versions?order_by=version%20desc&pageSize={page_size}"
+    )
+    versionhistory_all_platforms_url_template = (
+        "https://versionhistory.googleapis.com/v1/chrome/platforms/all/"
+        "channels/stable/versions?order_by=version%20desc&pageSize={page_size}"
+    )
     platform_segments = {
         "windows": "win64",
         "macos": "mac",
@@ -121,40 +189,180 @@ class ChromeProvider(ProviderBase):
     }
 
     def source_urls(self) -> dict[str, str]:
+        if self.backfill:
+            return {os_name: self.history_url(segment) for os_name, segment in self.platform_segments.items()}
+        if self.all_platforms:
+            return {"all": self.all_platforms_url()}
         return {
             os_name: self.versionhistory_url_template.format(platform=platform_segment)
             for os_name, platform_segment in self.platform_segments.items()
         }
 
+    def all_platforms_url(self, page_token: str | None = None) -> str:
+        url = self.versionhistory_all_platforms_url_template.format(page_size=self.page_size)
+        return f"{url}&pageToken={quote(page_token, safe='')}" if page_token else url
+
+    def history_url(self, platform_segment: str, page_token: str | None = None) -> str:
+        url = self.versionhistory_paged_url_template.format(platform=platform_segment, page_size=self.backfill_page_size)
+        return f"{url}&pageToken={quote(page_token, safe='')}" if page_token else url
+
+    def _all_platforms_result(
+        self, collector: _AllPlatformsCollector, first_source: str
+    ) -> tuple[MultiVersionsMap, ProviderSourceInfo]:
+        return collector.versions(), {os_name: first_source for os_name in self.platform_segments}
+
+    def _next_all_platforms_url(self, collector: _AllPlatformsCollector, payload: object) -> str | None:
+        # One listing page: collect its items, then the next page's URL while more are needed.
+        page_token = collector.add_page(payload)
+        if collector.complete() or page_token is None:
+            return None
+        return self.all_platforms_url(page_token)
+
+    def _fetch_all_platforms(self, fetcher: JsonFetcher) -> tuple[MultiVersionsMap, ProviderSourceInfo]:
+        collector = _AllPlatformsCollector(self.platform_segments, self.major_count)
+        url: str | None = self.all_platforms_url()
+        first_source: str | None = None
+        for _ in range(CHROME_ALL_PLATFORMS_MAX_PAGES):
+            source, payload = fetcher(url)
+            first_source = first_source or source
+            if (url := self._next_all_platforms_url(collector, payload)) is None:
+                break
+        return self._all_platforms_result(collector, first_source or self.all_platforms_url())
+
+    async def _afetch_all_platforms(self, fetcher: AsyncJsonFetcher) -> tuple[MultiVersionsMap, ProviderSourceInfo]:
+        collector = _AllPlatformsCollector(self.platform_segments, self.major_count)
+        url: str | None = self.all_platforms_url()
+        first_source: str | None = None
+        for _ in range(CHROME_ALL_PLATFORMS_MAX_PAGES):
+            source, payload = await fetcher(url)
+            first_source = first_source or source
+            if (url := self._next_all_platforms_url(collector, payload)) is None:
+                break
+        return self._all_platforms_result(collector, first_source or self.all_platforms_url())
+
+    def _next_history_url(self, platform_segment: str, versions: list[str], payload: object) -> str | None:
+        # One history page: collect its versions, then the next page's URL (None on the last page).
+        versions.extend(_extract_chrome_versionhistory_candidates(payload))
+        page_token = _versionhistory_next_page_token(payload)
+        return None if page_token is None else self.history_url(platform_segment, page_token)
+
+    def _fetch_platform_history(self, fetcher: JsonFetcher, platform_segment: str) -> tuple[list[str], str]:
+        # Pages of one platform are chained by their tokens, so they are fetched in order.
+        url: str | None = self.history_url(platform_segment)
+        first_source: str | None = None
+        versions: list[str] = []
+        for _ in range(self.backfill_max_pages):
+            source, payload = fetcher(url)
+            first_source = first_source or source
+            if (url := self._next_history_url(platform_segment, versions, payload)) is None:
+                break
+        return versions, first_source or self.history_url(platform_segment)
+
+    async def _afetch_platform_history(self, fetcher: AsyncJsonFetcher, platform_segment: str) -> tuple[list[str], str]:
+        url: str | None = self.history_url(platform_segment)
+        first_source: str | None = None
+        versions: list[str] = []
+        for _ in range(self.backfill_max_pages):
+            source, payload = await fetcher(url)
+            first_source = first_source or source
+            if (url := self._next_history_url(platform_segment, versions, payload)) is None:
+                break
+        return versions, first_source or self.history_url(platform_segment)
+
+    def fetch_history(self, fetcher: JsonFetcher) -> tuple[MultiVersionsMap, ProviderSourceInfo]:
+        """
+        Every stable version of every platform (up to `backfill_max_pages` pages each).
+        Platforms are walked concurrently, one page chain per thread.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.platform_segments)) as executor:
+            futures = {
+                os_name: executor.submit(self._fetch_platform_history, fetcher, platform_segment)
+                for os_name, platform_segment in self.platform_segments.items()
+            }
+            results = {os_name: future.result() for os_name, future in futures.items()}
+        return (
+            {os_name: versions for os_name, (versions, _) in results.items()},
+            {os_name: source for os_name, (_, source) in results.items()},
+        )
+
+    async def afetch_history(self, fetcher: AsyncJsonFetcher) -> tuple[MultiVersionsMap, ProviderSourceInfo]:
+        import asyncio
+
+        results = await asyncio.gather(
+            *(self._afetch_platform_history(fetcher, segment) for segment in self.platform_segments.values())
+        )
+        return (
+            {os_name: versions for os_name, (versions, _) in zip(self.platform_segments, results)},
+            {os_name: source for os_name, (_, source) in zip(self.platform_segments, results)},
+        )
+
+    def _latest_from_history(self, history: MultiVersionsMap) -> MultiVersionsMap:
+        versions: MultiVersionsMap = {}
+        for os_name, candidates in history.items():
+            latest = select_latest_majors(candidates, self.major_count)
+            if not latest:
+                raise RuntimeError("No parseable Chrome semantic versions found in VersionHistory payload")
+            versions[os_name] = [version.text for version in latest]
+        return versions
+
     def fetch_versions(self, fetcher: JsonFetcher) -> tuple[MultiVersionsMap, ProviderSourceInfo]:
         if self.major_count < 1:
             raise RuntimeError("major_count must be >= 1")
+        if self.backfill:
+            history, sources = self.fetch_history(fetcher)
+            return self._latest_from_history(history), sources
+        if self.all_platforms:
+            return self._fetch_all_platforms(fetcher)
 
-        versions: MultiVersionsMap = {}
-        sources: dict[str, str] = {}
         source_urls = self.source_urls()
+        fetch_many = getattr(fetcher, "fetch_many", None)
+        if fetch_many is not None:
+            # The fetcher schedules the requests itself (pool, scheduler): no nested threads here.
+            results = fetch_many(list(source_urls.values()))
+        else:
+            with ThreadPoolExecutor(max_workers=len(source_urls)) as executor:
+                results = list(executor.map(fetcher, source_urls.values()))
+        return self._versions_from_results(fetcher, source_urls, results)
+
+    async def afetch_versions(self, fetcher: AsyncJsonFetcher) -> tuple[MultiVersionsMap, ProviderSourceInfo]:
+        if self.major_count < 1:
+            raise RuntimeError("major_count must be >= 1")
+        if self.backfill:
+            history, sources = await self.afetch_history(fetcher)
+            return self._latest_from_history(history), sources
+        if self.all_platforms:
+            return await self._afetch_all_platforms(fetcher)
 
-        with ThreadPoolExecutor(max_workers=len(source_urls)) as executor:
-            futures = [
-                executor.submit(
-                    _resolve_chrome_source,
-                    source_key,
-                    url,
-                    fetcher,
-                    self.major_count,
-                )
-                for source_key, url in source_urls.items()
-            ]
-            for future in futures:
-                source_key, version, source = future.result()
-                versions[source_key] = version
-                sources[source_key] = source
+        import asyncio
 
+        source_urls = self.source_urls()
+        results = await asyncio.gather(*(fetcher(url) for url in source_urls.values()))
+        return self._versions_from_results(fetcher, source_urls, results)
+
+    def _versions_from_results(
+        self,
+        fetcher: JsonFetcher | AsyncJsonFetcher,
+        source_urls: dict[str, str],
+        results: list[tuple[str, object]],
+    ) -> tuple[MultiVersionsMap, ProviderSourceInfo]:
+        versions: MultiVersionsMap = {}
+        sources: dict[str, str] = {}
+        for source_key, (source, payload) in zip(source_urls, results):
+            versions[source_key] = self._extract(fetcher, payload)
+            sources[source_key] = source
         return versions, sources
 
+    def _extract(self, fetcher: JsonFetcher | AsyncJsonFetcher, payload: object) -> list[str]:
+        return memoized_extract(
+            fetcher,
+            f"chrome-{self.major_count}",
+            payload,
+            lambda data: extract_chrome_latest_major_versions(data, self.major_count),
+        )
+
     def render_user_agents(self, versions_by_os: BrowserVersionsMap) -> list[RenderedUserAgentDTO]:
         return render_variants(
             browser=self.name,
-            variants=CHROME_VARIANTS,
+            variants=self.variants,
             versions_by_os=versions_by_os,
         )
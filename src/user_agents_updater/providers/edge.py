@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from ..config import CHROMIUM_TOKENS
+from ..http_cache import memoized_extract
 from ..models import BrowserVersionsMap, JsonFetcher, RenderedUserAgentDTO, ScalarVersionsMap, UARenderVariantDTO
 from ..providers_registry import ProviderBase, ProviderSourceInfo, single_source_url
 from ..rendering import render_variants
@@ -52,6 +53,7 @@ def extract_edge_versions(data: object) -> ScalarVersionsMap:
 
 class EdgeProvider(ProviderBase):
     name = "edge"
+    variants = EDGE_VARIANTS
     endpoint = "https://edgeupdates.microsoft.com/api/products"
 
     def source_urls(self) -> dict[str, str]:
@@ -59,11 +61,11 @@ class EdgeProvider(ProviderBase):
 
     def fetch_versions(self, fetcher: JsonFetcher) -> tuple[ScalarVersionsMap, ProviderSourceInfo]:
         source, payload = fetcher(self.source_urls()["default"])
-        return extract_edge_versions(payload), source
+        return memoized_extract(fetcher, "edge", payload, extract_edge_versions), source
 
     def render_user_agents(self, versions_by_os: BrowserVersionsMap) -> list[RenderedUserAgentDTO]:
         return render_variants(
             browser=self.name,
-            variants=EDGE_VARIANTS,
+            variants=self.variants,
             versions_by_os=versions_by_os,
         )
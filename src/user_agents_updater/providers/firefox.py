@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from ..http_cache import memoized_extract
 from ..models import BrowserVersionsMap, JsonFetcher, RenderedUserAgentDTO, ScalarVersionsMap, UARenderVariantDTO
 from ..providers_registry import ProviderBase, ProviderSourceInfo, as_scalar_versions
 from ..rendering import render_variants
@@ -69,6 +70,7 @@ def extract_firefox_mobile_versions(data: object) -> tuple[str, str]:
 
 class FirefoxProvider(ProviderBase):
     name = "firefox"
+    variants = FIREFOX_VARIANTS
     desktop_endpoint = "https://product-details.mozilla.org/1.0/firefox_versions.json"
     mobile_endpoint = "https://product-details.mozilla.org/1.0/mobile_versions.json"
 
@@ -82,8 +84,12 @@ class FirefoxProvider(ProviderBase):
         source_urls = self.source_urls()
         desktop_source, desktop_payload = fetcher(source_urls["desktop"])
         mobile_source, mobile_payload = fetcher(source_urls["mobile"])
-        release_version = extract_firefox_release_version(desktop_payload)
-        android_version, ios_version = extract_firefox_mobile_versions(mobile_payload)
+        release_version = memoized_extract(
+            fetcher, "firefox-desktop", desktop_payload, extract_firefox_release_version
+        )
+        android_version, ios_version = memoized_extract(
+            fetcher, "firefox-mobile", mobile_payload, extract_firefox_mobile_versions
+        )
 
         versions: ScalarVersionsMap = {
             "windows": release_version,
@@ -102,6 +108,6 @@ class FirefoxProvider(ProviderBase):
     def render_user_agents(self, versions_by_os: BrowserVersionsMap) -> list[RenderedUserAgentDTO]:
         return render_variants(
             browser=self.name,
-            variants=FIREFOX_VARIANTS,
+            variants=self.variants,
             versions_by_os=as_scalar_versions(versions_by_os, self.name),
         )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 
+from ..http_cache import memoized_extract
 from ..models import BrowserVersionsMap, JsonFetcher, RenderedUserAgentDTO, ScalarVersionsMap, UARenderVariantDTO
 from ..parsers import parse_semver_like
 from ..providers_registry import (
@@ -60,6 +61,7 @@ def extract_safari_stable_version(data: dict) -> str:
 
 class SafariProvider(ProviderBase):
     name = "safari"
+    variants = SAFARI_VARIANTS
     endpoint = "https://developer.apple.com/tutorials/data/index/safari-release-notes"
 
     def source_urls(self) -> dict[str, str]:
@@ -67,13 +69,13 @@ class SafariProvider(ProviderBase):
 
     def fetch_versions(self, fetcher: JsonFetcher) -> tuple[ScalarVersionsMap, ProviderSourceInfo]:
         source, payload = fetcher(self.source_urls()["default"])
-        version = extract_safari_stable_version(payload)
+        version = memoized_extract(fetcher, "safari", payload, extract_safari_stable_version)
         versions: ScalarVersionsMap = {"macos": version, "ios": version}
         return versions, source
 
     def render_user_agents(self, versions_by_os: BrowserVersionsMap) -> list[RenderedUserAgentDTO]:
         return render_variants(
             browser=self.name,
-            variants=SAFARI_VARIANTS,
+            variants=self.variants,
             versions_by_os=as_scalar_versions(versions_by_os, self.name),
         )
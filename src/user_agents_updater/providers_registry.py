@@ -3,7 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Protocol
 
-from .models import BrowserVersionsMap, JsonFetcher, MultiVersionsMap, RenderedUserAgentDTO, ScalarVersionsMap
+from .models import (
+    AsyncJsonFetcher,
+    BrowserVersionsMap,
+    JsonFetcher,
+    MultiVersionsMap,
+    RenderedUserAgentDTO,
+    ScalarVersionsMap,
+    UARenderVariantDTO,
+)
 
 ProviderSourceInfo = str | dict[str, str]
 SourceByProviderMap = dict[str, ProviderSourceInfo]
@@ -11,6 +19,7 @@ SourceByProviderMap = dict[str, ProviderSourceInfo]
 
 class BrowserProvider(Protocol):
     name: str
+    variants: list[UARenderVariantDTO]
 
     def source_urls(self) -> dict[str, str]:
         ...
@@ -26,6 +35,14 @@ class BrowserProvider(Protocol):
     def render_user_agents(self, versions_by_os: BrowserVersionsMap) -> list[RenderedUserAgentDTO]:
         ...
 
+    async def afetch_versions(self, fetcher: AsyncJsonFetcher) -> tuple[BrowserVersionsMap, ProviderSourceInfo]:
+        ...
+
+    async def abuild_user_agents(
+        self, fetcher: AsyncJsonFetcher
+    ) -> tuple[BrowserVersionsMap, list[RenderedUserAgentDTO], ProviderSourceInfo]:
+        ...
+
 
 class ProviderBase:
     def build_user_agents(
@@ -34,6 +51,33 @@ class ProviderBase:
         versions, source = self.fetch_versions(fetcher)
         return versions, self.render_user_agents(versions), source
 
+    async def afetch_versions(
+        self: BrowserProvider, fetcher: AsyncJsonFetcher
+    ) -> tuple[BrowserVersionsMap, ProviderSourceInfo]:
+        """
+        Async adapter for sync providers: fetch every `source_urls()` entry concurrently,
+        then run the sync `fetch_versions` against the prefetched payloads.
+        """
+        import asyncio
+
+        urls = list(dict.fromkeys(self.source_urls().values()))
+        results = await asyncio.gather(*(fetcher(url) for url in urls))
+        prefetched = dict(zip(urls, results))
+
+        def prefetched_fetcher(url: str) -> tuple[str, object]:
+            try:
+                return prefetched[url]
+            except KeyError:
+                raise RuntimeError(f"Provider '{self.name}' fetched undeclared URL '{url}'") from None
+
+        return self.fetch_versions(prefetched_fetcher)
+
+    async def abuild_user_agents(
+        self: BrowserProvider, fetcher: AsyncJsonFetcher
+    ) -> tuple[BrowserVersionsMap, list[RenderedUserAgentDTO], ProviderSourceInfo]:
+        versions, source = await self.afetch_versions(fetcher)
+        return versions, self.render_user_agents(versions), source
+
 
 def single_source_url(endpoint: str) -> dict[str, str]:
     return {"default": endpoint}
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import random
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import accumulate
+
+QUERY_FIELDS = ("browser", "os", "platform")
+
+# Positions of the set bits of every byte value, and popcounts as a `bytes.translate` table.
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+_POPCOUNT_TABLE = bytes(len(bits) for bits in _BYTE_BITS)
+
+FieldFilter = str | Iterable[str] | None
+
+
+def _mask_bytes(mask: int) -> bytes:
+    return mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+
+
+def _mask_from_positions(positions: Iterable[int], size: int) -> int:
+    # One bytearray per mask, converted once: OR-ing bits into an int copies it every time.
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _set_bits(mask: int) -> Iterator[int]:
+    for byte_index, byte in enumerate(_mask_bytes(mask)):
+        if byte:
+            offset = byte_index << 3
+            for bit in _BYTE_BITS[byte]:
+                yield offset + bit
+
+
+class _RankedMask:
+    """
+    A mask's bytes with running popcounts: the n-th set bit is one bisect plus a table lookup.
+    """
+
+    __slots__ = ("data", "ranks")
+
+    def __init__(self, mask: int) -> None:
+        self.data = _mask_bytes(mask)
+        # ranks[i] = set bits in data[: i + 1]
+        self.ranks = list(accumulate(self.data.translate(_POPCOUNT_TABLE)))
+
+    def nth(self, n: int) -> int:
+        byte_index = bisect_right(self.ranks, n)
+        before = self.ranks[byte_index - 1] if byte_index else 0
+        return (byte_index << 3) + _BYTE_BITS[self.data[byte_index]][n - before]
+
+
+class Selection:
+    """
+    Records matching a query, held as a bitset over the index's records.
+    Combine with `&` and `|`; iterate or draw from it without building a list.
+    """
+
+    def __init__(self, index: UserAgentIndex, mask: int) -> None:
+        self.index = index
+        self.mask = mask
+        self._ranked: _RankedMask | None = None
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __iter__(self) -> Iterator[Mapping[str, str]]:
+        records = self.index.records
+        return (records[position] for position in _set_bits(self.mask))
+
+    def __and__(self, other: Selection) -> Selection:
+        return Selection(self.index, self.mask & other.mask)
+
+    def __or__(self, other: Selection) -> Selection:
+        return Selection(self.index, self.mask | other.mask)
+
+    def user_agents(self) -> list[str]:
+        return [record["user_agent"] for record in self]
+
+    def choice(self, rng: random.Random | None = None) -> Mapping[str, str]:
+        if not self.mask:
+            raise RuntimeError("Cannot draw from an empty selection")
+        if self._ranked is None:
+            # Built on the first draw and reused: later draws cost O(log n).
+            self._ranked = _RankedMask(self.mask)
+        position = self._ranked.nth((rng or random).randrange(self._ranked.ranks[-1]))
+        return self.index.records[position]
+
+
+class UserAgentIndex:
+    """
+    Posting bitsets over metadata records (`user_agents` entries), built once.
+
+    `select()` takes, per field, one value or several (OR-ed); fields are AND-ed together:
+
+        index.select(browser="chrome", os=("windows", "macos"), min_major=120)
+    """
+
+    def __init__(self, records: Sequence[Mapping[str, str]]) -> None:
+        self.records = tuple(records)
+        size = len(self.records)
+        positions: dict[str, dict[str, list[int]]] = {field: {} for field in QUERY_FIELDS}
+        major_positions: dict[int, list[int]] = {}
+        for position, record in enumerate(self.records):
+            for field in QUERY_FIELDS:
+                positions[field].setdefault(record[field], []).append(position)
+            major = record["browser_major_version"]
+            if major.isdigit():
+                major_positions.setdefault(int(major), []).append(position)
+
+        self.postings: dict[str, dict[str, int]] = {
+            field: {value: _mask_from_positions(rows, size) for value, rows in by_value.items()}
+            for field, by_value in positions.items()
+        }
+        by_major = {major: _mask_from_positions(rows, size) for major, rows in major_positions.items()}
+
+        self.all_mask = (1 << len(self.records)) - 1
+        self.majors = sorted(by_major)
+        self._major_masks = [by_major[major] for major in self.majors]
+        # _at_least[i] is the union of majors[i:], so a lower bound is one bisect away.
+        self._at_least = [0] * (len(self.majors) + 1)
+        for position in range(len(self.majors) - 1, -1, -1):
+            self._at_least[position] = self._at_least[position + 1] | self._major_masks[position]
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping[str, object]) -> UserAgentIndex:
+        records = metadata.get("user_agents")
+        if not isinstance(records, list):
+            raise RuntimeError("Missing user_agents list in metadata")
+        return cls(records)
+
+    def _field_mask(self, field: str, values: FieldFilter) -> int:
+        if values is None:
+            return self.all_mask
+        postings = self.postings[field]
+        if isinstance(values, str):
+            return postings.get(values, 0)
+        mask = 0
+        for value in values:
+            mask |= postings.get(value, 0)
+        return mask
+
+    def _major_mask(self, major: int | Iterable[int] | None, min_major: int | None, max_major: int | None) -> int:
+        mask = self.all_mask
+        if major is not None:
+            wanted = (major,) if isinstance(major, int) else major
+            mask = 0
+            for value in wanted:
+                position = bisect_left(self.majors, value)
+                if position < len(self.majors) and self.majors[position] == value:
+                    mask |= self._major_masks[position]
+        if min_major is not None:
+            mask &= self._at_least[bisect_left(self.majors, min_major)]
+        if max_major is not None:
+            mask &= self.all_mask ^ self._at_least[bisect_right(self.majors, max_major)]
+        return mask
+
+    def select(
+        self,
+        browser: FieldFilter = None,
+        os: FieldFilter = None,
+        platform: FieldFilter = None,
+        major: int | Iterable[int] | None = None,
+        min_major: int | None = None,
+        max_major: int | None = None,
+    ) -> Selection:
+        mask = (
+            self._field_mask("browser", browser)
+            & self._field_mask("os", os)
+            & self._field_mask("platform", platform)
+        )
+        if mask and (major is not None or min_major is not None or max_major is not None):
+            mask &= self._major_mask(major, min_major, max_major)
+        return Selection(self, mask)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
 
+from .client_hints import build_header_bundle, header_bundle_parts
 from .models import BrowserName, RenderedUserAgentDTO, UARenderVariantDTO, VersionValue
 from .parsers import major_version
 
@@ -38,14 +42,105 @@ def _render_variant(
     version: str,
 ) -> RenderedUserAgentDTO:
     major = major_version(version)
+    user_agent = variant.template.format(
+        token=variant.token,
+        version=version,
+        major_version=major,
+    )
     return RenderedUserAgentDTO(
         browser=browser,
         platform=variant.platform,
         os=variant.os,
         browser_major_version=major,
-        user_agent=variant.template.format(
-            token=variant.token,
-            version=version,
-            major_version=major,
-        ),
+        user_agent=user_agent,
+        headers=build_header_bundle(browser, variant.os, variant.platform, major, user_agent),
     )
+
+
+TEMPLATE_FIELDS = frozenset({"token", "version", "major_version"})
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A variant template pre-split into literal segments and version-dependent field slots.
+    The variant's token is constant, so it is folded into the literals at compile time.
+    """
+
+    segments: tuple[str, ...]
+    slots: tuple[tuple[int, str], ...]
+
+    def render(self, fragments: Mapping[str, str]) -> str:
+        if not self.slots:
+            return self.segments[0]
+        parts = list(self.segments)
+        for position, field in self.slots:
+            parts[position] = fragments[field]
+        return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def compile_variant(variant: UARenderVariantDTO) -> CompiledTemplate:
+    segments: list[str] = []
+    slots: list[tuple[int, str]] = []
+    literal = ""
+    for text, field, format_spec, conversion in Formatter().parse(variant.template):
+        literal += text
+        if field is None:
+            continue
+        if field not in TEMPLATE_FIELDS:
+            raise RuntimeError(f"Unknown field '{field}' in user-agent template '{variant.template}'")
+        if format_spec or conversion:
+            raise RuntimeError(f"Unsupported format spec in user-agent template '{variant.template}'")
+        if field == "token":
+            literal += variant.token
+            continue
+        segments.append(literal)
+        literal = ""
+        slots.append((len(segments), field))
+        segments.append("")
+    segments.append(literal)
+    return CompiledTemplate(segments=tuple(segments), slots=tuple(slots))
+
+
+def render_many(
+    browser: BrowserName,
+    variants: list[UARenderVariantDTO],
+    versions_by_os: Mapping[str, VersionValue],
+) -> list[RenderedUserAgentDTO]:
+    """
+    Same output as `render_variants`, for large version x variant grids: templates are
+    compiled once (and cached), and each version's fragments are computed once per call.
+    """
+    fragments_by_version: dict[str, dict[str, str]] = {}
+    rendered: list[RenderedUserAgentDTO] = []
+    append = rendered.append
+
+    for variant in variants:
+        compiled = compile_variant(variant)
+        render = compiled.render
+        single_slot = compiled.slots[0][1] if len(compiled.slots) == 1 else None
+        prefix, suffix = compiled.segments[0], compiled.segments[-1]
+        versions = versions_by_os[variant.os]
+        for version in (versions,) if isinstance(versions, str) else versions:
+            fragments = fragments_by_version.get(version)
+            if fragments is None:
+                fragments = fragments_by_version[version] = {
+                    "version": version,
+                    "major_version": major_version(version),
+                }
+            major = fragments["major_version"]
+            before, after = header_bundle_parts(browser, variant.os, variant.platform, major)
+            user_agent = prefix + fragments[single_slot] + suffix if single_slot else render(fragments)
+            append(
+                RenderedUserAgentDTO(
+                    browser=browser,
+                    platform=variant.platform,
+                    os=variant.os,
+                    browser_major_version=major,
+                    user_agent=user_agent,
+                    headers=before + (("User-Agent", user_agent),) + after,
+                )
+            )
+
+    return rendered
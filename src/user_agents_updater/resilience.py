@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from http.client import HTTPException
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+
+from .http import HttpStatusError
+from .models import JsonFetcher
+
+TRANSIENT_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+LATENCY_WINDOW = 100
+
+
+@dataclass(frozen=True)
+class FetchPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    max_concurrency_per_host: int = 4
+    hedge: bool = True
+    hedge_min_samples: int = 5
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise RuntimeError("max_attempts must be >= 1")
+        if self.max_concurrency_per_host < 1:
+            raise RuntimeError("max_concurrency_per_host must be >= 1")
+
+    def backoff(self, attempt: int) -> float:
+        # "Full jitter": uniform over [0, capped exponential].
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def is_transient(err: BaseException) -> bool:
+    current: BaseException | None = err
+    while current is not None:
+        if isinstance(current, HttpStatusError):
+            return current.status in TRANSIENT_STATUSES
+        if isinstance(current, HTTPError):
+            return current.code in TRANSIENT_STATUSES
+        if isinstance(current, (URLError, TimeoutError, ConnectionError, HTTPException)):
+            return True
+        current = current.__cause__
+    return False
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class HostStats:
+    def __init__(self) -> None:
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.attempts = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def p95(self, min_samples: int) -> float | None:
+        if len(self.latencies) < min_samples:
+            return None
+        return _percentile(sorted(self.latencies), 0.95)
+
+    def snapshot(self) -> dict[str, float | int]:
+        ordered = sorted(self.latencies)
+        return {
+            "attempts": self.attempts,
+            "failures": self.failures,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "samples": len(ordered),
+            "p50": _percentile(ordered, 0.50) if ordered else 0.0,
+            "p95": _percentile(ordered, 0.95) if ordered else 0.0,
+            "max": ordered[-1] if ordered else 0.0,
+        }
+
+
+class ResilientFetcher:
+    """
+    `JsonFetcher` wrapper adding retries, hedged requests and per-host concurrency caps.
+
+    - transient failures (network errors, 408/429/5xx) are retried with jittered exponential backoff;
+    - once a host has enough latency samples, an attempt still running after the host's p95
+      gets a duplicate request, and whichever finishes first wins;
+    - at most `max_concurrency_per_host` requests (hedges included) are in flight per host;
+    - after `set_deadline()`, no retry is started that could not finish its backoff before it,
+      and the deadline is passed on to the wrapped fetcher when it supports one.
+    """
+
+    def __init__(self, fetcher: JsonFetcher, policy: FetchPolicy | None = None) -> None:
+        self.fetcher = fetcher
+        self.policy = policy or FetchPolicy()
+        self._lock = threading.Lock()
+        self._stats: dict[str, HostStats] = {}
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self.deadline: float | None = None
+        memoize = getattr(fetcher, "memoize", None)
+        if memoize is not None:
+            self.memoize = memoize
+
+    def __enter__(self) -> ResilientFetcher:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def set_deadline(self, deadline: float | None) -> None:
+        self.deadline = deadline
+        set_inner_deadline = getattr(self.fetcher, "set_deadline", None)
+        if set_inner_deadline is not None:
+            set_inner_deadline(deadline)
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        with self._lock:
+            return {host: stats.snapshot() for host, stats in self._stats.items()}
+
+    def _host_state(self, host: str) -> tuple[HostStats, threading.BoundedSemaphore]:
+        with self._lock:
+            if host not in self._stats:
+                self._stats[host] = HostStats()
+                self._slots[host] = threading.BoundedSemaphore(self.policy.max_concurrency_per_host)
+            return self._stats[host], self._slots[host]
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="hedge")
+            return self._executor
+
+    def __call__(self, url: str) -> tuple[str, object]:
+        host = urlsplit(url).netloc
+        stats, slot = self._host_state(host)
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(url, stats, slot)
+            except RuntimeError as err:
+                attempt += 1
+                if attempt >= self.policy.max_attempts or not is_transient(err):
+                    raise
+                delay = self.policy.backoff(attempt - 1)
+                if self.deadline is not None and time.monotonic() + delay >= self.deadline:
+                    raise
+                with self._lock:
+                    stats.retries += 1
+                time.sleep(delay)
+
+    def _timed(self, url: str, stats: HostStats, slot: threading.BoundedSemaphore) -> tuple[str, object]:
+        try:
+            started = time.perf_counter()
+            try:
+                result = self.fetcher(url)
+            except BaseException:
+                with self._lock:
+                    stats.attempts += 1
+                    stats.failures += 1
+                raise
+            with self._lock:
+                stats.attempts += 1
+                stats.latencies.append(time.perf_counter() - started)
+            return result
+        finally:
+            slot.release()
+
+    def _attempt(self, url: str, stats: HostStats, slot: threading.BoundedSemaphore) -> tuple[str, object]:
+        with self._lock:
+            hedge_after = stats.p95(self.policy.hedge_min_samples) if self.policy.hedge else None
+
+        slot.acquire()
+        if hedge_after is None:
+            return self._timed(url, stats, slot)
+
+        pool = self._pool()
+        primary = pool.submit(self._timed, url, stats, slot)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done or not slot.acquire(blocking=False):
+            return primary.result()
+
+        with self._lock:
+            stats.hedges += 1
+        hedge = pool.submit(self._timed, url, stats, slot)
+        return self._first_success(primary, hedge, stats)
+
+    def _first_success(self, primary: Future, hedge: Future, stats: HostStats) -> tuple[str, object]:
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            stats.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        assert error is not None
+        raise error
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import sys
+import threading
+import weakref
+from collections.abc import Sequence
+from typing import TypeVar
+
+SEED_ENV_VAR = "USER_AGENTS_SEED"
+
+T = TypeVar("T")
+
+_instances: weakref.WeakSet[RandomStreams] = weakref.WeakSet()
+
+
+def _running_task() -> object | None:
+    # No loop can be running before asyncio is imported, so never import it here.
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return None
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return asyncio.current_task()
+
+
+def _process_name() -> str:
+    import multiprocessing
+
+    return multiprocessing.current_process().name
+
+
+class RandomStreams:
+    """
+    Independent `random.Random` streams derived from one root seed.
+
+    `current()` returns the stream of the running asyncio task, or of the current thread
+    outside a task. Streams are keyed by process, thread and task *names*, so a run with the
+    same seed and the same names (e.g. "ThreadPoolExecutor-0_1", "Task-3", "ForkPoolWorker-2")
+    draws the same values. Threads sharing a name (every pool has a "fetch_0") are told apart
+    by the order in which they first draw, so their streams stay independent. Only that first
+    draw takes a lock; afterwards each thread only touches its own streams.
+
+    After `fork`, every stream is re-derived in the child; forks that keep their parent's
+    process name (a bare `os.fork()`) are told apart by pid and are not reproducible.
+    """
+
+    def __init__(self, seed: int | str | None = None) -> None:
+        self.seed = str(seed) if seed is not None else os.urandom(16).hex()
+        self._generation = 0
+        self._parent_process_name: str | None = None
+        self._local = threading.local()
+        self._names_lock = threading.Lock()
+        self._name_counts: dict[str, int] = {}
+        _instances.add(self)
+
+    def _after_fork_in_child(self) -> None:
+        self._parent_process_name = _process_name()
+        self._generation += 1
+        self._names_lock = threading.Lock()
+        self._name_counts = {}
+
+    def _process_key(self) -> str:
+        name = _process_name()
+        if name == self._parent_process_name:
+            return f"{name}/pid-{os.getpid()}"
+        return name
+
+    def derive(self, *names: str) -> random.Random:
+        """
+        Fresh stream for `names` within the current process.
+        """
+        material = "\0".join((self.seed, self._process_key(), *names)).encode("utf-8")
+        return random.Random(int.from_bytes(hashlib.blake2b(material, digest_size=16).digest(), "big"))
+
+    def _thread_state(self) -> threading.local:
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            local.generation = self._generation
+            name = threading.current_thread().name
+            with self._names_lock:
+                occurrence = self._name_counts.get(name, 0)
+                self._name_counts[name] = occurrence + 1
+            local.thread_stream = self.derive("thread", name, str(occurrence))
+            local.task_streams = weakref.WeakKeyDictionary()
+        return local
+
+    def current(self) -> random.Random:
+        local = self._thread_state()
+        task = _running_task()
+        if task is None:
+            return local.thread_stream
+        stream = local.task_streams.get(task)
+        if stream is None:
+            stream = local.task_streams[task] = self.derive("task", task.get_name())
+        return stream
+
+    def choice(self, population: Sequence[T]) -> T:
+        return self.current().choice(population)
+
+
+def _reseed_after_fork() -> None:
+    for streams in list(_instances):
+        streams._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+
+_default_streams: RandomStreams | None = None
+_default_streams_lock = threading.Lock()
+
+
+def default_streams() -> RandomStreams:
+    """
+    Process-wide streams, seeded from `USER_AGENTS_SEED` when set (random otherwise).
+    """
+    global _default_streams
+    if _default_streams is None:
+        with _default_streams_lock:
+            if _default_streams is None:
+                _default_streams = RandomStreams(os.environ.get(SEED_ENV_VAR))
+    return _default_streams
+
+
+def seed_streams(seed: int | str | None) -> RandomStreams:
+    """
+    Replace the process-wide streams, e.g. to make a run reproducible.
+    """
+    global _default_streams
+    _default_streams = RandomStreams(seed)
+    return _default_streams
+
+
+def current_random() -> random.Random:
+    return default_streams().current()
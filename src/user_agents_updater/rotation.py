@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable
+from urllib.parse import urlsplit
+
+DEFAULT_RING_REPLICAS = 160
+DEFAULT_MAX_OVERRIDES = 4096
+OVERRIDE_SHARDS = 16
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """
+    Immutable hash ring: each user-agent owns `replicas` points, a key maps to the owner of
+    the first point at or after its hash. Adding or removing one of N user-agents remaps
+    about 1/N of the keys.
+    """
+
+    def __init__(self, user_agents: Iterable[str], replicas: int = DEFAULT_RING_REPLICAS) -> None:
+        if replicas < 1:
+            raise RuntimeError("replicas must be >= 1")
+        self.user_agents = tuple(dict.fromkeys(user_agents))
+        points = sorted(
+            (_hash64(f"{user_agent}#{replica}"), user_agent)
+            for user_agent in self.user_agents
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [owner for _, owner in points]
+
+    def __len__(self) -> int:
+        return len(self.user_agents)
+
+    def lookup(self, key: str) -> str | None:
+        if not self._hashes:
+            return None
+        position = bisect_right(self._hashes, _hash64(key))
+        return self._owners[position % len(self._owners)]
+
+
+class _OverrideShard:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, str] = OrderedDict()
+
+
+def normalize_host(url_or_host: str) -> str:
+    """
+    Lower-cased host name of a URL; anything without a scheme is taken as a host already.
+    """
+    if "://" in url_or_host:
+        return (urlsplit(url_or_host).hostname or "").lower()
+    return url_or_host.lower()
+
+
+class StickyUserAgentRotator:
+    """
+    Assigns each key (host, domain or session id) a stable user-agent from the pool.
+
+    Lookups read an immutable ring and one of `OVERRIDE_SHARDS` independently locked LRU
+    shards of pinned overrides, so concurrent lookups never contend on a single lock.
+    `refresh()` swaps in a ring for a new pool with a single assignment.
+    """
+
+    def __init__(
+        self,
+        user_agents: Iterable[str],
+        replicas: int = DEFAULT_RING_REPLICAS,
+        max_overrides: int = DEFAULT_MAX_OVERRIDES,
+    ) -> None:
+        if max_overrides < 0:
+            raise RuntimeError("max_overrides must be >= 0")
+        self.replicas = replicas
+        self.ring = ConsistentHashRing(user_agents, replicas)
+        capacity = -(-max_overrides // OVERRIDE_SHARDS)
+        self._shards = [_OverrideShard(capacity) for _ in range(OVERRIDE_SHARDS)]
+
+    def _shard(self, key: str) -> _OverrideShard:
+        return self._shards[hash(key) % OVERRIDE_SHARDS]
+
+    def refresh(self, user_agents: Iterable[str]) -> None:
+        self.ring = ConsistentHashRing(user_agents, self.replicas)
+
+    def pin(self, key: str, user_agent: str) -> None:
+        """
+        Force `user_agent` for `key`; the least recently used pins are evicted past capacity.
+        """
+        shard = self._shard(key)
+        if shard.capacity == 0:
+            return
+        with shard.lock:
+            shard.entries[key] = user_agent
+            shard.entries.move_to_end(key)
+            while len(shard.entries) > shard.capacity:
+                shard.entries.popitem(last=False)
+
+    def unpin(self, key: str) -> None:
+        shard = self._shard(key)
+        with shard.lock:
+            shard.entries.pop(key, None)
+
+    def user_agent_for(self, key: str) -> str | None:
+        shard = self._shard(key)
+        if shard.entries:
+            with shard.lock:
+                pinned = shard.entries.get(key)
+                if pinned is not None:
+                    shard.entries.move_to_end(key)
+                    return pinned
+        return self.ring.lookup(key)
+
+    def user_agent_for_url(self, url: str) -> str | None:
+        return self.user_agent_for(normalize_host(url))
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+
+try:
+    import numpy as np
+except ImportError:  # Optional: bulk sampling falls back to pure Python.
+    np = None
+
+
+@dataclass(frozen=True)
+class SamplingWeights:
+    """
+    Relative weight of a record = browser weight * os weight * major-rank weight.
+
+    Browsers and OSes missing from the mappings weigh 1. `major_rank` weighs majors by age
+    within their browser/os: index 0 is the newest major, index 1 the one before, and so on;
+    older majors reuse the last entry. An empty `major_rank` weighs every major equally.
+    """
+
+    browser: Mapping[str, float] = field(default_factory=dict)
+    os: Mapping[str, float] = field(default_factory=dict)
+    major_rank: Sequence[float] = ()
+
+    def rank_weight(self, rank: int) -> float:
+        if not self.major_rank:
+            return 1.0
+        return self.major_rank[min(rank, len(self.major_rank) - 1)]
+
+
+def _major_ranks(records: Sequence[Mapping[str, str]]) -> list[int]:
+    majors_by_group: dict[tuple[str, str], set[int]] = {}
+    parsed: list[tuple[tuple[str, str], int]] = []
+    for record in records:
+        group = (record["browser"], record["os"])
+        major = int(record["browser_major_version"]) if record["browser_major_version"].isdigit() else 0
+        majors_by_group.setdefault(group, set()).add(major)
+        parsed.append((group, major))
+
+    rank_by_group = {
+        group: {major: rank for rank, major in enumerate(sorted(majors, reverse=True))}
+        for group, majors in majors_by_group.items()
+    }
+    return [rank_by_group[group][major] for group, major in parsed]
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table: O(n) construction, O(1) draws from a discrete distribution.
+    """
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        if any(weight < 0 for weight in weights):
+            raise RuntimeError("Sampling weights must be >= 0")
+        total = float(sum(weights))
+        if not weights or total <= 0:
+            raise RuntimeError("At least one sampling weight must be > 0")
+
+        size = len(weights)
+        scaled = [weight * size / total for weight in weights]
+        self.probability = [1.0] * size
+        self.alias = list(range(size))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers are 1.0 up to rounding error and keep their default probability.
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def draw(self, rng: random.Random) -> int:
+        # One uniform draw: the integer part picks the column, the fraction decides alias or not.
+        position = rng.random() * len(self.probability)
+        index = int(position)
+        return index if position - index < self.probability[index] else self.alias[index]
+
+
+class WeightedSampler:
+    """
+    Weighted random user-agents from metadata records (`user_agents` entries).
+
+    `sample_one()` costs O(1). `sample(n)` draws in bulk, vectorized with NumPy when it is installed.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[Mapping[str, str]],
+        weights: SamplingWeights | None = None,
+        seed: int | None = None,
+    ) -> None:
+        weights = weights or SamplingWeights()
+        record_weights = [
+            weights.browser.get(record["browser"], 1.0) * weights.os.get(record["os"], 1.0) * weights.rank_weight(rank)
+            for record, rank in zip(records, _major_ranks(records))
+        ]
+        kept = [index for index, weight in enumerate(record_weights) if weight > 0]
+        self.records = tuple(records[index] for index in kept)
+        self.user_agents = tuple(record["user_agent"] for record in self.records)
+        self.table = AliasTable([record_weights[index] for index in kept])
+        self._rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed) if np is not None else None
+        self._np_arrays: tuple[object, object, object] | None = None
+
+    @classmethod
+    def from_metadata(
+        cls, metadata: Mapping[str, object], weights: SamplingWeights | None = None, seed: int | None = None
+    ) -> WeightedSampler:
+        records = metadata.get("user_agents")
+        if not isinstance(records, list):
+            raise RuntimeError("Missing user_agents list in metadata")
+        return cls(records, weights, seed)
+
+    def sample_one(self) -> str:
+        return self.user_agents[self.table.draw(self._rng)]
+
+    def sample_indices(self, n: int):
+        """
+        `n` record indices: a NumPy int array when NumPy is installed, otherwise a list.
+        """
+        if n < 0:
+            raise RuntimeError("n must be >= 0")
+        if self._np_rng is None:
+            draw, rng = self.table.draw, self._rng
+            return [draw(rng) for _ in range(n)]
+
+        if self._np_arrays is None:
+            self._np_arrays = (
+                np.asarray(self.table.probability, dtype=np.float64),
+                np.asarray(self.table.alias, dtype=np.intp),
+                np.asarray(self.user_agents, dtype=object),
+            )
+        probability, alias, _ = self._np_arrays
+        columns = self._np_rng.integers(0, len(self.table), size=n)
+        keep = self._np_rng.random(n) < probability[columns]
+        return np.where(keep, columns, alias[columns])
+
+    def sample(self, n: int) -> list[str]:
+        indices = self.sample_indices(n)
+        if self._np_arrays is not None:
+            return self._np_arrays[2][indices].tolist()
+        user_agents = self.user_agents
+        return [user_agents[index] for index in indices]
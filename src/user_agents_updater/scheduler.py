@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .models import JsonFetcher
+
+DEFAULT_MAX_WORKERS = 8
+LATENCY_EWMA_ALPHA = 0.3
+
+
+class FetchScheduler:
+    """
+    Single bounded pool for every fetch of a generation run.
+
+    `prefetch()` starts all known URLs up front, slowest first according to `latency_history`
+    (URLs without history are treated as slowest). Identical URLs share one in-flight request
+    (singleflight), and a result is reused for the lifetime of the scheduler.
+
+    Instances are `JsonFetcher`s and expose `fetch_many()`, so providers just wait on results.
+    """
+
+    def __init__(
+        self,
+        fetcher: JsonFetcher,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        latency_history: Mapping[str, float] | None = None,
+    ) -> None:
+        if max_workers < 1:
+            raise RuntimeError("max_workers must be >= 1")
+        self.fetcher = fetcher
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._closed = False
+        self._lock = threading.Lock()
+        self._futures: dict[str, Future[tuple[str, object]]] = {}
+        self._latencies: dict[str, float] = dict(latency_history or {})
+        memoize = getattr(fetcher, "memoize", None)
+        if memoize is not None:
+            self.memoize = memoize
+
+    def __enter__(self) -> FetchScheduler:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting work and drop queued fetches. `wait=False` abandons requests still in flight.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def set_deadline(self, deadline: float | None) -> None:
+        set_inner_deadline = getattr(self.fetcher, "set_deadline", None)
+        if set_inner_deadline is not None:
+            set_inner_deadline(deadline)
+
+    def latency_history(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._latencies)
+
+    def _timed_fetch(self, url: str) -> tuple[str, object]:
+        started = time.perf_counter()
+        result = self.fetcher(url)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            previous = self._latencies.get(url)
+            self._latencies[url] = (
+                elapsed if previous is None else LATENCY_EWMA_ALPHA * elapsed + (1 - LATENCY_EWMA_ALPHA) * previous
+            )
+        return result
+
+    def _submit(self, url: str) -> Future[tuple[str, object]]:
+        with self._lock:
+            future = self._futures.get(url)
+            if future is None:
+                future = self._futures[url] = self._executor.submit(self._timed_fetch, url)
+            return future
+
+    def prefetch(self, urls: Iterable[str]) -> None:
+        with self._lock:
+            pending = [url for url in dict.fromkeys(urls) if url not in self._futures]
+            pending.sort(key=lambda url: self._latencies.get(url, float("inf")), reverse=True)
+        for url in pending:
+            self._submit(url)
+
+    def __call__(self, url: str) -> tuple[str, object]:
+        return self._submit(url).result()
+
+    def fetch_many(self, urls: list[str]) -> list[tuple[str, object]]:
+        futures = [self._submit(url) for url in urls]
+        return [future.result() for future in futures]
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from collections.abc import Mapping
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8089
+MAX_REQUEST_HEAD_BYTES = 8192
+MAX_CACHED_TARGETS = 4096
+FILTER_FIELDS = ("browser", "os", "platform", "major")
+_RECORD_FIELDS = ("browser", "os", "platform", "browser_major_version")
+
+FilterKey = tuple[str | None, ...]
+
+
+def build_response(status: int, body: bytes, content_type: str = "application/json") -> bytes:
+    reason = HTTPStatus(status).phrase
+    head = (
+        f"HTTP/1.1 {status} {reason}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Cache-Control: no-store\r\n"
+        "\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+def _error_response(status: int, message: str) -> bytes:
+    return build_response(status, json.dumps({"error": message}).encode("utf-8"))
+
+
+NOT_FOUND = _error_response(404, "not found")
+NO_MATCH = _error_response(404, "no user-agent matches the filters")
+METHOD_NOT_ALLOWED = _error_response(405, "only GET and HEAD are supported")
+BAD_REQUEST = _error_response(400, "malformed request")
+HEAD_TOO_LARGE = _error_response(431, "request head too large")
+
+
+def _filter_keys(values: tuple[str, ...]) -> list[FilterKey]:
+    # Every subset of the record's field values, i.e. every filter the record satisfies.
+    return [
+        tuple(value if mask >> index & 1 else None for index, value in enumerate(values))
+        for mask in range(1 << len(values))
+    ]
+
+
+class ResponseTable:
+    """
+    Every response the server can send, serialized once per dataset.
+
+    `/ua` (text) and `/ua.json` (record) answer with a random record among those matching the
+    optional `browser`, `os`, `platform` and `major` query filters; `/metadata` returns the full
+    metadata document. Each filter combination maps to a tuple of ready-to-send buffers.
+    """
+
+    def __init__(self, metadata: Mapping[str, object]) -> None:
+        records = metadata.get("user_agents")
+        if not isinstance(records, list):
+            raise RuntimeError("Missing user_agents list in metadata")
+
+        text_by_filter: dict[FilterKey, list[bytes]] = {}
+        json_by_filter: dict[FilterKey, list[bytes]] = {}
+        for record in records:
+            if not isinstance(record, dict) or not isinstance(record.get("user_agent"), str):
+                raise RuntimeError("Invalid user-agent record in metadata")
+            text = build_response(200, record["user_agent"].encode("utf-8"), "text/plain; charset=utf-8")
+            document = build_response(200, json.dumps(record, separators=(",", ":")).encode("utf-8"))
+            for key in _filter_keys(tuple(str(record.get(field, "")) for field in _RECORD_FIELDS)):
+                text_by_filter.setdefault(key, []).append(text)
+                json_by_filter.setdefault(key, []).append(document)
+
+        self.text_by_filter = {key: tuple(values) for key, values in text_by_filter.items()}
+        self.json_by_filter = {key: tuple(values) for key, values in json_by_filter.items()}
+        self.metadata_response = build_response(200, json.dumps(metadata, separators=(",", ":")).encode("utf-8"))
+        self.size = len(records)
+
+    def respond(self, route: str, key: FilterKey) -> bytes:
+        if route == "/metadata":
+            return self.metadata_response
+        responses = (self.text_by_filter if route == "/ua" else self.json_by_filter).get(key)
+        return random.choice(responses) if responses else NO_MATCH
+
+
+def parse_target(target: str) -> tuple[str, FilterKey] | None:
+    """
+    Route and filter key of a request target, or None when the route or a parameter is unknown.
+    """
+    parts = urlsplit(target)
+    if parts.path not in ("/ua", "/ua.json", "/metadata"):
+        return None
+    filters = dict.fromkeys(FILTER_FIELDS)
+    for name, value in parse_qsl(parts.query):
+        if name not in filters:
+            return None
+        filters[name] = value.lower()
+    return parts.path, tuple(filters.values())
+
+
+class UserAgentServer:
+    """
+    Minimal HTTP/1.1 server (keep-alive, pipelining) answering from a `ResponseTable`.
+
+    `update()` swaps the table in one assignment; requests always see a complete dataset.
+    """
+
+    def __init__(self, metadata: Mapping[str, object]) -> None:
+        self.table = ResponseTable(metadata)
+        self._targets: dict[bytes, tuple[str, FilterKey] | None] = {}
+
+    def update(self, metadata: Mapping[str, object]) -> None:
+        self.table = ResponseTable(metadata)
+
+    def route(self, target: bytes) -> tuple[str, FilterKey] | None:
+        try:
+            return self._targets[target]
+        except KeyError:
+            pass
+        try:
+            parsed = parse_target(target.decode("ascii"))
+        except UnicodeDecodeError:
+            parsed = None
+        if len(self._targets) >= MAX_CACHED_TARGETS:
+            self._targets.clear()
+        self._targets[target] = parsed
+        return parsed
+
+    def handle(self, request_line: bytes) -> bytes:
+        parts = request_line.split(b" ")
+        if len(parts) != 3 or not parts[2].startswith(b"HTTP/1."):
+            return BAD_REQUEST
+        method, target, _ = parts
+        if method not in (b"GET", b"HEAD"):
+            return METHOD_NOT_ALLOWED
+        routed = self.route(target)
+        response = NOT_FOUND if routed is None else self.table.respond(*routed)
+        if method == b"HEAD":
+            return response[: response.index(b"\r\n\r\n") + 4]
+        return response
+
+    def protocol(self) -> asyncio.Protocol:
+        return _HttpProtocol(self)
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        loop = asyncio.get_running_loop()
+        return await loop.create_server(self.protocol, host, port, reuse_address=True)
+
+
+class _HttpProtocol(asyncio.Protocol):
+    def __init__(self, server: UserAgentServer) -> None:
+        self.server = server
+        self.transport: asyncio.Transport | None = None
+        self.buffer = b""
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self.buffer + data if self.buffer else data
+        responses: list[bytes] = []
+        close = False
+        while True:
+            end = buffer.find(b"\r\n\r\n")
+            if end < 0:
+                break
+            head = buffer[:end]
+            buffer = buffer[end + 4 :]
+            line_end = head.find(b"\r\n")
+            request_line = head if line_end < 0 else head[:line_end]
+            response = self.server.handle(request_line)
+            responses.append(response)
+            lowered = head.lower()
+            # Requests carry no body here; anything announcing one cannot be framed safely.
+            if (
+                response is BAD_REQUEST
+                or b"\r\ncontent-length:" in lowered
+                or b"\r\ntransfer-encoding:" in lowered
+                or b"\r\nconnection: close" in lowered
+                or (request_line.endswith(b"HTTP/1.0") and b"\r\nconnection: keep-alive" not in lowered)
+            ):
+                close = True
+                break
+
+        if not close and len(buffer) > MAX_REQUEST_HEAD_BYTES:
+            responses.append(HEAD_TOO_LARGE)
+            close = True
+        self.buffer = b"" if close else buffer
+        assert self.transport is not None
+        if responses:
+            self.transport.write(b"".join(responses) if len(responses) > 1 else responses[0])
+        if close:
+            self.transport.close()
+
+
+def load_metadata(path: Path) -> dict[str, object]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as err:
+        raise RuntimeError(f"Unable to load metadata from '{path}': {err}") from err
+    if not isinstance(data, dict):
+        raise RuntimeError(f"Invalid metadata document in '{path}'")
+    return data
+
+
+async def serve_metadata_file(
+    path: Path,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    reload_interval: float = 5.0,
+) -> None:
+    """
+    Serve `path` (a `user-agents-metadata.json`) until cancelled, reloading it when its
+    mtime or size changes. A reload that fails keeps serving the previous dataset.
+    """
+    server = UserAgentServer(load_metadata(path))
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    listener = await server.start(host, port)
+    async with listener:
+        while True:
+            await asyncio.sleep(reload_interval)
+            try:
+                stat = path.stat()
+                if (stat.st_mtime_ns, stat.st_size) != signature:
+                    server.update(load_metadata(path))
+                    signature = (stat.st_mtime_ns, stat.st_size)
+            except (OSError, RuntimeError):
+                continue
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, wait
 
-from .models import BrowserVersionsMap, JsonFetcher, ResolvedVersionsDTO
-from .providers_registry import ProviderRegistry, SourceByProviderMap
+from .fallback import last_known_good
+from .models import (
+    AsyncJsonFetcher,
+    BrowserVersionsMap,
+    JsonFetcher,
+    RenderedUserAgentDTO,
+    ResolvedVersionsDTO,
+    UserAgentRecord,
+)
+from .providers_registry import BrowserProvider, ProviderSourceInfo, ProviderRegistry, SourceByProviderMap
+from .scheduler import FetchScheduler
+
+ProviderBuildResult = tuple[BrowserVersionsMap, list[RenderedUserAgentDTO], ProviderSourceInfo]
+ProviderFetchResult = tuple[BrowserVersionsMap, ProviderSourceInfo]
+GenerateResult = tuple[ResolvedVersionsDTO, SourceByProviderMap, list[UserAgentRecord]]
 
 
 class UserAgentService:
@@ -13,20 +28,135 @@ class UserAgentService:
     def generate(
         self,
         fetcher: JsonFetcher,
-    ) -> tuple[ResolvedVersionsDTO, SourceByProviderMap, list[dict[str, str]]]:
-        raw_versions: dict[str, BrowserVersionsMap] = {}
-        sources: SourceByProviderMap = {}
-        user_agents: list[dict[str, str]] = []
+    ) -> GenerateResult:
         providers = self.registry.all()
 
         with ThreadPoolExecutor(max_workers=len(providers)) as executor:
-            future_by_provider = {
-                executor.submit(provider.build_user_agents, fetcher): provider for provider in providers
-            }
-            for future, provider in future_by_provider.items():
-                versions, rendered_user_agents, source = future.result()
-                raw_versions[provider.name] = versions
-                user_agents.extend(rendered.to_dict() for rendered in rendered_user_agents)
-                sources[provider.name] = source
-
-        return ResolvedVersionsDTO.from_mapping(raw_versions), sources, user_agents
+            futures = [executor.submit(provider.build_user_agents, fetcher) for provider in providers]
+            results = [future.result() for future in futures]
+
+        return _collect(providers, results)
+
+    def generate_scheduled(
+        self,
+        scheduler: FetchScheduler,
+    ) -> GenerateResult:
+        """
+        Prefetch every provider's `source_urls()` on the scheduler's single pool, then build
+        providers in the calling thread: they only wait on already-running requests.
+        """
+        providers = self.registry.all()
+        scheduler.prefetch(url for provider in providers for url in provider.source_urls().values())
+        results = [provider.build_user_agents(scheduler) for provider in providers]
+        return _collect(providers, results)
+
+    def resolve_scheduled(
+        self,
+        scheduler: FetchScheduler,
+    ) -> tuple[ResolvedVersionsDTO, SourceByProviderMap]:
+        """
+        Like `generate_scheduled`, but stops after version resolution; see `render`.
+        """
+        providers = self.registry.all()
+        scheduler.prefetch(url for provider in providers for url in provider.source_urls().values())
+        results = [provider.fetch_versions(scheduler) for provider in providers]
+        return _collect_versions(providers, results)
+
+    def resolve_with_fallback(
+        self,
+        fetcher: JsonFetcher,
+        deadline: float,
+        previous_metadata: Mapping[str, object] | None,
+    ) -> tuple[ResolvedVersionsDTO, SourceByProviderMap]:
+        """
+        Resolve all providers within `deadline` seconds. A provider that fails or is still
+        running at the deadline falls back to its versions from `previous_metadata`, and its
+        `sources` entry is marked stale. Raises only when such a provider has no fallback.
+
+        The deadline is handed to fetchers exposing `set_deadline()` (the scheduler, resilient,
+        caching and pooled fetchers pass it down), so their requests time out with it and no
+        retry starts past it. Other fetchers' requests still running at the deadline are abandoned.
+        """
+        providers = self.registry.all()
+        set_deadline = getattr(fetcher, "set_deadline", None)
+        if set_deadline is not None:
+            set_deadline(time.monotonic() + deadline)
+        prefetch = getattr(fetcher, "prefetch", None)
+        if prefetch is not None:
+            prefetch(url for provider in providers for url in provider.source_urls().values())
+
+        executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="provider")
+        try:
+            futures = [executor.submit(provider.fetch_versions, fetcher) for provider in providers]
+            done, _ = wait(futures, timeout=deadline)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        results: list[ProviderFetchResult] = []
+        for provider, future in zip(providers, futures):
+            if future in done and future.exception() is None:
+                results.append(future.result())
+                continue
+
+            reason = f"error: {future.exception()}" if future in done else f"deadline of {deadline:g}s exceeded"
+            fallback = last_known_good(previous_metadata, provider.name)
+            if fallback is None:
+                raise RuntimeError(f"Provider '{provider.name}' failed ({reason}) and has no last-known-good versions")
+            results.append((fallback.versions, fallback.stale_source(reason)))
+
+        return _collect_versions(providers, results)
+
+    def render(
+        self,
+        resolved_versions: ResolvedVersionsDTO,
+        reuse: Mapping[str, list[UserAgentRecord]] | None = None,
+    ) -> list[UserAgentRecord]:
+        """
+        Render every provider from `resolved_versions`, taking records from `reuse[provider.name]`
+        instead when present.
+        """
+        user_agents: list[UserAgentRecord] = []
+        for provider in self.registry.all():
+            if reuse is not None and provider.name in reuse:
+                user_agents.extend(reuse[provider.name])
+                continue
+            rendered_user_agents = provider.render_user_agents(resolved_versions.versions_for(provider.name))
+            user_agents.extend(rendered.to_dict() for rendered in rendered_user_agents)
+        return user_agents
+
+    async def agenerate(
+        self,
+        fetcher: AsyncJsonFetcher,
+    ) -> GenerateResult:
+        """
+        Async counterpart of `generate`: every provider runs on the current event loop, no threads.
+        """
+        import asyncio
+
+        providers = self.registry.all()
+        results = await asyncio.gather(*(provider.abuild_user_agents(fetcher) for provider in providers))
+        return _collect(providers, list(results))
+
+
+def _collect_versions(
+    providers: list[BrowserProvider], results: list[ProviderFetchResult]
+) -> tuple[ResolvedVersionsDTO, SourceByProviderMap]:
+    raw_versions: dict[str, BrowserVersionsMap] = {}
+    sources: SourceByProviderMap = {}
+    for provider, (versions, source) in zip(providers, results):
+        raw_versions[provider.name] = versions
+        sources[provider.name] = source
+    return ResolvedVersionsDTO.from_mapping(raw_versions), sources
+
+
+def _collect(providers: list[BrowserProvider], results: list[ProviderBuildResult]) -> GenerateResult:
+    raw_versions: dict[str, BrowserVersionsMap] = {}
+    sources: SourceByProviderMap = {}
+    user_agents: list[UserAgentRecord] = []
+
+    for provider, (versions, rendered_user_agents, source) in zip(providers, results):
+        raw_versions[provider.name] = versions
+        user_agents.extend(rendered.to_dict() for rendered in rendered_user_agents)
+        sources[provider.name] = source
+
+    return ResolvedVersionsDTO.from_mapping(raw_versions), sources, user_agents
@@ -0,0 +1,89 @@
+import asyncio
+import gzip
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from user_agents_updater.async_http import AsyncPooledHttpClient, fetch_json_async, to_async_fetcher  # noqa: E402
+
+
+class _ChunkedGzipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = gzip.compress(json.dumps({"path": self.path}).encode("utf-8"))
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        middle = len(body) // 2
+        for chunk in (body[:middle], body[middle:]):
+            self.wfile.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AsyncHttpTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ChunkedGzipHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_fetch_json_async_decodes_chunked_gzip_body(self):
+        url = f"{self.base_url}/data.json?x=1"
+        self.assertEqual(asyncio.run(fetch_json_async(url)), (url, {"path": "/data.json?x=1"}))
+
+    def test_fetch_json_async_wraps_http_errors(self):
+        with self.assertRaises(RuntimeError):
+            asyncio.run(fetch_json_async(f"{self.base_url}/missing"))
+
+    def test_pooled_client_reuses_keep_alive_connections(self):
+        async def fetch_all():
+            async with AsyncPooledHttpClient() as client:
+                results = [await client(f"{self.base_url}/{index}.json") for index in range(3)]
+                results.append(await asyncio.gather(*(client(f"{self.base_url}/x.json") for _ in range(2))))
+                return results, client.connections_opened
+
+        results, opened = asyncio.run(fetch_all())
+        self.assertEqual(results[0], (f"{self.base_url}/0.json", {"path": "/0.json"}))
+        self.assertEqual(len(results[3]), 2)
+        self.assertEqual(opened, 2)
+
+    def test_pooled_client_reconnects_when_idle_connection_was_dropped(self):
+        async def fetch_twice():
+            async with AsyncPooledHttpClient() as client:
+                await client(f"{self.base_url}/a.json")
+                for connections in client._idle.values():
+                    for _, writer in connections:
+                        writer.transport.abort()
+                return await client(f"{self.base_url}/b.json"), client.connections_opened
+
+        result, opened = asyncio.run(fetch_twice())
+        self.assertEqual(result, (f"{self.base_url}/b.json", {"path": "/b.json"}))
+        self.assertEqual(opened, 2)
+
+    def test_to_async_fetcher_wraps_sync_fetcher(self):
+        def fake_fetcher(url):
+            return url, {"ok": True}
+
+        fetcher = to_async_fetcher(fake_fetcher)
+        self.assertEqual(asyncio.run(fetcher("https://example.com")), ("https://example.com", {"ok": True}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from _fixtures import load_provider_fixture
+from user_agents_updater.cassette import Cassette, RecordingFetcher, ReplayFetcher  # noqa: E402
+from user_agents_updater.providers_registry import ProviderRegistry  # noqa: E402
+from user_agents_updater.service import UserAgentService  # noqa: E402
+
+
+class CassetteTests(unittest.TestCase):
+    def test_record_then_replay_reproduces_generation(self):
+        fixtures_by_url: dict[str, object] = {}
+        for provider in ProviderRegistry.default().all():
+            for source_key, url in provider.source_urls().items():
+                fixtures_by_url[url] = load_provider_fixture(provider.name, source_key)
+
+        def fake_fetcher(url):
+            return url, fixtures_by_url[url]
+
+        service = UserAgentService()
+        recorder = RecordingFetcher(fake_fetcher)
+        recorded = service.generate(recorder)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "run.cassette.json.gz"
+            recorder.cassette.save(path)
+            first_bytes = path.read_bytes()
+            recorder.cassette.save(path)
+            self.assertEqual(path.read_bytes(), first_bytes)
+            replayed = service.generate(ReplayFetcher.from_path(path))
+
+        self.assertEqual(replayed[0].to_dict(), recorded[0].to_dict())
+        self.assertEqual(replayed[1], recorded[1])
+        self.assertEqual(replayed[2], recorded[2])
+
+    def test_identical_payloads_are_stored_once(self):
+        cassette = Cassette()
+        cassette.add("https://example.com/a", "https://example.com/a", {"ok": True})
+        cassette.add("https://example.com/b", "https://example.com/b", {"ok": True})
+        self.assertEqual(len(cassette.blobs), 1)
+        self.assertEqual(cassette.get("https://example.com/b"), ("https://example.com/b", {"ok": True}))
+
+    def test_replay_rejects_unrecorded_urls(self):
+        with self.assertRaises(RuntimeError):
+            ReplayFetcher(Cassette())("https://example.com/missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
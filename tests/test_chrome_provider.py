@@ -1,6 +1,8 @@
 import unittest
+from urllib.parse import parse_qs, urlsplit
 
 from _fixtures import load_provider_fixture
+from user_agents_updater.parsers import parse_semver_like  # noqa: E402
 from user_agents_updater.providers.chrome import (  # noqa: E402
     ChromeProvider,
     extract_chrome_latest_major_versions,
@@ -82,6 +84,84 @@ class ChromeProviderTests(unittest.TestCase):
             ["145.0.7632.46", "144.0.7559.132", "143.0.7499.40"],
         )
 
+    def _all_platforms_pages(self, page_size: int) -> list[dict]:
+        per_platform = ChromeProvider()
+        items = [
+            item
+            for source_key in per_platform.source_urls()
+            for item in load_provider_fixture(per_platform.name, source_key)["versions"]
+        ]
+        items.sort(key=lambda item: parse_semver_like(item["version"]), reverse=True)
+        pages = [{"versions": items[start:start + page_size]} for start in range(0, len(items), page_size)]
+        for index, page in enumerate(pages[:-1]):
+            page["nextPageToken"] = f"token-{index + 1}"
+        return pages
+
+    def test_all_platforms_mode_matches_per_platform_mode(self):
+        per_platform = ChromeProvider()
+        fixtures_by_url = {
+            url: load_provider_fixture(per_platform.name, source_key)
+            for source_key, url in per_platform.source_urls().items()
+        }
+        expected, _ = per_platform.fetch_versions(lambda url: (url, fixtures_by_url[url]))
+
+        pages = self._all_platforms_pages(page_size=10)
+        seen_tokens: list[str | None] = []
+
+        def paged_fetcher(url):
+            token = parse_qs(urlsplit(url).query).get("pageToken", [None])[0]
+            seen_tokens.append(token)
+            index = 0 if token is None else int(token.split("-")[1])
+            return url, pages[index]
+
+        provider = ChromeProvider(all_platforms=True, page_size=10)
+        versions, sources = provider.fetch_versions(paged_fetcher)
+
+        self.assertEqual(versions, expected)
+        self.assertEqual(sources["windows"], provider.all_platforms_url())
+        self.assertEqual(seen_tokens[0], None)
+        self.assertLess(len(seen_tokens), len(pages))
+
+    def test_extract_chrome_latest_major_versions_filters_by_platform(self):
+        payload = {
+            "versions": [
+                {"name": "chrome/platforms/win64/channels/stable/versions/146.0.1.0", "version": "146.0.1.0"},
+                {"name": "chrome/platforms/mac/channels/stable/versions/145.0.2.0", "version": "145.0.2.0"},
+                {"name": "chrome/platforms/win64/channels/stable/versions/144.0.3.0", "version": "144.0.3.0"},
+            ]
+        }
+        self.assertEqual(
+            extract_chrome_latest_major_versions(payload, major_count=2, platform="win64"),
+            ["146.0.1.0", "144.0.3.0"],
+        )
+
+    def test_backfill_walks_every_page_of_every_platform(self):
+        provider = ChromeProvider(backfill=True, backfill_page_size=2)
+        requested: list[str] = []
+
+        def paged_fetcher(url):
+            requested.append(url)
+            platform = urlsplit(url).path.split("/")[4]
+            token = parse_qs(urlsplit(url).query).get("pageToken", [None])[0]
+            page = 0 if token is None else int(token)
+            versions = [f"{146 - page}.0.{platform_index}.0" for platform_index in (2, 1)]
+            payload = {"versions": [{"version": version} for version in versions]}
+            if page < 2:
+                payload["nextPageToken"] = str(page + 1)
+            return url, payload
+
+        history, sources = provider.fetch_history(paged_fetcher)
+        self.assertEqual(len(requested), 3 * len(provider.platform_segments))
+        self.assertEqual(
+            history["windows"],
+            ["146.0.2.0", "146.0.1.0", "145.0.2.0", "145.0.1.0", "144.0.2.0", "144.0.1.0"],
+        )
+        self.assertEqual(sources["linux"], provider.history_url("linux"))
+        self.assertEqual(provider.source_urls()["macos"], provider.history_url("mac"))
+
+        versions, _ = provider.fetch_versions(paged_fetcher)
+        self.assertEqual(versions["windows"], ["146.0.2.0", "145.0.2.0", "144.0.2.0"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from user_agents_updater.client_hints import build_header_bundle, sec_ch_ua  # noqa: E402
+from user_agents_updater.providers.chrome import ChromeProvider  # noqa: E402
+from user_agents_updater.providers.firefox import FirefoxProvider  # noqa: E402
+
+
+class ClientHintsTests(unittest.TestCase):
+    def test_sec_ch_ua_matches_chromium_grease(self):
+        self.assertEqual(
+            sec_ch_ua("Google Chrome", "131"),
+            '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
+        )
+        self.assertEqual(
+            sec_ch_ua("Google Chrome", "120"),
+            '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+        )
+
+    def test_chromium_bundle_agrees_with_user_agent(self):
+        headers = dict(build_header_bundle("edge", "windows", "desktop", "131", "UA"))
+
+        self.assertIn('"Microsoft Edge";v="131"', headers["Sec-CH-UA"])
+        self.assertEqual(headers["Sec-CH-UA-Mobile"], "?0")
+        self.assertEqual(headers["Sec-CH-UA-Platform"], '"Windows"')
+        self.assertEqual(headers["User-Agent"], "UA")
+        self.assertEqual(dict(build_header_bundle("chrome", "android", "mobile", "131", "UA"))["Sec-CH-UA-Mobile"], "?1")
+
+    def test_non_chromium_bundles_have_no_client_hints(self):
+        for browser, os_name in (("firefox", "windows"), ("safari", "macos"), ("chrome", "ios")):
+            headers = dict(build_header_bundle(browser, os_name, "desktop", "18", "UA"))
+            self.assertFalse(any(name.startswith("Sec-CH-") for name in headers))
+            self.assertEqual(headers["User-Agent"], "UA")
+
+    def test_rendered_records_carry_header_bundles(self):
+        chrome = ChromeProvider().render_user_agents({"windows": ["146.0.7680.66"], "macos": ["146.0.7680.66"], "linux": ["146.0.7680.66"]})
+        record = chrome[1].to_dict()
+
+        self.assertEqual(record["headers"]["User-Agent"], record["user_agent"])
+        self.assertEqual(record["headers"]["Sec-CH-UA-Platform"], '"macOS"')
+        firefox = FirefoxProvider().render_user_agents(
+            {os_name: "148.0" for os_name in ("windows", "macos", "linux", "ubuntu")}
+        )
+        self.assertNotIn("Sec-CH-UA", firefox[0].to_dict()["headers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
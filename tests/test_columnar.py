@@ -0,0 +1,66 @@
+import sys
+import unittest
+
+from user_agents_updater.columnar import UserAgentColumns  # noqa: E402
+from user_agents_updater.models import ResolvedVersionsDTO  # noqa: E402
+from user_agents_updater.corpus import iter_corpus  # noqa: E402
+from user_agents_updater.providers.chrome import ChromeProvider  # noqa: E402
+
+
+def _deep_size(record: dict) -> int:
+    return sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record.values())
+
+
+class UserAgentColumnsTests(unittest.TestCase):
+    def setUp(self):
+        versions = [f"{major}.0.{build}.0" for major in range(100, 140) for build in range(50)]
+        resolved = ResolvedVersionsDTO.from_mapping({"chrome": {"windows": versions, "macos": versions, "linux": versions}})
+        self.rendered = list(iter_corpus([ChromeProvider()], resolved, full_build=True))
+
+    def test_rows_round_trip_records(self):
+        columns = UserAgentColumns.from_records(self.rendered)
+
+        self.assertEqual(len(columns), len(self.rendered))
+        for row, rendered in ((columns[0], self.rendered[0]), (columns[-1], self.rendered[-1])):
+            dto = row.to_dto()
+            self.assertEqual(
+                (dto.browser, dto.platform, dto.os, dto.browser_major_version, dto.user_agent),
+                (rendered.browser, rendered.platform, rendered.os, rendered.browser_major_version, rendered.user_agent),
+            )
+        self.assertEqual(columns[-1].user_agent, self.rendered[-1].user_agent)
+        self.assertEqual(list(columns.user_agents()), [rendered.user_agent for rendered in self.rendered])
+        self.assertEqual(columns[5].to_dict()["headers"]["User-Agent"], self.rendered[5].user_agent)
+        with self.assertRaises(IndexError):
+            columns[len(columns)]
+
+    def test_accepts_metadata_dicts_and_interns_categories(self):
+        records = [
+            {"browser": "firefox", "platform": "desktop", "os": "linux", "browser_major_version": "148", "user_agent": "UA-1"},
+            {"browser": "firefox", "platform": "desktop", "os": "linux", "browser_major_version": "147", "user_agent": "UA-2"},
+        ]
+        columns = UserAgentColumns.from_records(records)
+
+        self.assertIs(columns[0].browser, columns[1].browser)
+        self.assertEqual(columns[1].browser_major_version, "147")
+        self.assertEqual(columns.categories["os"].values, ["linux"])
+
+    def test_many_distinct_categories_widen_codes(self):
+        columns = UserAgentColumns()
+        for index in range(300):
+            columns.append("chrome", "desktop", f"os-{index}", "1", "UA")
+        self.assertEqual(columns[299].os, "os-299")
+        self.assertEqual(columns[0].os, "os-0")
+
+    def test_rejects_non_numeric_major(self):
+        with self.assertRaises(RuntimeError):
+            UserAgentColumns().append("chrome", "desktop", "windows", "beta", "UA")
+
+    def test_footprint_is_a_fraction_of_dicts(self):
+        columns = UserAgentColumns.from_records(self.rendered)
+        dicts_size = sum(_deep_size({k: v for k, v in rendered.to_dict().items() if k != "headers"}) for rendered in self.rendered)
+
+        self.assertLess(columns.nbytes() * 4, dicts_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
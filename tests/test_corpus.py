@@ -0,0 +1,102 @@
+import gzip
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from user_agents_updater.client_hints import build_header_bundle  # noqa: E402
+from user_agents_updater.corpus import (  # noqa: E402
+    BloomFilter,
+    ExactDeduplicator,
+    expand_variants,
+    iter_corpus,
+    write_shards,
+)
+from user_agents_updater.models import ResolvedVersionsDTO, UARenderVariantDTO  # noqa: E402
+from user_agents_updater.providers.chrome import CHROME_VARIANTS, ChromeProvider  # noqa: E402
+from user_agents_updater.providers.firefox import FirefoxProvider  # noqa: E402
+
+RESOLVED = ResolvedVersionsDTO.from_mapping(
+    {
+        "chrome": {
+            os_name: ["146.0.7680.66", "146.0.7680.31", "145.0.7632.161"]
+            for os_name in ("windows", "macos", "linux", "android", "ios")
+        },
+        "firefox": {os_name: "148.0" for os_name in ("windows", "macos", "linux", "ubuntu", "android", "ios")},
+    }
+)
+CATALOGS = {
+    "chrome": {"windows": ("Windows NT 10.0; Win64; x64", "Windows NT 10.0"), "linux": ("X11; Linux aarch64",)},
+}
+
+
+class CorpusTests(unittest.TestCase):
+    def test_expand_variants_keeps_own_token_first_and_skips_duplicates(self):
+        expanded = list(expand_variants("chrome", CHROME_VARIANTS, CATALOGS, full_build=True))
+
+        tokens = [variant.token for variant in expanded if variant.os == "windows"]
+        self.assertEqual(tokens, ["Windows NT 10.0; Win64; x64", "Windows NT 10.0"])
+        self.assertEqual(len(expanded), 5)
+        self.assertTrue(all("{version}" in variant.template for variant in expanded))
+
+    def test_iter_corpus_dedups_reduced_versions(self):
+        corpus = list(iter_corpus([ChromeProvider()], RESOLVED, CATALOGS))
+        user_agents = [rendered.user_agent for rendered in corpus]
+
+        # Reduced UAs only carry the major: two 146 builds collapse into one line.
+        self.assertEqual(len(user_agents), 5 * 2)
+        self.assertEqual(len(set(user_agents)), len(user_agents))
+
+        full = list(iter_corpus([ChromeProvider()], RESOLVED, CATALOGS, full_build=True))
+        self.assertEqual(len(full), 5 * 3)
+        self.assertTrue(any("Chrome/146.0.7680.31 " in rendered.user_agent for rendered in full))
+
+    def test_corpus_records_carry_their_header_bundle(self):
+        for rendered in iter_corpus([ChromeProvider(), FirefoxProvider()], RESOLVED, full_build=True):
+            self.assertEqual(
+                rendered.headers,
+                build_header_bundle(
+                    rendered.browser, rendered.os, rendered.platform, rendered.browser_major_version, rendered.user_agent
+                ),
+            )
+
+    def test_shards_are_disjoint_and_cover_the_corpus(self):
+        providers = [ChromeProvider(), FirefoxProvider()]
+        full = {rendered.user_agent for rendered in iter_corpus(providers, RESOLVED, full_build=True)}
+        shards = [
+            {rendered.user_agent for rendered in iter_corpus(providers, RESOLVED, full_build=True, shard_index=index, shard_count=3)}
+            for index in range(3)
+        ]
+
+        self.assertEqual(set().union(*shards), full)
+        self.assertEqual(sum(len(shard) for shard in shards), len(full))
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+        exact = ExactDeduplicator()
+        digests = [hashlib.blake2b(str(index).encode(), digest_size=16).digest() for index in range(1_000)]
+        new_count = sum(bloom.add(digest) for digest in digests)
+
+        self.assertGreaterEqual(new_count, 960)
+        self.assertFalse(any(bloom.add(digest) for digest in digests))
+        self.assertTrue(exact.add(digests[0]))
+        self.assertFalse(exact.add(digests[0]))
+
+    def test_write_shards_splits_lines(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = write_shards((f"line-{index}" for index in range(5)), Path(temp_dir), shard_lines=2, compress=True)
+
+            self.assertEqual([path.name for path in paths], ["corpus-00000.txt.gz", "corpus-00001.txt.gz", "corpus-00002.txt.gz"])
+            with gzip.open(paths[-1], "rt", encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "line-4\n")
+
+    def test_unknown_os_without_versions_is_skipped(self):
+        variant = UARenderVariantDTO(platform="desktop", os="beos", token="BeOS", template="{token}/{version}")
+        provider = ChromeProvider()
+        object.__setattr__(provider, "variants", [variant])
+
+        self.assertEqual(list(iter_corpus([provider], RESOLVED)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import copy
+import threading
+import unittest
+from datetime import datetime, timezone
+
+from _fixtures import load_provider_fixture
+from user_agents_updater.daemon import PollPolicy, RefreshDaemon, ReleaseWindow  # noqa: E402
+from user_agents_updater.providers_registry import ProviderRegistry  # noqa: E402
+from user_agents_updater.service import UserAgentService  # noqa: E402
+
+FIREFOX_DESKTOP_URL = "https://product-details.mozilla.org/1.0/firefox_versions.json"
+
+
+def _fixtures_by_url() -> dict[str, object]:
+    fixtures_by_url: dict[str, object] = {}
+    for provider in ProviderRegistry.default().all():
+        for source_key, url in provider.source_urls().items():
+            fixtures_by_url[url] = load_provider_fixture(provider.name, source_key)
+    return fixtures_by_url
+
+
+class PollPolicyTests(unittest.TestCase):
+    def test_polls_faster_inside_release_window(self):
+        policy = PollPolicy(interval=3600, release_interval=60, release_windows=(ReleaseWindow(1, 15, 23),))
+        tuesday_evening = datetime(2026, 3, 10, 18, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(policy.next_delay(tuesday_evening), 60)
+
+    def test_interval_is_shortened_to_reach_next_window(self):
+        policy = PollPolicy(interval=3600, release_interval=60, release_windows=(ReleaseWindow(1, 15, 23),))
+        tuesday_before_window = datetime(2026, 3, 10, 14, 30, tzinfo=timezone.utc)
+        wednesday = datetime(2026, 3, 11, 12, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(policy.next_delay(tuesday_before_window), 1800)
+        self.assertEqual(policy.next_delay(wednesday), 3600)
+
+
+class RefreshDaemonTests(unittest.TestCase):
+    def setUp(self):
+        self.fixtures_by_url = _fixtures_by_url()
+        self.fetch_counts: dict[str, int] = {}
+
+    def fetcher(self, url):
+        self.fetch_counts[url] = self.fetch_counts.get(url, 0) + 1
+        return url, self.fixtures_by_url[url]
+
+    def test_refresh_all_matches_service_generate(self):
+        daemon = RefreshDaemon(UserAgentService(), self.fetcher)
+
+        snapshot = daemon.refresh_all()
+        resolved_versions, _, user_agents = UserAgentService().generate(self.fetcher)
+
+        self.assertEqual(snapshot.generation, 0)
+        self.assertEqual(snapshot.resolved_versions, resolved_versions)
+        self.assertEqual(list(snapshot.user_agents), user_agents)
+        self.assertEqual(snapshot.to_metadata()["user_agents"], user_agents)
+
+    def test_refresh_provider_swaps_only_on_change(self):
+        swaps = []
+        daemon = RefreshDaemon(UserAgentService(), self.fetcher, on_swap=swaps.append)
+        first = daemon.refresh_all()
+
+        self.assertFalse(daemon.refresh_provider("firefox"))
+        self.assertIs(daemon.snapshot(), first)
+
+        payload = copy.deepcopy(self.fixtures_by_url[FIREFOX_DESKTOP_URL])
+        payload["LATEST_FIREFOX_VERSION"] = "999.0"
+        self.fixtures_by_url[FIREFOX_DESKTOP_URL] = payload
+        self.assertTrue(daemon.refresh_provider("firefox"))
+
+        second = daemon.snapshot()
+        self.assertEqual(second.generation, 1)
+        self.assertEqual(second.resolved_versions.versions_for("firefox")["windows"], "999.0")
+        self.assertIs(second.user_agents_by_provider["chrome"], first.user_agents_by_provider["chrome"])
+        self.assertNotEqual(first.resolved_versions.versions_for("firefox")["windows"], "999.0")
+        self.assertEqual(swaps, [first, second])
+
+    def test_run_polls_each_provider_and_survives_errors(self):
+        errors = []
+        policy = PollPolicy(interval=0.01, release_interval=0.01)
+        failing_url = next(url for url in self.fixtures_by_url if "edgeupdates" in url)
+
+        def fetcher(url):
+            if url == failing_url and self.fetch_counts.get(url, 0) >= 1:
+                self.fetch_counts[url] += 1
+                raise RuntimeError("HTTP 503")
+            return self.fetcher(url)
+
+        stop = threading.Event()
+        daemon = RefreshDaemon(
+            UserAgentService(),
+            fetcher,
+            policies={name: policy for name in ("chrome", "edge", "firefox", "safari")},
+            on_error=lambda name, err: (errors.append(name), stop.set() if len(errors) >= 2 else None),
+        )
+        thread = threading.Thread(target=daemon.run, args=(stop,))
+        thread.start()
+        thread.join(5)
+        stop.set()
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(errors, ["edge", "edge"])
+        self.assertEqual(daemon.snapshot().generation, 0)
+        self.assertGreaterEqual(self.fetch_counts[FIREFOX_DESKTOP_URL], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
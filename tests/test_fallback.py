@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+
+from _fixtures import load_provider_fixture
+from user_agents_updater.fallback import is_stale_source, last_known_good  # noqa: E402
+from user_agents_updater.providers_registry import ProviderRegistry  # noqa: E402
+from user_agents_updater.service import UserAgentService  # noqa: E402
+
+
+def _fixtures_by_url() -> dict[str, object]:
+    fixtures_by_url: dict[str, object] = {}
+    for provider in ProviderRegistry.default().all():
+        for source_key, url in provider.source_urls().items():
+            fixtures_by_url[url] = load_provider_fixture(provider.name, source_key)
+    return fixtures_by_url
+
+
+PREVIOUS_METADATA = {
+    "updated_at": "2026-03-07T06:22:40Z",
+    "sources": {"edge": "https://edgeupdates.microsoft.com/api/products"},
+    "resolved_versions": {"edge": {"windows": "140.0.1", "macos": "140.0.1"}},
+}
+
+
+class LastKnownGoodTests(unittest.TestCase):
+    def test_returns_previous_versions_and_marks_source_stale(self):
+        fallback = last_known_good(PREVIOUS_METADATA, "edge")
+
+        self.assertEqual(fallback.versions, {"windows": "140.0.1", "macos": "140.0.1"})
+        source = fallback.stale_source("error: boom")
+        self.assertTrue(is_stale_source(source))
+        self.assertEqual(source["default"], "https://edgeupdates.microsoft.com/api/products")
+        self.assertEqual(source["reason"], "error: boom")
+        self.assertEqual(source["last_good_at"], "2026-03-07T06:22:40Z")
+
+    def test_stale_entry_keeps_original_timestamp_and_urls(self):
+        stale_source = last_known_good(PREVIOUS_METADATA, "edge").stale_source("first")
+        metadata = {**PREVIOUS_METADATA, "updated_at": "2026-03-08T00:00:00Z", "sources": {"edge": stale_source}}
+
+        source = last_known_good(metadata, "edge").stale_source("second")
+
+        self.assertEqual(source["last_good_at"], "2026-03-07T06:22:40Z")
+        self.assertEqual(source["reason"], "second")
+        self.assertEqual(set(source), {"default", "status", "reason", "last_good_at"})
+
+    def test_missing_provider_has_no_fallback(self):
+        self.assertIsNone(last_known_good(PREVIOUS_METADATA, "safari"))
+        self.assertIsNone(last_known_good(None, "edge"))
+
+
+class ResolveWithFallbackTests(unittest.TestCase):
+    def test_failed_provider_uses_last_known_good(self):
+        fixtures_by_url = _fixtures_by_url()
+
+        def fetcher(url):
+            if "edgeupdates" in url:
+                raise RuntimeError("HTTP 503")
+            return url, fixtures_by_url[url]
+
+        resolved, sources = UserAgentService().resolve_with_fallback(fetcher, 5, PREVIOUS_METADATA)
+
+        self.assertEqual(resolved.versions_for("edge"), {"windows": "140.0.1", "macos": "140.0.1"})
+        self.assertTrue(is_stale_source(sources["edge"]))
+        self.assertIn("HTTP 503", sources["edge"]["reason"])
+        self.assertFalse(is_stale_source(sources["chrome"]))
+
+    def test_slow_provider_is_abandoned_at_deadline(self):
+        fixtures_by_url = _fixtures_by_url()
+        release = threading.Event()
+
+        def fetcher(url):
+            if "edgeupdates" in url:
+                release.wait(5)
+            return url, fixtures_by_url[url]
+
+        try:
+            resolved, sources = UserAgentService().resolve_with_fallback(fetcher, 0.2, PREVIOUS_METADATA)
+        finally:
+            release.set()
+
+        self.assertEqual(resolved.versions_for("edge"), {"windows": "140.0.1", "macos": "140.0.1"})
+        self.assertIn("deadline", sources["edge"]["reason"])
+
+    def test_deadline_is_handed_to_the_fetcher(self):
+        fixtures_by_url = _fixtures_by_url()
+        deadlines: list[float] = []
+
+        class DeadlineAwareFetcher:
+            def __call__(self, url):
+                return url, fixtures_by_url[url]
+
+            def set_deadline(self, deadline):
+                deadlines.append(deadline)
+
+        started = time.monotonic()
+        UserAgentService().resolve_with_fallback(DeadlineAwareFetcher(), 5, PREVIOUS_METADATA)
+
+        self.assertEqual(len(deadlines), 1)
+        self.assertAlmostEqual(deadlines[0], started + 5, delta=1)
+
+    def test_raises_without_fallback(self):
+        def fetcher(url):
+            raise RuntimeError("offline")
+
+        with self.assertRaisesRegex(RuntimeError, "no last-known-good versions"):
+            UserAgentService().resolve_with_fallback(fetcher, 5, PREVIOUS_METADATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
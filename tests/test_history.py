@@ -0,0 +1,111 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from user_agents_updater.history import VersionHistory  # noqa: E402
+from user_agents_updater.models import ResolvedVersionsDTO  # noqa: E402
+
+
+def _resolved(chrome_major: int, with_safari: bool = True) -> ResolvedVersionsDTO:
+    versions = {"chrome": {"windows": [f"{chrome_major}.0.1.0"]}}
+    if with_safari:
+        versions["safari"] = {"macos": "26.3"}
+    return ResolvedVersionsDTO.from_mapping(versions)
+
+
+def _sources(with_safari: bool = True) -> dict:
+    sources = {"chrome": {"windows": "https://chrome.example"}}
+    if with_safari:
+        sources["safari"] = "https://safari.example"
+    return sources
+
+
+def _at(day: int) -> str:
+    return f"2026-03-{day:02d}T06:00:00Z"
+
+
+class VersionHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "history.jsonl"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _fill(self, days: int, keyframe_interval: int = 4) -> VersionHistory:
+        history = VersionHistory(self.path, keyframe_interval=keyframe_interval)
+        for day in range(1, days + 1):
+            history.append(_at(day), _resolved(100 + day, with_safari=day % 5 != 0), _sources(with_safari=day % 5 != 0))
+        return history
+
+    def test_point_in_time_queries_reconstruct_each_run(self):
+        history = self._fill(20)
+        reloaded = VersionHistory(self.path, keyframe_interval=4)
+
+        for day in (1, 4, 5, 6, 13, 20):
+            entry = reloaded.as_of(f"2026-03-{day:02d}T12:00:00Z")
+            self.assertEqual(entry.updated_at, _at(day))
+            self.assertEqual(entry.resolved_versions, _resolved(100 + day, with_safari=day % 5 != 0))
+            self.assertEqual(entry.sources, _sources(with_safari=day % 5 != 0))
+        self.assertIsNone(history.as_of("2026-02-01T00:00:00Z"))
+
+    def test_range_queries_and_delta_encoding(self):
+        self._fill(10)
+        history = VersionHistory(self.path, keyframe_interval=4)
+        entries = history.between(_at(3), _at(7))
+
+        self.assertEqual([entry.updated_at for entry in entries], [_at(day) for day in range(3, 8)])
+        self.assertEqual(entries[2].resolved_versions, _resolved(105, with_safari=False))
+        self.assertEqual(entries[3].resolved_versions, _resolved(106))
+        self.assertEqual(history.between("2027-01-01T00:00:00Z", "2027-02-01T00:00:00Z"), [])
+
+        records = [json.loads(line) for line in self.path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([record["kind"] for record in records[:5]], ["full", "delta", "delta", "delta", "full"])
+        self.assertNotIn("safari", records[1]["versions"])
+        self.assertEqual(records[5]["versions"]["safari"], {"macos": "26.3"})
+        self.assertIsNone(records[9]["versions"]["safari"])
+
+    def test_append_reads_only_back_to_the_last_keyframe(self):
+        self._fill(9)
+        expected = self.path.read_text(encoding="utf-8")
+        # Each run's fresh instance must encode exactly like one long-lived instance,
+        # including when lines straddle the blocks read back from the end.
+        self.path.unlink()
+        with patch("user_agents_updater.history.TAIL_BLOCK_SIZE", 16):
+            for day in range(1, 10):
+                VersionHistory(self.path, keyframe_interval=4).append(
+                    _at(day), _resolved(100 + day, with_safari=day % 5 != 0), _sources(with_safari=day % 5 != 0)
+                )
+        self.assertEqual(self.path.read_text(encoding="utf-8"), expected)
+
+        # Lines before the last full snapshot (line 9) are never read by `append`.
+        lines = expected.splitlines()
+        self.path.write_text("\n".join(["not json", *lines[1:]]) + "\n", encoding="utf-8")
+        self.assertTrue(VersionHistory(self.path, keyframe_interval=4).append(_at(10), _resolved(110), _sources()))
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8").splitlines()[-1])["kind"], "delta")
+        with self.assertRaisesRegex(RuntimeError, "line 1"):
+            VersionHistory(self.path, keyframe_interval=4).as_of(_at(10))
+
+    def test_naive_datetimes_are_rejected(self):
+        history = self._fill(3)
+        self.assertEqual(history.as_of(datetime.fromisoformat("2026-03-02T12:00:00+00:00")).updated_at, _at(2))
+        with self.assertRaisesRegex(ValueError, "timezone-aware"):
+            history.as_of(datetime(2026, 3, 2, 12))
+        with self.assertRaisesRegex(ValueError, "timezone-aware"):
+            history.between(datetime(2026, 3, 1), _at(3))
+
+    def test_unchanged_runs_and_out_of_order_appends(self):
+        history = VersionHistory(self.path)
+        self.assertTrue(history.append(_at(1), _resolved(101), _sources()))
+        self.assertFalse(history.append(_at(2), _resolved(101), _sources()))
+        self.assertEqual(len(history), 1)
+
+        with self.assertRaises(RuntimeError):
+            history.append("2026-02-01T00:00:00Z", _resolved(102), _sources())
+
+
+if __name__ == "__main__":
+    unittest.main()
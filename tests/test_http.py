@@ -1,10 +1,14 @@
+import os
+import subprocess
+import sys
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from user_agents_updater.http import (  # noqa: E402
     DEFAULT_USER_AGENT_HEADER,
+    _load_cached_user_agent_pool,
     _load_user_agent_pool,
     _pick_user_agent,
     fetch_json,
@@ -32,13 +36,49 @@ class HttpTests(unittest.TestCase):
             path.write_text('[" UA1 ", "", 42, "UA2"]', encoding="utf-8")
             self.assertEqual(_load_user_agent_pool(path), ("UA1", "UA2"))
 
+    def test_cached_pool_skips_json_parse_until_source_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "user-agents.json"
+            cache_path = Path(temp_dir) / "cache" / "pool.marshal"
+            path.write_text('["UA1", "UA2"]', encoding="utf-8")
+            self.assertEqual(_load_cached_user_agent_pool(path, cache_path), ("UA1", "UA2"))
+            self.assertTrue(cache_path.is_file())
+
+            with patch("user_agents_updater.http._load_user_agent_pool") as mocked_load:
+                self.assertEqual(_load_cached_user_agent_pool(path, cache_path), ("UA1", "UA2"))
+                mocked_load.assert_not_called()
+
+            path.write_text('["UA1", "UA2", "UA3"]', encoding="utf-8")
+            self.assertEqual(_load_cached_user_agent_pool(path, cache_path), ("UA1", "UA2", "UA3"))
+
+            cache_path.write_bytes(b"garbage")
+            self.assertEqual(_load_cached_user_agent_pool(path, cache_path), ("UA1", "UA2", "UA3"))
+            self.assertEqual(_load_cached_user_agent_pool(Path(temp_dir) / "missing.json", cache_path), ())
+
+    def test_import_does_not_load_pool(self):
+        code = "import user_agents_updater.http as http; print(http._user_agent_pool is None)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1] / "src")},
+        )
+        self.assertEqual(result.stdout.strip(), "True")
+
     def test_pick_user_agent_falls_back_when_pool_is_empty(self):
         self.assertEqual(_pick_user_agent(()), DEFAULT_USER_AGENT_HEADER)
 
     def test_pick_user_agent_uses_random_choice_when_pool_is_not_empty(self):
-        with patch("user_agents_updater.http.random.choice", return_value="UA2") as mocked_choice:
-            self.assertEqual(_pick_user_agent(("UA1", "UA2")), "UA2")
-            mocked_choice.assert_called_once_with(("UA1", "UA2"))
+        rng = Mock()
+        rng.choice.return_value = "UA2"
+        self.assertEqual(_pick_user_agent(("UA1", "UA2"), rng=rng), "UA2")
+        rng.choice.assert_called_once_with(("UA1", "UA2"))
+
+    def test_pick_user_agent_uses_current_stream_by_default(self):
+        with patch("user_agents_updater.http.current_random") as mocked_current:
+            mocked_current.return_value.choice.return_value = "UA1"
+            self.assertEqual(_pick_user_agent(("UA1", "UA2")), "UA1")
 
     def test_fetch_json_returns_source_and_payload(self):
         with patch("user_agents_updater.http.urlopen", return_value=_FakeResponse('{"ok": true}')):
@@ -0,0 +1,156 @@
+import tempfile
+import unittest
+from email.message import Message
+from pathlib import Path
+from unittest.mock import patch
+from urllib.error import HTTPError
+
+from user_agents_updater.http import HttpStatusError  # noqa: E402
+from user_agents_updater.http_cache import CachingJsonFetcher, HttpCache, memoized_extract  # noqa: E402
+
+URL = "https://example.com/data.json"
+
+
+class _FakeResponse:
+    def __init__(self, payload: str, headers: dict[str, str] | None = None) -> None:
+        self._payload = payload.encode("utf-8")
+        self.status = 200
+        self.headers = Message()
+        for name, value in (headers or {}).items():
+            self.headers[name] = value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def read(self) -> bytes:
+        return self._payload
+
+
+def _not_modified(req, timeout):
+    raise HTTPError(req.full_url, 304, "Not Modified", Message(), None)
+
+
+class HttpCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache = HttpCache(Path(self._temp_dir.name))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_stores_validators_and_sends_them_on_next_request(self):
+        response = _FakeResponse('{"ok": true}', {"ETag": '"abc"', "Last-Modified": "Sat, 07 Mar 2026 06:00:00 GMT"})
+        with patch("user_agents_updater.http_cache.urlopen", return_value=response):
+            CachingJsonFetcher(self.cache)(URL)
+
+        seen_headers = {}
+
+        def capture(req, timeout):
+            seen_headers.update(req.headers)
+            return _not_modified(req, timeout)
+
+        with patch("user_agents_updater.http_cache.urlopen", side_effect=capture):
+            source, payload = CachingJsonFetcher(self.cache)(URL)
+
+        self.assertEqual(source, URL)
+        self.assertEqual(payload, {"ok": True})
+        self.assertEqual(seen_headers["If-none-match"], '"abc"')
+        self.assertEqual(seen_headers["If-modified-since"], "Sat, 07 Mar 2026 06:00:00 GMT")
+
+    def test_not_modified_without_cache_entry_raises(self):
+        with patch("user_agents_updater.http_cache.urlopen", side_effect=_not_modified):
+            with self.assertRaises(RuntimeError):
+                CachingJsonFetcher(self.cache)(URL)
+
+    def test_http_error_status_is_reported_like_the_pooled_client(self):
+        def unavailable(req, timeout):
+            raise HTTPError(req.full_url, 503, "Service Unavailable", Message(), None)
+
+        with patch("user_agents_updater.http_cache.urlopen", side_effect=unavailable):
+            with self.assertRaises(HttpStatusError) as caught:
+                CachingJsonFetcher(self.cache)(URL)
+        self.assertEqual(caught.exception.status, 503)
+
+    def test_memoized_extract_reuses_result_for_unchanged_payload(self):
+        response = _FakeResponse('{"version": "1.2.3"}', {"ETag": '"v1"'})
+        with patch("user_agents_updater.http_cache.urlopen", return_value=response):
+            fetcher = CachingJsonFetcher(self.cache)
+            _, payload = fetcher(URL)
+        calls: list[object] = []
+
+        def extract(data):
+            calls.append(data)
+            return data["version"]
+
+        self.assertEqual(memoized_extract(fetcher, "test", payload, extract), "1.2.3")
+
+        with patch("user_agents_updater.http_cache.urlopen", side_effect=_not_modified):
+            fetcher = CachingJsonFetcher(self.cache)
+            _, payload = fetcher(URL)
+        self.assertEqual(memoized_extract(fetcher, "test", payload, extract), "1.2.3")
+        self.assertEqual(len(calls), 1)
+
+    def test_changed_body_evicts_previous_payload_and_prunes_disk(self):
+        fetcher = CachingJsonFetcher(self.cache)
+        with patch("user_agents_updater.http_cache.urlopen", return_value=_FakeResponse('{"version": "1"}')):
+            _, first = fetcher(URL)
+            fetcher(f"{URL}?other")
+        memoized_extract(fetcher, "test", first, lambda data: data["version"])
+        old_digest = fetcher.payload_digest(first)
+
+        with patch("user_agents_updater.http_cache.urlopen", return_value=_FakeResponse('{"version": "2"}')):
+            _, second = fetcher(URL)
+
+        # The other URL still serves the old body: it stays in memory and on disk.
+        self.assertEqual(fetcher.payload_digest(first), old_digest)
+        self.assertTrue((Path(self._temp_dir.name) / "bodies" / old_digest).is_file())
+
+        with patch("user_agents_updater.http_cache.urlopen", return_value=_FakeResponse('{"version": "2"}')):
+            fetcher(f"{URL}?other")
+
+        self.assertIsNone(fetcher.payload_digest(first))
+        self.assertEqual(len(fetcher._payload_by_digest), 1)
+        root = Path(self._temp_dir.name)
+        self.assertEqual([path.name for path in (root / "bodies").iterdir()], [fetcher.payload_digest(second)])
+        self.assertEqual(list((root / "parsed").iterdir()), [])
+
+    def test_memoized_extract_keeps_result_types(self):
+        with patch("user_agents_updater.http_cache.urlopen", return_value=_FakeResponse('{"a": "1", "b": "2"}')):
+            fetcher = CachingJsonFetcher(self.cache)
+            _, payload = fetcher(URL)
+
+        def extract(data):
+            return (data["a"], [data["b"]], {"a": (data["a"],)})
+
+        fresh = memoized_extract(fetcher, "test", payload, extract)
+        with patch("user_agents_updater.http_cache.urlopen", side_effect=_not_modified):
+            fetcher = CachingJsonFetcher(self.cache)
+            _, payload = fetcher(URL)
+        cached = memoized_extract(fetcher, "test", payload, lambda data: self.fail("extract was re-run"))
+        self.assertEqual(cached, fresh)
+        self.assertIsInstance(cached, tuple)
+        self.assertIsInstance(cached[2]["a"], tuple)
+
+    def test_memoized_result_is_recomputed_when_code_changes(self):
+        with patch("user_agents_updater.http_cache.urlopen", return_value=_FakeResponse('{"version": "1.2.3"}')):
+            fetcher = CachingJsonFetcher(self.cache)
+            _, payload = fetcher(URL)
+        self.assertEqual(memoized_extract(fetcher, "test", payload, lambda data: data["version"]), "1.2.3")
+
+        with patch("user_agents_updater.http_cache.code_fingerprint", return_value="0" * 16):
+            fixed = memoized_extract(fetcher, "test", payload, lambda data: f"v{data['version']}")
+        self.assertEqual(fixed, "v1.2.3")
+
+    def test_memoized_extract_calls_through_for_plain_fetchers(self):
+        def fake_fetcher(url):
+            return url, {"version": "1.2.3"}
+
+        _, payload = fake_fetcher(URL)
+        self.assertEqual(memoized_extract(fake_fetcher, "test", payload, lambda data: data["version"]), "1.2.3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import gzip
+import json
+import threading
+import time
+import unittest
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from user_agents_updater.http_pool import PooledHttpClient, decode_body  # noqa: E402
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    release = threading.Event()
+
+    def do_GET(self):
+        if self.path == "/slow":
+            self.release.wait(10)
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/data.json?moved=1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledHttpClientTests(unittest.TestCase):
+    def setUp(self):
+        _JsonHandler.release.clear()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _JsonHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        _JsonHandler.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_reuses_connection_and_decodes_gzip(self):
+        with PooledHttpClient() as client:
+            first = client(f"{self.base_url}/a.json")
+            second = client(f"{self.base_url}/b.json")
+
+        self.assertEqual(first, (f"{self.base_url}/a.json", {"path": "/a.json"}))
+        self.assertEqual(second[1], {"path": "/b.json"})
+        self.assertEqual(client.connections_opened, 1)
+
+    def test_deadline_bounds_requests_in_flight(self):
+        with PooledHttpClient(timeout=30) as client:
+            client(f"{self.base_url}/warm.json")
+            client.set_deadline(time.monotonic() + 0.3)
+            started = time.monotonic()
+            with self.assertRaisesRegex(RuntimeError, "Unable to fetch endpoint"):
+                client(f"{self.base_url}/slow")
+            self.assertLess(time.monotonic() - started, 2)
+            with self.assertRaisesRegex(RuntimeError, "deadline exceeded"):
+                client(f"{self.base_url}/a.json")
+
+    def test_fetch_many_preserves_order_and_caps_connections(self):
+        urls = [f"{self.base_url}/{index}.json" for index in range(8)]
+        with PooledHttpClient(max_connections_per_host=2) as client:
+            results = client.fetch_many(urls)
+
+        self.assertEqual([source for source, _ in results], urls)
+        self.assertEqual([payload["path"] for _, payload in results], [f"/{index}.json" for index in range(8)])
+        self.assertLessEqual(client.connections_opened, 2)
+
+    def test_follows_redirects_and_reports_requested_url(self):
+        with PooledHttpClient() as client:
+            source, payload = client(f"{self.base_url}/redirect")
+        self.assertEqual(source, f"{self.base_url}/redirect")
+        self.assertEqual(payload, {"path": "/data.json?moved=1"})
+
+    def test_decode_body_supports_zlib_and_raw_deflate(self):
+        raw = b'{"ok": true}'
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        raw_deflate = compressor.compress(raw) + compressor.flush()
+        self.assertEqual(decode_body(zlib.compress(raw), "deflate"), raw)
+        self.assertEqual(decode_body(raw_deflate, "deflate"), raw)
+        self.assertEqual(decode_body(raw, None), raw)
+
+    def test_unsupported_scheme_raises(self):
+        with self.assertRaises(RuntimeError):
+            PooledHttpClient()("ftp://example.com/data.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch
+
+from user_agents_updater.incremental import plan_incremental_update  # noqa: E402
+from user_agents_updater.models import ResolvedVersionsDTO  # noqa: E402
+from user_agents_updater.providers.edge import EdgeProvider  # noqa: E402
+from user_agents_updater.providers.safari import SafariProvider  # noqa: E402
+from user_agents_updater.providers_registry import ProviderRegistry  # noqa: E402
+from user_agents_updater.service import UserAgentService  # noqa: E402
+
+
+def _resolved(edge_version: str) -> ResolvedVersionsDTO:
+    return ResolvedVersionsDTO.from_mapping(
+        {
+            "edge": {"windows": edge_version},
+            "safari": {"macos": "26.3", "ios": "26.3"},
+        }
+    )
+
+
+class IncrementalTests(unittest.TestCase):
+    def setUp(self):
+        edge, safari = EdgeProvider(), SafariProvider()
+        self.service = UserAgentService(ProviderRegistry(providers={edge.name: edge, safari.name: safari}))
+        self.providers = self.service.registry.all()
+
+    def _metadata(self, resolved: ResolvedVersionsDTO) -> dict:
+        plan = plan_incremental_update(self.providers, resolved, None)
+        return {
+            "fingerprints": plan.fingerprints,
+            "user_agents": self.service.render(resolved),
+        }
+
+    def test_without_previous_metadata_every_provider_changed(self):
+        plan = plan_incremental_update(self.providers, _resolved("145.0.3800.97"), None)
+        self.assertEqual(plan.changed, ("edge", "safari"))
+        self.assertFalse(plan.unchanged)
+
+    def test_identical_versions_are_unchanged(self):
+        resolved = _resolved("145.0.3800.97")
+        plan = plan_incremental_update(self.providers, resolved, self._metadata(resolved))
+        self.assertTrue(plan.unchanged)
+
+    def test_only_moved_providers_are_re_rendered(self):
+        previous = self._metadata(_resolved("145.0.3800.97"))
+        resolved = _resolved("146.0.3856.10")
+        plan = plan_incremental_update(self.providers, resolved, previous)
+
+        self.assertEqual(plan.changed, ("edge",))
+        self.assertEqual(list(plan.reusable_user_agents), ["safari"])
+        self.assertEqual(
+            self.service.render(resolved, reuse=plan.reusable_user_agents),
+            self.service.render(resolved),
+        )
+
+    def test_changed_sources_are_not_unchanged(self):
+        resolved = _resolved("145.0.3800.97")
+        sources = {"edge": "https://edge.example/api", "safari": "https://safari.example/api"}
+        previous = {**self._metadata(resolved), "sources": sources}
+        self.assertTrue(plan_incremental_update(self.providers, resolved, previous, sources).unchanged)
+
+        stale = {**sources, "edge": {"default": sources["edge"], "status": "stale", "reason": "timeout"}}
+        plan = plan_incremental_update(self.providers, resolved, previous, stale)
+        self.assertFalse(plan.unchanged)
+        self.assertEqual(plan.changed, ())
+        self.assertEqual(list(plan.reusable_user_agents), ["edge", "safari"])
+
+    def test_record_format_change_re_renders_everything(self):
+        resolved = _resolved("145.0.3800.97")
+        with patch("user_agents_updater.incremental.RENDER_FORMAT_VERSION", 1):
+            previous = self._metadata(resolved)
+
+        self.assertEqual(plan_incremental_update(self.providers, resolved, previous).changed, ("edge", "safari"))
+
+
+if __name__ == "__main__":
+    unittest.main()
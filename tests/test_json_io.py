@@ -0,0 +1,102 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from user_agents_updater import json_io  # noqa: E402
+from user_agents_updater.json_io import (  # noqa: E402
+    atomic_write_bytes,
+    available_formats,
+    output_path,
+    write_json_outputs,
+    write_pretty_json,
+)
+
+DATA = {"user_agents": [{"browser": "chrome", "user_agent": "Mozilla/5.0 (X11) Chrome/146.0.0.0"}]}
+
+
+class JsonIoTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = Path(self.directory.name)
+
+    def test_write_pretty_json_keeps_indented_format(self):
+        path = self.root / "out.json"
+        write_pretty_json(path, DATA)
+        self.assertEqual(path.read_text(encoding="utf-8"), json.dumps(DATA, indent=2) + "\n")
+        self.assertEqual(os.listdir(self.root), ["out.json"])
+
+    def test_failed_write_leaves_previous_file_and_no_temp_file(self):
+        path = self.root / "out.json"
+        path.write_text("previous", encoding="utf-8")
+        with mock.patch.object(json_io.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                atomic_write_bytes(path, b"new")
+        self.assertEqual(path.read_text(encoding="utf-8"), "previous")
+        self.assertEqual(os.listdir(self.root), ["out.json"])
+
+    def test_output_path_replaces_json_suffix(self):
+        self.assertEqual(output_path(Path("data/user-agents.json"), ".min.json.gz"), Path("data/user-agents.min.json.gz"))
+        self.assertEqual(output_path(Path("data/user-agents.json"), ".json"), Path("data/user-agents.json"))
+
+    def test_write_json_outputs_writes_every_encoding(self):
+        path = self.root / "user-agents.json"
+        written = write_json_outputs(path, DATA, (".json", ".min.json", ".min.json.gz"))
+
+        self.assertEqual(json.loads(written[".json"].read_text(encoding="utf-8")), DATA)
+        minified = written[".min.json"].read_bytes()
+        self.assertEqual(json.loads(minified), DATA)
+        self.assertNotIn(b"\n", minified)
+        self.assertEqual(gzip.decompress(written[".min.json.gz"].read_bytes()), minified)
+
+        # Identical content gives byte-identical archives (no timestamp in the gzip header).
+        first = written[".min.json.gz"].read_bytes()
+        write_json_outputs(path, DATA, (".json", ".min.json", ".min.json.gz"))
+        self.assertEqual(written[".min.json.gz"].read_bytes(), first)
+
+    def test_write_json_outputs_keeps_published_variants_up_to_date(self):
+        path = self.root / "user-agents.json"
+        output_path(path, ".min.json.gz").write_bytes(b"old")
+        written = write_json_outputs(path, DATA, (".json", ".min.json"))
+
+        self.assertEqual(set(written), {".json", ".min.json", ".min.json.gz"})
+        self.assertEqual(json.loads(gzip.decompress(written[".min.json.gz"].read_bytes())), DATA)
+
+    def test_published_variant_without_its_encoder_fails_loudly(self):
+        path = self.root / "user-agents.json"
+        published = output_path(path, ".min.json.br")
+        published.write_bytes(b"published")
+        with mock.patch.object(json_io, "brotli", None):
+            with self.assertRaisesRegex(RuntimeError, "'brotli' package is not installed"):
+                write_json_outputs(path, DATA, (".json", ".min.json"))
+
+        self.assertEqual(published.read_bytes(), b"published")
+        self.assertFalse(path.exists())
+
+    def test_write_json_outputs_rejects_unknown_format(self):
+        with self.assertRaisesRegex(RuntimeError, "Unknown output formats: .xml"):
+            write_json_outputs(self.root / "user-agents.json", DATA, (".json", ".xml"))
+
+    def test_available_formats_follow_installed_packages(self):
+        with mock.patch.object(json_io, "brotli", None), mock.patch.object(json_io, "msgpack", None):
+            self.assertEqual(available_formats(), (".json", ".min.json", ".min.json.gz"))
+            with self.assertRaisesRegex(RuntimeError, "msgpack"):
+                available_formats(include_msgpack=True)
+
+    @unittest.skipIf(json_io.brotli is None, "brotli is not installed")
+    def test_brotli_variant_round_trips(self):
+        written = write_json_outputs(self.root / "user-agents.json", DATA, (".min.json.br",))
+        self.assertEqual(json.loads(json_io.brotli.decompress(written[".min.json.br"].read_bytes())), DATA)
+
+    @unittest.skipIf(json_io.msgpack is None, "msgpack is not installed")
+    def test_msgpack_variant_round_trips(self):
+        written = write_json_outputs(self.root / "user-agents.json", DATA, (".msgpack",))
+        self.assertEqual(json_io.msgpack.unpackb(written[".msgpack"].read_bytes()), DATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from user_agents_updater.manifest import (  # noqa: E402
+    content_addressed_name,
+    dataset_fingerprint,
+    load_manifest,
+    publish_manifest,
+)
+
+
+class ManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = Path(self.directory.name)
+        self.manifest_path = self.root / "manifest.json"
+
+    def _output(self, name: str, content: str) -> Path:
+        path = self.root / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_content_addressed_name_keeps_every_suffix(self):
+        self.assertEqual(content_addressed_name("user-agents.min.json.gz", "ab" * 32), f"user-agents.{'ab' * 8}.min.json.gz")
+
+    def test_dataset_fingerprint_ignores_key_order(self):
+        self.assertEqual(dataset_fingerprint({"a": "1", "b": "2"}), dataset_fingerprint({"b": "2", "a": "1"}))
+        self.assertNotEqual(dataset_fingerprint({"a": "1"}), dataset_fingerprint({"a": "2"}))
+
+    def test_publish_manifest_describes_each_output(self):
+        output = self._output("user-agents.json", '["ua-1", "ua-2"]')
+        manifest = publish_manifest(self.manifest_path, {output: 2}, "f" * 64, "2026-03-01T00:00:00Z")
+
+        entry = manifest["files"]["user-agents.json"]
+        digest = hashlib.sha256(output.read_bytes()).hexdigest()
+        self.assertEqual(entry["sha256"], digest)
+        self.assertEqual(entry["size"], output.stat().st_size)
+        self.assertEqual(entry["records"], 2)
+        self.assertEqual(entry["fingerprint"], "f" * 64)
+        self.assertEqual(entry["path"], f"objects/user-agents.{digest[:16]}.json")
+        self.assertEqual((self.root / entry["path"]).read_bytes(), output.read_bytes())
+        self.assertEqual(load_manifest(self.manifest_path), manifest)
+        self.assertEqual(json.loads(self.manifest_path.read_text(encoding="utf-8"))["fingerprint"], "f" * 64)
+
+    def test_publish_manifest_keeps_previous_generation_only(self):
+        output = self._output("user-agents.json", '["v1"]')
+        first = publish_manifest(self.manifest_path, {output: 1}, "1" * 64, "2026-03-01T00:00:00Z")
+        output.write_text('["v2"]', encoding="utf-8")
+        second = publish_manifest(self.manifest_path, {output: 1}, "2" * 64, "2026-03-02T00:00:00Z")
+        output.write_text('["v3"]', encoding="utf-8")
+        third = publish_manifest(self.manifest_path, {output: 1}, "3" * 64, "2026-03-03T00:00:00Z")
+
+        paths = [manifest["files"]["user-agents.json"]["path"] for manifest in (first, second, third)]
+        self.assertFalse((self.root / paths[0]).exists())
+        self.assertTrue((self.root / paths[1]).exists())
+        self.assertTrue((self.root / paths[2]).exists())
+
+    def test_unchanged_content_reuses_the_same_object(self):
+        output = self._output("user-agents.json", '["same"]')
+        first = publish_manifest(self.manifest_path, {output: 1}, "1" * 64, "2026-03-01T00:00:00Z")
+        second = publish_manifest(self.manifest_path, {output: 1}, "1" * 64, "2026-03-02T00:00:00Z")
+        self.assertEqual(first["files"], second["files"])
+        self.assertEqual(len(list((self.root / "objects").iterdir())), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
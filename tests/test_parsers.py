@@ -1,6 +1,11 @@
 import unittest
 
-from user_agents_updater.parsers import major_version, parse_semver_like  # noqa: E402
+from user_agents_updater.parsers import (  # noqa: E402
+    Version,
+    major_version,
+    parse_semver_like,
+    select_latest_majors,
+)
 
 
 class ParsersTests(unittest.TestCase):
@@ -13,6 +18,38 @@ class ParsersTests(unittest.TestCase):
     def test_major_version_returns_first_segment(self):
         self.assertEqual(major_version("145.0.7632.46"), "145")
 
+    def test_version_parses_once_and_orders_numerically(self):
+        versions = [Version.parse(value) for value in ("9.1.0", "10.0.2", "10.0.10")]
+        self.assertEqual([version.text for version in sorted(versions)], ["9.1.0", "10.0.2", "10.0.10"])
+        self.assertEqual(versions[2].major, 10)
+        self.assertIsNone(Version.parse("145.0-beta"))
+
+    def test_select_latest_majors_matches_full_sort(self):
+        candidates = ["144.0.1.0", "145.0.2.0", "bogus", "146.0.1.5", "145.0.10.0", "143.0.0.1", "146.0.1.12"]
+        expected: list[str] = []
+        seen: set[int] = set()
+        for value in sorted(candidates, key=parse_semver_like, reverse=True):
+            key = parse_semver_like(value)
+            if key and key[0] not in seen and len(expected) < 3:
+                seen.add(key[0])
+                expected.append(value)
+
+        latest = select_latest_majors(candidates, 3)
+        self.assertEqual([version.text for version in latest], expected)
+        self.assertEqual([version.major for version in latest], [146, 145, 144])
+
+    def test_select_latest_majors_handles_ascending_and_shuffled_input(self):
+        candidates = [f"{major}.0.{build}.0" for major in range(1, 200) for build in (1, 7, 3)]
+        expected = [f"{major}.0.7.0" for major in range(199, 194, -1)]
+        self.assertEqual([version.text for version in select_latest_majors(candidates, 5)], expected)
+        shuffled = candidates[1::2] + candidates[::2]
+        self.assertEqual([version.text for version in select_latest_majors(reversed(shuffled), 5)], expected)
+
+    def test_select_latest_majors_keeps_first_of_equal_versions(self):
+        latest = select_latest_majors(["145.00.1", "145.0.1", "bogus"], 5)
+        self.assertEqual([version.text for version in latest], ["145.00.1"])
+        self.assertEqual(select_latest_majors(["bogus"], 3), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,106 @@
+import random
+import time
+import unittest
+from collections import Counter
+
+from user_agents_updater.query import UserAgentIndex  # noqa: E402
+
+
+def _record(browser, os_name, platform, major):
+    return {
+        "browser": browser,
+        "platform": platform,
+        "os": os_name,
+        "browser_major_version": major,
+        "user_agent": f"{browser}-{os_name}-{major}",
+    }
+
+
+RECORDS = [
+    _record("chrome", "windows", "desktop", "146"),
+    _record("chrome", "windows", "desktop", "144"),
+    _record("chrome", "macos", "desktop", "146"),
+    _record("chrome", "linux", "desktop", "146"),
+    _record("firefox", "windows", "desktop", "148"),
+    _record("firefox", "android", "mobile", "148"),
+]
+
+
+def _scan(records, predicate):
+    return [record["user_agent"] for record in records if predicate(record)]
+
+
+class UserAgentIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = UserAgentIndex.from_metadata({"user_agents": RECORDS})
+
+    def test_conjunctive_filters_match_full_scan(self):
+        selection = self.index.select(browser="chrome", os=("windows", "macos"), min_major=145)
+
+        self.assertEqual(
+            selection.user_agents(),
+            _scan(RECORDS, lambda r: r["browser"] == "chrome" and r["os"] in ("windows", "macos") and int(r["browser_major_version"]) >= 145),
+        )
+        self.assertEqual(len(selection), 2)
+
+    def test_major_filters(self):
+        self.assertEqual(self.index.select(major=144).user_agents(), ["chrome-windows-144"])
+        self.assertEqual(len(self.index.select(max_major=146)), 4)
+        self.assertEqual(len(self.index.select(min_major=145, max_major=147)), 3)
+        self.assertEqual(len(self.index.select(major=(144, 148))), 3)
+        self.assertFalse(self.index.select(major=1))
+
+    def test_unknown_values_give_empty_selection_and_sets_combine(self):
+        self.assertFalse(self.index.select(browser="safari"))
+        mobile_or_linux = self.index.select(platform="mobile") | self.index.select(os="linux")
+        self.assertEqual(sorted(mobile_or_linux.user_agents()), ["chrome-linux-146", "firefox-android-148"])
+        self.assertEqual(len(mobile_or_linux & self.index.select(browser="firefox")), 1)
+
+    def test_choice_draws_uniformly_from_selection(self):
+        selection = self.index.select(browser="chrome", min_major=146)
+        rng = random.Random(2)
+        counts = Counter(selection.choice(rng)["user_agent"] for _ in range(30_000))
+
+        self.assertEqual(set(counts), {"chrome-windows-146", "chrome-macos-146", "chrome-linux-146"})
+        for count in counts.values():
+            self.assertAlmostEqual(count / 30_000, 1 / 3, delta=0.02)
+        with self.assertRaises(RuntimeError):
+            self.index.select(browser="safari").choice()
+
+    def test_choice_spans_multiple_words(self):
+        records = [_record("chrome", "windows", "desktop", str(100 + position)) for position in range(300)]
+        index = UserAgentIndex(records)
+        selection = index.select(min_major=350)
+        rng = random.Random(0)
+        drawn = {selection.choice(rng)["browser_major_version"] for _ in range(2_000)}
+
+        self.assertEqual(drawn, {str(major) for major in range(350, 400)})
+
+    def test_build_and_draw_scale_linearly_to_a_million_records(self):
+        browsers = ("chrome", "edge", "firefox", "safari")
+        oses = ("windows", "macos", "linux")
+        records = [
+            _record(browsers[position % 4], oses[position % 3], "desktop", str(100 + position % 50))
+            for position in range(1_000_000)
+        ]
+        started = time.perf_counter()
+        index = UserAgentIndex(records)
+        build_seconds = time.perf_counter() - started
+
+        selection = index.select(browser="firefox", os="linux", min_major=140)
+        rng = random.Random(0)
+        started = time.perf_counter()
+        drawn = [selection.choice(rng) for _ in range(1_000)]
+        draw_seconds = time.perf_counter() - started
+
+        # Generous bounds: the quadratic versions took ~37s to build and ~0.4s per draw here.
+        self.assertLess(build_seconds, 10)
+        self.assertLess(draw_seconds, 1)
+        self.assertEqual(len(selection), sum(1 for _ in selection))
+        for record in drawn:
+            self.assertEqual((record["browser"], record["os"]), ("firefox", "linux"))
+            self.assertGreaterEqual(int(record["browser_major_version"]), 140)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
 import unittest
 
 from user_agents_updater.models import UARenderVariantDTO  # noqa: E402
-from user_agents_updater.rendering import render_variants  # noqa: E402
+from user_agents_updater.providers.chrome import CHROME_VARIANTS  # noqa: E402
+from user_agents_updater.providers.edge import EDGE_VARIANTS  # noqa: E402
+from user_agents_updater.providers.firefox import FIREFOX_VARIANTS  # noqa: E402
+from user_agents_updater.providers.safari import SAFARI_VARIANTS  # noqa: E402
+from user_agents_updater.rendering import compile_variant, render_many, render_variants  # noqa: E402
 
 
 class RenderingTests(unittest.TestCase):
@@ -35,6 +39,40 @@ class RenderingTests(unittest.TestCase):
         self.assertIn("Chrome/145.0.0.0", rendered[1].user_agent)
         self.assertIn("Chrome/144.0.0.0", rendered[2].user_agent)
 
+    def test_render_many_matches_render_variants_for_provider_variants(self):
+        versions = ["146.0.7680.66", "145.0.7632.161", "26.2"]
+        for browser, variants in (
+            ("chrome", CHROME_VARIANTS),
+            ("edge", EDGE_VARIANTS),
+            ("firefox", FIREFOX_VARIANTS),
+            ("safari", SAFARI_VARIANTS),
+        ):
+            versions_by_os = {variant.os: versions for variant in variants}
+            self.assertEqual(
+                render_many(browser, variants, versions_by_os),
+                render_variants(browser, variants, versions_by_os),
+            )
+
+    def test_compile_variant_folds_token_and_keeps_escaped_braces(self):
+        variant = UARenderVariantDTO(
+            platform="desktop",
+            os="windows",
+            token="Win{64}",
+            template="{{x}} ({token}) V/{version} M/{major_version}",
+        )
+        compiled = compile_variant(variant)
+
+        self.assertEqual(len(compiled.slots), 2)
+        self.assertEqual(
+            compiled.render({"version": "1.2", "major_version": "1"}),
+            variant.template.format(token=variant.token, version="1.2", major_version="1"),
+        )
+
+    def test_compile_variant_rejects_unknown_fields(self):
+        variant = UARenderVariantDTO(platform="desktop", os="windows", token="t", template="{build}")
+        with self.assertRaises(RuntimeError):
+            compile_variant(variant)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,136 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.error import URLError
+
+from user_agents_updater.http import HttpStatusError  # noqa: E402
+from user_agents_updater.resilience import FetchPolicy, ResilientFetcher, is_transient  # noqa: E402
+
+URL = "https://example.com/data.json"
+NO_DELAY = FetchPolicy(base_delay=0, max_delay=0, hedge=False)
+
+
+def _wrapped(err: BaseException) -> RuntimeError:
+    try:
+        raise RuntimeError("fetch failed") from err
+    except RuntimeError as wrapped:
+        return wrapped
+
+
+class ResilienceTests(unittest.TestCase):
+    def test_is_transient_classifies_errors(self):
+        self.assertTrue(is_transient(_wrapped(URLError("reset"))))
+        self.assertTrue(is_transient(HttpStatusError(URL, 503)))
+        self.assertFalse(is_transient(HttpStatusError(URL, 404)))
+        self.assertFalse(is_transient(RuntimeError("Invalid VersionHistory payload")))
+
+    def test_retries_transient_errors_until_success(self):
+        calls: list[str] = []
+
+        def flaky_fetcher(url):
+            calls.append(url)
+            if len(calls) < 3:
+                raise HttpStatusError(url, 503)
+            return url, {"ok": True}
+
+        with ResilientFetcher(flaky_fetcher, NO_DELAY) as fetcher:
+            self.assertEqual(fetcher(URL), (URL, {"ok": True}))
+            stats = fetcher.stats()["example.com"]
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["failures"], 2)
+
+    def test_does_not_retry_permanent_errors(self):
+        calls: list[str] = []
+
+        def failing_fetcher(url):
+            calls.append(url)
+            raise HttpStatusError(url, 404)
+
+        with ResilientFetcher(failing_fetcher, NO_DELAY) as fetcher:
+            with self.assertRaises(HttpStatusError):
+                fetcher(URL)
+        self.assertEqual(len(calls), 1)
+
+    def test_no_retry_past_deadline_and_deadline_is_passed_down(self):
+        calls: list[str] = []
+        deadlines: list[float | None] = []
+
+        class FailingFetcher:
+            def __call__(self, url):
+                calls.append(url)
+                raise HttpStatusError(url, 503)
+
+            def set_deadline(self, deadline):
+                deadlines.append(deadline)
+
+        policy = FetchPolicy(base_delay=5, max_delay=5, hedge=False)
+        with ResilientFetcher(FailingFetcher(), policy) as fetcher, mock.patch(
+            "user_agents_updater.resilience.random.uniform", side_effect=lambda low, high: high
+        ):
+            deadline = time.monotonic() + 0.5
+            fetcher.set_deadline(deadline)
+            started = time.monotonic()
+            with self.assertRaises(HttpStatusError):
+                fetcher(URL)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(deadlines, [deadline])
+        self.assertEqual(len(calls), 1)
+
+    def test_hedges_slow_attempt_after_p95(self):
+        calls = 0
+        lock = threading.Lock()
+        release_slow = threading.Event()
+
+        def fetcher_with_one_stall(url):
+            nonlocal calls
+            with lock:
+                calls += 1
+                call_number = calls
+            if call_number == 6:
+                release_slow.wait(5)
+            return url, {"call": call_number}
+
+        policy = FetchPolicy(base_delay=0, hedge_min_samples=5)
+        with ResilientFetcher(fetcher_with_one_stall, policy) as fetcher:
+            for _ in range(5):
+                fetcher(URL)
+            started = time.perf_counter()
+            _, payload = fetcher(URL)
+            elapsed = time.perf_counter() - started
+            release_slow.set()
+            stats = fetcher.stats()["example.com"]
+
+        self.assertEqual(payload, {"call": 7})
+        self.assertLess(elapsed, 1)
+        self.assertEqual(stats["hedges"], 1)
+        self.assertEqual(stats["hedge_wins"], 1)
+
+    def test_caps_concurrency_per_host(self):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_fetcher(url):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return url, {}
+
+        policy = FetchPolicy(max_concurrency_per_host=2, hedge=False)
+        with ResilientFetcher(slow_fetcher, policy) as fetcher:
+            threads = [threading.Thread(target=fetcher, args=(URL,)) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
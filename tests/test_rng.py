@@ -0,0 +1,74 @@
+import asyncio
+import os
+import threading
+import unittest
+
+from user_agents_updater.rng import RandomStreams  # noqa: E402
+
+
+def _draws_in_thread(streams, name):
+    draws = []
+    thread = threading.Thread(target=lambda: draws.extend(streams.current().random() for _ in range(3)), name=name)
+    thread.start()
+    thread.join()
+    return draws
+
+
+class RandomStreamsTests(unittest.TestCase):
+    def test_same_seed_and_thread_name_reproduce_draws(self):
+        first = _draws_in_thread(RandomStreams(seed=42), "worker-1")
+        second = _draws_in_thread(RandomStreams(seed=42), "worker-1")
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, _draws_in_thread(RandomStreams(seed=42), "worker-2"))
+        self.assertNotEqual(first, _draws_in_thread(RandomStreams(seed=43), "worker-1"))
+
+    def test_threads_sharing_a_name_get_independent_streams(self):
+        streams = RandomStreams(seed=42)
+        first = _draws_in_thread(streams, "fetch_0")
+        second = _draws_in_thread(streams, "fetch_0")
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(first, _draws_in_thread(RandomStreams(seed=42), "fetch_0"))
+
+    def test_stream_is_stable_within_a_thread(self):
+        streams = RandomStreams(seed=1)
+        self.assertIs(streams.current(), streams.current())
+
+    def test_tasks_get_independent_reproducible_streams(self):
+        async def draws(streams):
+            async def task_draw():
+                return streams.current(), streams.current().random()
+
+            results = []
+            for name in ("a", "b"):
+                results.append(await asyncio.create_task(task_draw(), name=name))
+            return results
+
+        first = asyncio.run(draws(RandomStreams(seed=7)))
+        second = asyncio.run(draws(RandomStreams(seed=7)))
+
+        self.assertIsNot(first[0][0], first[1][0])
+        self.assertNotEqual(first[0][1], first[1][1])
+        self.assertEqual([value for _, value in first], [value for _, value in second])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_forked_child_gets_a_different_stream(self):
+        streams = RandomStreams(seed=5)
+        streams.current()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, repr(streams.current().random()).encode("ascii"))
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as reader:
+            child_draw = float(reader.read())
+        os.waitpid(pid, 0)
+        self.assertNotEqual(child_draw, streams.current().random())
+
+
+if __name__ == "__main__":
+    unittest.main()
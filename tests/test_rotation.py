@@ -0,0 +1,75 @@
+import threading
+import unittest
+from collections import Counter
+
+from user_agents_updater.rotation import ConsistentHashRing, StickyUserAgentRotator  # noqa: E402
+
+POOL = [f"UA-{index}" for index in range(10)]
+HOSTS = [f"host-{index}.example" for index in range(5_000)]
+
+
+class ConsistentHashRingTests(unittest.TestCase):
+    def test_keys_spread_evenly(self):
+        ring = ConsistentHashRing(POOL)
+        counts = Counter(ring.lookup(host) for host in HOSTS)
+
+        self.assertEqual(set(counts), set(POOL))
+        for count in counts.values():
+            self.assertAlmostEqual(count / len(HOSTS), 0.1, delta=0.04)
+
+    def test_adding_one_user_agent_remaps_about_one_nth(self):
+        before = ConsistentHashRing(POOL)
+        after = ConsistentHashRing(POOL + ["UA-new"])
+        moved = [host for host in HOSTS if before.lookup(host) != after.lookup(host)]
+
+        self.assertTrue(all(after.lookup(host) == "UA-new" for host in moved))
+        self.assertAlmostEqual(len(moved) / len(HOSTS), 1 / 11, delta=0.04)
+
+    def test_empty_ring(self):
+        self.assertIsNone(ConsistentHashRing([]).lookup("example.com"))
+
+
+class StickyUserAgentRotatorTests(unittest.TestCase):
+    def test_same_host_keeps_its_user_agent(self):
+        rotator = StickyUserAgentRotator(POOL)
+
+        self.assertEqual(
+            rotator.user_agent_for_url("https://Example.com/a"),
+            rotator.user_agent_for_url("http://example.com:8080/b?c=d"),
+        )
+        self.assertEqual(rotator.user_agent_for_url("https://example.com/"), rotator.user_agent_for("example.com"))
+
+    def test_pins_override_ring_and_are_bounded(self):
+        rotator = StickyUserAgentRotator(POOL, max_overrides=16)
+        rotator.pin("example.com", "UA-pinned")
+        self.assertEqual(rotator.user_agent_for("example.com"), "UA-pinned")
+
+        rotator.unpin("example.com")
+        self.assertIn(rotator.user_agent_for("example.com"), POOL)
+
+        for host in HOSTS[:1_000]:
+            rotator.pin(host, "UA-pinned")
+        pinned = sum(rotator.user_agent_for(host) == "UA-pinned" for host in HOSTS[:1_000])
+        self.assertLessEqual(pinned, 16)
+        self.assertEqual(rotator.user_agent_for(HOSTS[999]), "UA-pinned")
+
+    def test_concurrent_lookups_are_consistent(self):
+        rotator = StickyUserAgentRotator(POOL)
+        expected = {host: rotator.user_agent_for(host) for host in HOSTS[:500]}
+        mismatches = []
+
+        def worker():
+            for host in HOSTS[:500]:
+                if rotator.user_agent_for(host) != expected[host]:
+                    mismatches.append(host)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(mismatches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
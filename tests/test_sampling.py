@@ -0,0 +1,85 @@
+import random
+import unittest
+from collections import Counter
+
+from user_agents_updater import sampling  # noqa: E402
+from user_agents_updater.sampling import AliasTable, SamplingWeights, WeightedSampler  # noqa: E402
+
+
+def _record(browser, os_name, major):
+    return {
+        "browser": browser,
+        "platform": "desktop",
+        "os": os_name,
+        "browser_major_version": major,
+        "user_agent": f"{browser}-{os_name}-{major}",
+    }
+
+
+RECORDS = [
+    _record("chrome", "windows", "146"),
+    _record("chrome", "windows", "145"),
+    _record("chrome", "windows", "144"),
+    _record("chrome", "linux", "146"),
+    _record("firefox", "windows", "148"),
+]
+
+
+class AliasTableTests(unittest.TestCase):
+    def test_draws_follow_weights(self):
+        table = AliasTable([1, 2, 7, 0])
+        rng = random.Random(1)
+        counts = Counter(table.draw(rng) for _ in range(100_000))
+
+        self.assertNotIn(3, counts)
+        for index, expected in enumerate((0.1, 0.2, 0.7)):
+            self.assertAlmostEqual(counts[index] / 100_000, expected, delta=0.01)
+
+    def test_rejects_invalid_weights(self):
+        with self.assertRaises(RuntimeError):
+            AliasTable([0, 0])
+        with self.assertRaises(RuntimeError):
+            AliasTable([1, -1])
+
+
+class WeightedSamplerTests(unittest.TestCase):
+    def test_major_rank_weights_prefer_newest_major(self):
+        weights = SamplingWeights(browser={"firefox": 0}, os={"linux": 0}, major_rank=(6, 3, 1))
+        sampler = WeightedSampler(RECORDS, weights, seed=7)
+        counts = Counter(sampler.sample(60_000))
+
+        self.assertEqual(set(counts), {"chrome-windows-146", "chrome-windows-145", "chrome-windows-144"})
+        self.assertAlmostEqual(counts["chrome-windows-146"] / 60_000, 0.6, delta=0.015)
+        self.assertAlmostEqual(counts["chrome-windows-144"] / 60_000, 0.1, delta=0.015)
+
+    def test_seeded_samplers_are_reproducible(self):
+        first = WeightedSampler(RECORDS, seed=3)
+        second = WeightedSampler.from_metadata({"user_agents": RECORDS}, seed=3)
+
+        self.assertEqual(first.sample(100), second.sample(100))
+        self.assertEqual(first.sample_one(), second.sample_one())
+        self.assertEqual(first.sample(0), [])
+
+    def test_pure_python_fallback_without_numpy(self):
+        original = sampling.np
+        sampling.np = None
+        try:
+            sampler = WeightedSampler(RECORDS, seed=1)
+            indices = sampler.sample_indices(10)
+        finally:
+            sampling.np = original
+
+        self.assertIsInstance(indices, list)
+        self.assertTrue(all(0 <= index < len(RECORDS) for index in indices))
+
+    @unittest.skipIf(sampling.np is None, "NumPy is not installed")
+    def test_numpy_bulk_sampling_follows_weights(self):
+        sampler = WeightedSampler(RECORDS, SamplingWeights(browser={"firefox": 4}), seed=5)
+        samples = sampler.sample(200_000)
+
+        self.assertEqual(len(samples), 200_000)
+        self.assertAlmostEqual(samples.count("firefox-windows-148") / 200_000, 0.5, delta=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+
+from _fixtures import load_provider_fixture
+from user_agents_updater.providers_registry import ProviderRegistry  # noqa: E402
+from user_agents_updater.scheduler import FetchScheduler  # noqa: E402
+from user_agents_updater.service import UserAgentService  # noqa: E402
+
+
+class FetchSchedulerTests(unittest.TestCase):
+    def test_singleflight_deduplicates_concurrent_requests(self):
+        calls: list[str] = []
+        lock = threading.Lock()
+
+        def slow_fetcher(url):
+            with lock:
+                calls.append(url)
+            time.sleep(0.02)
+            return url, {"url": url}
+
+        with FetchScheduler(slow_fetcher, max_workers=4) as scheduler:
+            scheduler.prefetch(["https://a", "https://b", "https://a"])
+            results = scheduler.fetch_many(["https://a", "https://a", "https://b"])
+            self.assertEqual(scheduler("https://b"), ("https://b", {"url": "https://b"}))
+
+        self.assertEqual(sorted(calls), ["https://a", "https://b"])
+        self.assertEqual([source for source, _ in results], ["https://a", "https://a", "https://b"])
+
+    def test_prefetch_starts_slowest_urls_first(self):
+        started: list[str] = []
+
+        def recording_fetcher(url):
+            started.append(url)
+            return url, {}
+
+        history = {"https://fast": 0.01, "https://slow": 2.0}
+        with FetchScheduler(recording_fetcher, max_workers=1, latency_history=history) as scheduler:
+            scheduler.prefetch(["https://fast", "https://slow", "https://new"])
+            scheduler.fetch_many(["https://fast", "https://slow", "https://new"])
+            latencies = scheduler.latency_history()
+
+        self.assertEqual(started, ["https://new", "https://slow", "https://fast"])
+        self.assertLess(latencies["https://slow"], 2.0)
+        self.assertIn("https://new", latencies)
+
+    def test_generate_scheduled_matches_generate(self):
+        fixtures_by_url: dict[str, object] = {}
+        for provider in ProviderRegistry.default().all():
+            for source_key, url in provider.source_urls().items():
+                fixtures_by_url[url] = load_provider_fixture(provider.name, source_key)
+        calls: list[str] = []
+
+        def fake_fetcher(url):
+            calls.append(url)
+            return url, fixtures_by_url[url]
+
+        service = UserAgentService()
+        expected = service.generate(fake_fetcher)
+        calls.clear()
+        with FetchScheduler(fake_fetcher) as scheduler:
+            scheduled = service.generate_scheduled(scheduler)
+
+        self.assertEqual(scheduled[2], expected[2])
+        self.assertEqual(scheduled[1], expected[1])
+        self.assertEqual(sorted(calls), sorted(fixtures_by_url))
+
+
+if __name__ == "__main__":
+    unittest.main()
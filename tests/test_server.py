@@ -0,0 +1,87 @@
+import asyncio
+import json
+import unittest
+
+from user_agents_updater.server import parse_target, ResponseTable, UserAgentServer  # noqa: E402
+
+METADATA = {
+    "updated_at": "2026-03-07T06:22:40Z",
+    "user_agents": [
+        {"browser": "chrome", "platform": "desktop", "os": "windows", "browser_major_version": "146", "user_agent": "UA-chrome-win-146"},
+        {"browser": "chrome", "platform": "desktop", "os": "macos", "browser_major_version": "145", "user_agent": "UA-chrome-mac-145"},
+        {"browser": "firefox", "platform": "mobile", "os": "android", "browser_major_version": "148", "user_agent": "UA-firefox-android"},
+    ],
+}
+
+
+def _body(response: bytes) -> bytes:
+    return response.split(b"\r\n\r\n", 1)[1]
+
+
+class ResponseTableTests(unittest.TestCase):
+    def test_filters_select_matching_records(self):
+        table = ResponseTable(METADATA)
+
+        bodies = {_body(table.respond("/ua", ("chrome", None, None, None))) for _ in range(50)}
+        self.assertEqual(bodies, {b"UA-chrome-win-146", b"UA-chrome-mac-145"})
+        self.assertEqual(_body(table.respond("/ua", ("chrome", None, None, "145"))), b"UA-chrome-mac-145")
+        record = json.loads(_body(table.respond("/ua.json", (None, None, "mobile", None))))
+        self.assertEqual(record["browser"], "firefox")
+        self.assertIn(b"404 Not Found", table.respond("/ua", ("safari", None, None, None)))
+        self.assertEqual(json.loads(_body(table.respond("/metadata", (None,) * 4))), METADATA)
+
+    def test_parse_target_rejects_unknown_routes_and_filters(self):
+        self.assertEqual(parse_target("/ua?browser=Chrome&major=146"), ("/ua", ("chrome", None, None, "146")))
+        self.assertIsNone(parse_target("/other"))
+        self.assertIsNone(parse_target("/ua?color=red"))
+
+
+class UserAgentServerTests(unittest.TestCase):
+    def test_serves_pipelined_requests_and_swaps_dataset(self):
+        async def scenario():
+            server = UserAgentServer(METADATA)
+            listener = await server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            async def read_response():
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                return head, await reader.readexactly(length)
+
+            writer.write(
+                b"GET /ua?os=android HTTP/1.1\r\nHost: x\r\n\r\n"
+                b"GET /missing HTTP/1.1\r\nHost: x\r\n\r\n"
+            )
+            first = await read_response()
+            second = await read_response()
+
+            server.update({"user_agents": [{**METADATA["user_agents"][2], "user_agent": "UA-new"}]})
+            writer.write(b"GET /ua HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+            third = await read_response()
+            trailing = await reader.read()
+
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return first, second, third, trailing
+
+        first, second, third, trailing = asyncio.run(scenario())
+
+        self.assertTrue(first[0].startswith(b"HTTP/1.1 200 OK"))
+        self.assertEqual(first[1], b"UA-firefox-android")
+        self.assertTrue(second[0].startswith(b"HTTP/1.1 404"))
+        self.assertEqual(third[1], b"UA-new")
+        self.assertEqual(trailing, b"")
+
+    def test_head_omits_body(self):
+        server = UserAgentServer(METADATA)
+        response = server.handle(b"HEAD /ua HTTP/1.1")
+
+        self.assertTrue(response.endswith(b"\r\n\r\n"))
+        self.assertIn(b"Content-Length: ", response)
+        self.assertIn(b"405", server.handle(b"POST /ua HTTP/1.1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 
 from _fixtures import load_provider_fixture
@@ -53,6 +54,30 @@ class ServiceTests(unittest.TestCase):
         self.assertEqual(edge_windows["browser_major_version"], edge_windows_major)
         self.assertIn(f"Edg/{edge_windows_major}.0.0.0", edge_windows["user_agent"])
 
+    def test_agenerate_matches_generate(self):
+        fixtures_by_url: dict[str, object] = {}
+        for provider in ProviderRegistry.default().all():
+            for source_key, url in provider.source_urls().items():
+                fixtures_by_url[url] = load_provider_fixture(provider.name, source_key)
+        seen_urls: list[str] = []
+
+        def fake_fetcher(url):
+            return url, fixtures_by_url[url]
+
+        async def fake_async_fetcher(url):
+            seen_urls.append(url)
+            await asyncio.sleep(0)
+            return url, fixtures_by_url[url]
+
+        service = UserAgentService()
+        resolved_versions, sources, user_agents = asyncio.run(service.agenerate(fake_async_fetcher))
+        expected_versions, expected_sources, expected_user_agents = service.generate(fake_fetcher)
+
+        self.assertEqual(resolved_versions.to_dict(), expected_versions.to_dict())
+        self.assertEqual(sources, expected_sources)
+        self.assertEqual(user_agents, expected_user_agents)
+        self.assertEqual(sorted(seen_urls), sorted(fixtures_by_url))
+
 
 if __name__ == "__main__":
     unittest.main()